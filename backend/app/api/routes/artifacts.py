@@ -1,32 +1,71 @@
 """Artifact routes."""
 
-from typing import Annotated
+import re
+from typing import Annotated, Literal
 
-from fastapi import APIRouter, Depends, HTTPException, status
-from fastapi.responses import StreamingResponse
+from fastapi import APIRouter, Depends, Header, HTTPException, status
+from fastapi.responses import RedirectResponse, StreamingResponse
 from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
-import boto3
 from botocore.exceptions import ClientError
 
 from app.config import get_settings
 from app.db.session import get_db
 from app.db.models import Artifact, SimulationRun, Application, Role, Membership
 from app.deps import CurrentUser
+from app.evidence.store import AsyncArtifactStore, get_async_artifact_store
 
 router = APIRouter()
 settings = get_settings()
 
-
-def get_s3_client():
-    """Get S3/MinIO client."""
-    return boto3.client(
-        "s3",
-        endpoint_url=settings.s3_endpoint_url,
-        aws_access_key_id=settings.s3_access_key,
-        aws_secret_access_key=settings.s3_secret_key,
-        region_name=settings.s3_region,
-    )
+CONTENT_TYPES = {
+    "diff": "text/plain",
+    "test_log": "text/plain",
+    "coverage": "application/xml",
+    "writeup": "application/json",
+    "source_bundle": "application/gzip",
+    "metrics_json": "application/json",
+    "llm_output": "application/json",
+}
+
+# A single byte range: "bytes=0-99", "bytes=100-" or "bytes=-500" (the last 500 bytes)
+RANGE_PATTERN = re.compile(r"^bytes=(\d+-\d*|-\d+)$")
+
+
+def parse_range(range_header: str | None) -> str | None:
+    """Return the Range header to forward to S3, or None to send the whole artifact.
+
+    Multiple or malformed ranges are ignored, which HTTP allows: the
+    client then gets a normal 200 response with the full body.
+    """
+    if not range_header:
+        return None
+    value = range_header.replace(" ", "")
+    match = RANGE_PATTERN.match(value)
+    if not match:
+        return None
+    first, _, last = match.group(1).partition("-")
+    if first and last and int(last) < int(first):
+        return None
+    return value
+
+
+async def _unsatisfiable_range_size(
+    store: AsyncArtifactStore,
+    s3_key: str,
+    error: ClientError,
+) -> int | None:
+    """Size of an artifact S3 refused a range of, or None if it cannot be had.
+
+    S3 reports it in the InvalidRange error; otherwise it takes a HEAD.
+    """
+    actual_size = error.response["Error"].get("ActualObjectSize")
+    if actual_size is not None:
+        return int(actual_size)
+    try:
+        return await store.artifact_size(s3_key)
+    except ClientError:
+        return None
 
 
 @router.get("/{artifact_id}/download")
@@ -34,8 +73,18 @@ async def download_artifact(
     artifact_id: str,
     current_user: CurrentUser,
     db: Annotated[AsyncSession, Depends(get_db)],
+    store: Annotated[AsyncArtifactStore, Depends(get_async_artifact_store)],
+    mode: Literal["proxy", "redirect"] | None = None,
+    range_header: Annotated[str | None, Header(alias="Range")] = None,
 ):
-    """Download an artifact (authorized users only)."""
+    """Download an artifact (authorized users only).
+
+    mode=redirect (or ARTIFACT_DOWNLOAD_MODE=redirect) answers with a
+    307 to a short-lived presigned S3 URL, signed for
+    S3_PUBLIC_ENDPOINT_URL when set. Otherwise the artifact is
+    proxied in fixed-size chunks, and a single-range Range header is
+    honoured with a 206 Partial Content response.
+    """
     result = await db.execute(select(Artifact).where(Artifact.id == artifact_id))
     artifact = result.scalar_one_or_none()
 
@@ -69,41 +118,57 @@ async def download_artifact(
             detail="Not authorized to download this artifact",
         )
 
-    # Download from S3
-    try:
-        s3 = get_s3_client()
-        response = s3.get_object(Bucket=settings.s3_bucket, Key=artifact.s3_key)
-        content = response["Body"]
-
-        # Determine content type
-        content_type_map = {
-            "diff": "text/plain",
-            "test_log": "text/plain",
-            "coverage": "application/xml",
-            "writeup": "application/json",
-            "source_bundle": "application/gzip",
-            "metrics_json": "application/json",
-            "llm_output": "application/json",
-        }
-        content_type = content_type_map.get(artifact.type.value, "application/octet-stream")
-
-        return StreamingResponse(
-            content,
-            media_type=content_type,
-            headers={
-                "Content-Disposition": f'attachment; filename="{artifact.s3_key.split("/")[-1]}"'
-            },
+    filename = artifact.s3_key.split("/")[-1]
+    content_type = CONTENT_TYPES.get(artifact.type.value, "application/octet-stream")
+
+    # Let the client fetch straight from S3, so the API carries no artifact bandwidth
+    if (mode or settings.artifact_download_mode) == "redirect":
+        url = await store.get_presigned_url(
+            artifact.s3_key,
+            expires_in=settings.artifact_presigned_url_ttl_seconds,
+            filename=filename,
+            content_type=content_type,
         )
+        return RedirectResponse(url, status_code=status.HTTP_307_TEMPORARY_REDIRECT)
+
+    # Proxy from S3 (off the event loop, over the store's pooled connections)
+    byte_range = parse_range(range_header)
+    try:
+        artifact_stream = await store.stream_artifact(artifact.s3_key, byte_range)
     except ClientError as e:
-        if e.response["Error"]["Code"] == "NoSuchKey":
+        code = e.response["Error"]["Code"]
+        if code == "NoSuchKey":
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND,
                 detail="Artifact file not found in storage",
-            )
+            ) from e
+        if code == "InvalidRange":
+            # RFC 9110: a 416 carries the current length as "bytes */<size>"
+            size = await _unsatisfiable_range_size(store, artifact.s3_key, e)
+            raise HTTPException(
+                status_code=status.HTTP_416_REQUESTED_RANGE_NOT_SATISFIABLE,
+                detail="Requested range not satisfiable",
+                headers={"Content-Range": f"bytes */{size}"} if size is not None else None,
+            ) from e
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail="Error downloading artifact",
-        )
+        ) from e
+
+    headers = {
+        "Content-Disposition": f'attachment; filename="{filename}"',
+        "Content-Length": str(artifact_stream.content_length),
+        "Accept-Ranges": "bytes",
+    }
+    if artifact_stream.content_range:
+        headers["Content-Range"] = artifact_stream.content_range
+
+    return StreamingResponse(
+        store.iter_artifact(artifact_stream.body, chunk_size=settings.artifact_download_chunk_kb * 1024),
+        status_code=status.HTTP_206_PARTIAL_CONTENT if artifact_stream.content_range else status.HTTP_200_OK,
+        media_type=content_type,
+        headers=headers,
+    )
 
 
 @router.get("/{artifact_id}/metadata")
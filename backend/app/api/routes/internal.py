@@ -6,15 +6,18 @@ of job completion. They are protected by an internal API key.
 
 from typing import Annotated, Any
 
-from fastapi import APIRouter, Depends, HTTPException, Header, status, BackgroundTasks
+from fastapi import APIRouter, Depends, HTTPException, Header, status
 from pydantic import BaseModel
 from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
+import redis.asyncio as redis
 
 from app.config import get_settings
 from app.db.session import get_db
 from app.db.models import SimulationRun, SimulationRunStatus
 from app.core.time import utc_now
+from app.services.job_queue import get_queue_stats
+from app.services.orchestration_queue import enqueue_orchestration
 
 router = APIRouter()
 settings = get_settings()
@@ -26,6 +29,7 @@ class RunCompleteRequest(BaseModel):
     success: bool
     metrics: dict[str, Any] = {}
     artifact_urls: dict[str, str] = {}
+    artifact_hashes: dict[str, str] = {}  # artifact name -> SHA-256 computed at upload
     duration_seconds: float = 0.0
 
 
@@ -46,6 +50,108 @@ def verify_internal_key(x_internal_key: str = Header(...)) -> str:
     return x_internal_key
 
 
+class RunCompleteBatchItem(RunCompleteRequest):
+    """One completion in a batch callback."""
+
+    run_id: str
+
+
+class RunCompleteBatchRequest(BaseModel):
+    """Completions the runner delivers together after a backlog builds up."""
+
+    runs: list[RunCompleteBatchItem]
+
+
+class RunCompleteBatchResult(BaseModel):
+    """Outcome for one run in a batch callback."""
+
+    run_id: str
+    status: str  # accepted | not_found
+
+
+class RunCompleteBatchResponse(BaseModel):
+    """Response to runner after processing a batch of completions."""
+
+    results: list[RunCompleteBatchResult]
+
+
+def _apply_completion(run: SimulationRun, request: RunCompleteRequest) -> None:
+    """Record a completion on the run. The caller commits."""
+    run.status = SimulationRunStatus.SUCCEEDED if request.success else SimulationRunStatus.FAILED
+    run.finished_at = utc_now()
+    run.runner_metadata_json = {
+        "duration_seconds": request.duration_seconds,
+        "artifact_urls": request.artifact_urls,
+        "metrics": request.metrics,
+    }
+
+
+async def _queue_orchestration(items: list[tuple[str, RunCompleteRequest]]) -> None:
+    """Hand completed runs to the orchestration worker.
+
+    Raises 503 if the queue is unreachable so the runner retries the
+    callback; re-applying a completion is harmless and enqueueing is
+    idempotent per run.
+    """
+    r = redis.from_url(settings.redis_url)
+    try:
+        for run_id, request in items:
+            await enqueue_orchestration(
+                r,
+                run_id=run_id,
+                metrics=request.metrics,
+                artifact_urls=request.artifact_urls,
+                artifact_hashes=request.artifact_hashes,
+            )
+    except redis.RedisError as e:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="Orchestration queue unavailable",
+        ) from e
+    finally:
+        await r.close()
+
+
+@router.post(
+    "/runs/complete",
+    response_model=RunCompleteBatchResponse,
+    dependencies=[Depends(verify_internal_key)],
+)
+async def runs_complete_batch(
+    request: RunCompleteBatchRequest,
+    db: Annotated[AsyncSession, Depends(get_db)],
+) -> RunCompleteBatchResponse:
+    """
+    Handle several simulation run completions in one call.
+
+    Same effect as calling /runs/{run_id}/complete for each run, with a
+    single lookup and a single commit. Unknown runs are reported as
+    not_found instead of failing the whole batch.
+    """
+    run_ids = [item.run_id for item in request.runs]
+    result = await db.execute(
+        select(SimulationRun).where(SimulationRun.id.in_(run_ids))
+    )
+    runs = {run.id: run for run in result.scalars().all()}
+
+    results = []
+    accepted = []
+    for item in request.runs:
+        run = runs.get(item.run_id)
+        if not run:
+            results.append(RunCompleteBatchResult(run_id=item.run_id, status="not_found"))
+            continue
+
+        _apply_completion(run, item)
+        accepted.append((item.run_id, item))
+        results.append(RunCompleteBatchResult(run_id=item.run_id, status="accepted"))
+
+    await db.commit()
+    await _queue_orchestration(accepted)
+
+    return RunCompleteBatchResponse(results=results)
+
+
 @router.post(
     "/runs/{run_id}/complete",
     response_model=RunCompleteResponse,
@@ -54,7 +160,6 @@ def verify_internal_key(x_internal_key: str = Header(...)) -> str:
 async def run_complete(
     run_id: str,
     request: RunCompleteRequest,
-    background_tasks: BackgroundTasks,
     db: Annotated[AsyncSession, Depends(get_db)],
 ) -> RunCompleteResponse:
     """
@@ -63,7 +168,7 @@ async def run_complete(
     This endpoint:
     1. Updates the run status to SUCCEEDED or FAILED
     2. Stores artifact URLs and metrics
-    3. Triggers the orchestration pipeline in the background
+    3. Queues the run for the orchestration worker
     """
     # Find the run
     result = await db.execute(
@@ -77,29 +182,24 @@ async def run_complete(
             detail="Run not found",
         )
 
-    # Update run status
-    run.status = SimulationRunStatus.SUCCEEDED if request.success else SimulationRunStatus.FAILED
-    run.finished_at = utc_now()
-    run.runner_metadata_json = {
-        "duration_seconds": request.duration_seconds,
-        "artifact_urls": request.artifact_urls,
-        "metrics": request.metrics,
-    }
-
+    _apply_completion(run, request)
     await db.commit()
-
-    # Trigger orchestration in background
-    # Import here to avoid circular imports
-    from app.services.orchestrator import process_completed_run
-
-    background_tasks.add_task(
-        process_completed_run,
-        run_id=run_id,
-        metrics=request.metrics,
-        artifact_urls=request.artifact_urls,
-    )
+    await _queue_orchestration([(run_id, request)])
 
     return RunCompleteResponse(
         status="accepted",
-        message=f"Run {run_id} marked as {'succeeded' if request.success else 'failed'}. Processing in background.",
+        message=f"Run {run_id} marked as {'succeeded' if request.success else 'failed'}. Queued for orchestration.",
     )
+
+
+@router.get(
+    "/queue/stats",
+    dependencies=[Depends(verify_internal_key)],
+)
+async def queue_stats() -> dict[str, Any]:
+    """Per-org simulation queue depth and wait-time metrics."""
+    r = redis.from_url(settings.redis_url)
+    try:
+        return await get_queue_stats(r)
+    finally:
+        await r.close()
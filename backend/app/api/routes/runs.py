@@ -20,8 +20,10 @@ from app.db.models import (
     SimulationRunStatus,
     Artifact,
     ArtifactType,
+    Role,
 )
 from app.company_model.presets import SIMULATIONS
+from app.services.job_queue import enqueue_job
 
 router = APIRouter()
 settings = get_settings()
@@ -111,13 +113,16 @@ async def start_simulation_run(
 
     # Enqueue job to Redis
     try:
+        result = await db.execute(select(Role.org_id).where(Role.id == application.role_id))
+        org_id = result.scalar_one()
+
         r = redis.from_url(settings.redis_url)
         job = {
             "run_id": run.id,
             "simulation_id": request.simulation_id,
             "application_id": application_id,
         }
-        await r.lpush("proofhire:jobs", json.dumps(job))
+        await enqueue_job(r, job, org_id=org_id)
         await r.close()
     except Exception:
         # Log but don't fail - runner will pick up from DB
@@ -258,6 +263,13 @@ async def submit_run(
 
     # Trigger grading job
     try:
+        result = await db.execute(
+            select(Role.org_id)
+            .join(Application, Application.role_id == Role.id)
+            .where(Application.id == run.application_id)
+        )
+        org_id = result.scalar_one()
+
         r = redis.from_url(settings.redis_url)
         job = {
             "type": "grade",
@@ -265,7 +277,7 @@ async def submit_run(
             "code_artifact_id": code_artifact.id,
             "writeup_artifact_id": writeup_artifact.id,
         }
-        await r.lpush("proofhire:jobs", json.dumps(job))
+        await enqueue_job(r, job, org_id=org_id)
         await r.close()
     except Exception:
         pass
@@ -0,0 +1,47 @@
+"""Bulk persistence helpers.
+
+For rows that are written once and never updated in the same unit of work
+(metrics, artifacts, claims), a multi-row INSERT avoids the per-object
+bookkeeping and round trips of session.add() + flush().
+"""
+
+from collections.abc import Sequence
+
+from sqlalchemy import insert, inspect, null
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.db.base import Base
+
+# asyncpg accepts at most 32767 bind parameters per statement
+MAX_BIND_PARAMS = 32767
+
+
+async def bulk_insert(db: AsyncSession, records: Sequence[Base]) -> None:
+    """Insert ORM instances of one model with multi-row INSERT statements.
+
+    The instances are not added to the session. Column defaults (id,
+    created_at) are filled in on the instances first, so callers can keep
+    using them afterwards, e.g. to reference their ids.
+    """
+    if not records:
+        return
+
+    mapper = inspect(type(records[0]))
+    columns = [(prop.key, prop.columns[0]) for prop in mapper.column_attrs]
+
+    rows = []
+    for record in records:
+        row = {}
+        for key, column in columns:
+            value = getattr(record, key)
+            if value is None and column.default is not None and column.default.is_callable:
+                value = column.default.arg(None)
+                setattr(record, key, value)
+            # SQL NULL, as an unset attribute would be (JSON columns would
+            # otherwise store a JSON 'null')
+            row[column.name] = null() if value is None else value
+        rows.append(row)
+
+    chunk_size = max(1, MAX_BIND_PARAMS // len(columns))
+    for start in range(0, len(rows), chunk_size):
+        await db.execute(insert(mapper.local_table).values(rows[start:start + chunk_size]))
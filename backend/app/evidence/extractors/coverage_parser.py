@@ -1,7 +1,17 @@
-"""Parse coverage reports to extract metrics."""
+"""Parse coverage reports to extract metrics.
 
+Reports are read with iterparse, clearing each class element once it has
+been counted, so memory stays flat however large the report is, and a
+file-like object (e.g. an artifact store download) can be parsed as it is
+read. Uncovered line numbers are kept as array('I') (4 bytes per line
+instead of a Python int each); line_ranges() compacts them further.
+"""
+
+import io
 import xml.etree.ElementTree as ET
+from array import array
 from dataclasses import dataclass
+from typing import BinaryIO, TextIO
 
 from app.logging_config import get_logger
 
@@ -16,7 +26,18 @@ class CoverageMetrics:
     branch_coverage_percent: float | None
     lines_covered: int
     lines_total: int
-    uncovered_files: dict[str, list[int]]  # file -> uncovered line numbers
+    uncovered_files: dict[str, array]  # file -> uncovered line numbers (array('I'))
+
+
+def line_ranges(lines: array | list[int]) -> list[tuple[int, int]]:
+    """Collapse sorted line numbers into inclusive (start, end) ranges."""
+    ranges: list[tuple[int, int]] = []
+    for number in lines:
+        if ranges and number == ranges[-1][1] + 1:
+            ranges[-1] = (ranges[-1][0], number)
+        else:
+            ranges.append((number, number))
+    return ranges
 
 
 class CoverageParser:
@@ -31,9 +52,12 @@ class CoverageParser:
         Returns:
             CoverageMetrics with extracted data
         """
+        return self.parse_stream(io.StringIO(xml_content))
+
+    def parse_stream(self, source: BinaryIO | TextIO) -> CoverageMetrics:
+        """Parse coverage XML incrementally from a file-like object."""
         try:
-            root = ET.fromstring(xml_content)
-            return self._parse_cobertura(root)
+            return self._parse_cobertura(source)
         except ET.ParseError as e:
             logger.error("Failed to parse coverage XML", error=str(e))
             return CoverageMetrics(
@@ -44,37 +68,42 @@ class CoverageParser:
                 uncovered_files={},
             )
 
-    def _parse_cobertura(self, root: ET.Element) -> CoverageMetrics:
+    def _parse_cobertura(self, source: BinaryIO | TextIO) -> CoverageMetrics:
         """Parse Cobertura format coverage.xml."""
-        # Get overall coverage from root attributes
-        line_rate = float(root.get("line-rate", "0"))
-        branch_rate = root.get("branch-rate")
-
-        line_coverage_percent = line_rate * 100
-        branch_coverage_percent = float(branch_rate) * 100 if branch_rate else None
+        line_rate = "0"
+        branch_rate = None
 
         # Count lines
         lines_covered = 0
         lines_total = 0
-        uncovered_files: dict[str, list[int]] = {}
+        uncovered_files: dict[str, array] = {}
 
-        for package in root.findall(".//package"):
-            for cls in package.findall(".//class"):
-                filename = cls.get("filename", "unknown")
-                file_uncovered = []
+        for _, elem in ET.iterparse(source):
+            tag = elem.tag
+            if tag == "class":
+                filename = elem.get("filename", "unknown")
+                file_uncovered = array("I")
 
-                for line in cls.findall(".//line"):
+                # Direct children only: <methods> repeat the class's lines
+                for line in elem.iterfind("lines/line"):
                     lines_total += 1
-                    hits = int(line.get("hits", "0"))
-
-                    if hits > 0:
+                    if int(line.get("hits", "0")) > 0:
                         lines_covered += 1
                     else:
-                        line_number = int(line.get("number", "0"))
-                        file_uncovered.append(line_number)
+                        file_uncovered.append(int(line.get("number", "0")))
 
                 if file_uncovered:
                     uncovered_files[filename] = file_uncovered
+                elem.clear()
+            elif tag == "package":
+                elem.clear()
+            elif tag == "coverage":
+                # Overall coverage from root attributes
+                line_rate = elem.get("line-rate", "0")
+                branch_rate = elem.get("branch-rate")
+
+        line_coverage_percent = float(line_rate) * 100
+        branch_coverage_percent = float(branch_rate) * 100 if branch_rate else None
 
         logger.info(
             "Coverage parsed",
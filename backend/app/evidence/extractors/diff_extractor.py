@@ -1,13 +1,34 @@
-"""Extract evidence from git diffs."""
+"""Extract evidence from git diffs.
 
+Diffs are scanned line by line in a single pass, so a multi-megabyte diff
+(e.g. with vendored files) can be consumed straight from a stream without
+being held in memory or split into a list first. Each pattern category is
+one precompiled alternation, applied once per line.
+"""
+
+import io
 import re
-from dataclasses import dataclass
+from collections.abc import Iterable
+from dataclasses import dataclass, field
+from typing import BinaryIO, TextIO
 
 from app.logging_config import get_logger
 
 logger = get_logger(__name__)
 
 
+@dataclass
+class FileDiffStats:
+    """Changes to one file in a diff."""
+
+    path: str
+    is_test_file: bool
+    lines_added: int = 0
+    lines_removed: int = 0
+    tests_added: int = 0
+    skipped_tests_added: int = 0
+
+
 @dataclass
 class DiffMetrics:
     """Metrics extracted from a diff."""
@@ -19,6 +40,11 @@ class DiffMetrics:
     test_added: bool
     tests_added_count: int
     skipped_tests_added: int
+    file_stats: list[FileDiffStats] = field(default_factory=list)
+
+
+def _combine(patterns: list[str]) -> re.Pattern[str]:
+    return re.compile("|".join(f"(?:{p})" for p in patterns))
 
 
 class DiffExtractor:
@@ -34,23 +60,28 @@ class DiffExtractor:
         r"__tests__/.*\.(js|ts|tsx)$",
     ]
 
-    # Patterns for test functions
+    # Patterns for test functions (matched after the leading "+")
     TEST_FUNCTION_PATTERNS = [
-        r"^\+\s*def test_",  # Python
-        r"^\+\s*async def test_",  # Python async
-        r"^\+\s*it\(",  # JavaScript/Jest
-        r"^\+\s*test\(",  # JavaScript/Jest
-        r"^\+\s*describe\(",  # JavaScript/Jest
+        r"\s*def test_",  # Python
+        r"\s*async def test_",  # Python async
+        r"\s*it\(",  # JavaScript/Jest
+        r"\s*test\(",  # JavaScript/Jest
+        r"\s*describe\(",  # JavaScript/Jest
     ]
 
-    # Patterns for skipped tests
+    # Patterns for skipped tests (searched anywhere in an added line)
     SKIP_PATTERNS = [
-        r"^\+.*@pytest\.mark\.skip",
-        r"^\+.*@unittest\.skip",
-        r"^\+.*\.skip\(",
-        r"^\+.*xfail",
+        r"@pytest\.mark\.skip",
+        r"@unittest\.skip",
+        r"\.skip\(",
+        r"xfail",
     ]
 
+    _FILE_HEADER_RE = re.compile(r"^diff --git .* b/(.+)$")
+    _TEST_FILE_RE = _combine(TEST_FILE_PATTERNS)
+    _TEST_FUNCTION_RE = _combine(TEST_FUNCTION_PATTERNS)
+    _SKIP_RE = _combine(SKIP_PATTERNS)
+
     def extract(self, diff_content: str) -> DiffMetrics:
         """Extract metrics from a unified diff.
 
@@ -60,42 +91,71 @@ class DiffExtractor:
         Returns:
             DiffMetrics with extracted data
         """
-        files_changed = []
-        test_files_changed = []
+        return self.extract_lines(io.StringIO(diff_content))
+
+    def extract_stream(self, stream: BinaryIO | TextIO) -> DiffMetrics:
+        """Extract metrics from a diff read incrementally from a file-like object.
+
+        Binary streams (e.g. an S3 response body) are decoded as UTF-8,
+        replacing invalid bytes.
+        """
+        if isinstance(stream, io.TextIOBase):
+            return self.extract_lines(stream)
+        # newline="\n": split on LF only, as git does
+        return self.extract_lines(io.TextIOWrapper(stream, encoding="utf-8", errors="replace", newline="\n"))
+
+    def extract_lines(self, lines: Iterable[str]) -> DiffMetrics:
+        """Extract metrics from an iterable of diff lines (with or without newlines)."""
+        file_stats: list[FileDiffStats] = []
+        current: FileDiffStats | None = None
         lines_added = 0
         lines_removed = 0
         tests_added_count = 0
         skipped_tests_added = 0
 
-        current_file = None
+        test_function = self._TEST_FUNCTION_RE.match
+        skip = self._SKIP_RE.search
 
-        for line in diff_content.split("\n"):
-            # Track current file
-            if line.startswith("diff --git"):
-                match = re.search(r"b/(.+)$", line)
-                if match:
-                    current_file = match.group(1)
-                    files_changed.append(current_file)
+        for line in lines:
+            if line.endswith("\n"):
+                line = line[:-1]
+            first = line[:1]
 
-                    # Check if it's a test file
-                    if self._is_test_file(current_file):
-                        test_files_changed.append(current_file)
-
-            # Count added/removed lines
-            elif line.startswith("+") and not line.startswith("+++"):
+            if first == "+":
+                if line.startswith("+++"):
+                    continue
                 lines_added += 1
-
-                # Check for test function additions
-                if any(re.match(pattern, line) for pattern in self.TEST_FUNCTION_PATTERNS):
+                is_test = test_function(line, 1) is not None
+                # Substring checks first: most added lines mention neither
+                is_skip = ("skip" in line or "xfail" in line) and skip(line, 1) is not None
+                if is_test:
                     tests_added_count += 1
-
-                # Check for skip additions
-                if any(re.search(pattern, line) for pattern in self.SKIP_PATTERNS):
+                if is_skip:
                     skipped_tests_added += 1
-
-            elif line.startswith("-") and not line.startswith("---"):
+                if current is not None:
+                    current.lines_added += 1
+                    current.tests_added += is_test
+                    current.skipped_tests_added += is_skip
+
+            elif first == "-":
+                if line.startswith("---"):
+                    continue
                 lines_removed += 1
+                if current is not None:
+                    current.lines_removed += 1
 
+            elif first == "d" and line.startswith("diff --git"):
+                match = self._FILE_HEADER_RE.match(line)
+                if match:
+                    path = match.group(1)
+                    current = FileDiffStats(
+                        path=path,
+                        is_test_file=self._is_test_file(path),
+                    )
+                    file_stats.append(current)
+
+        files_changed = [f.path for f in file_stats]
+        test_files_changed = [f.path for f in file_stats if f.is_test_file]
         test_added = tests_added_count > 0 or len(test_files_changed) > 0
 
         logger.info(
@@ -115,11 +175,9 @@ class DiffExtractor:
             test_added=test_added,
             tests_added_count=tests_added_count,
             skipped_tests_added=skipped_tests_added,
+            file_stats=file_stats,
         )
 
     def _is_test_file(self, filepath: str) -> bool:
         """Check if a file path is a test file."""
-        return any(
-            re.search(pattern, filepath)
-            for pattern in self.TEST_FILE_PATTERNS
-        )
+        return self._TEST_FILE_RE.search(filepath) is not None
@@ -1,7 +1,10 @@
 """Parse test output logs to extract metrics."""
 
+import json
 import re
+from collections.abc import Iterator
 from dataclasses import dataclass
+from typing import Any
 
 from app.logging_config import get_logger
 
@@ -24,14 +27,26 @@ class TestLogMetrics:
 
 
 class TestLogParser:
-    """Parse pytest/jest output to extract test metrics."""
+    """Parse pytest/jest output to extract test metrics.
+
+    The pytest summary is located by scanning lines from the end of the log,
+    where pytest prints it, and failure names and error messages are
+    collected in one anchored scan only when something failed. When the
+    grader's pytest_report.json is available, parse_report reads the
+    counts from it directly.
+    """
 
     # Pytest patterns
-    PYTEST_SUMMARY_PATTERN = re.compile(
-        r"=+ (?:(\d+) passed)?(?:, )?(?:(\d+) failed)?(?:, )?(?:(\d+) skipped)?(?:, )?(?:(\d+) error)?.* in ([\d.]+)s"
+    # e.g. "==== 1 failed, 8 passed, 1 skipped, 2 warnings in 2.34s (0:00:02) ===="
+    PYTEST_SUMMARY_PATTERN = re.compile(r"^=+ (.*?)\bin ([\d.]+)s\b.*=+$")
+    PYTEST_COUNT_PATTERN = re.compile(
+        r"(\d+) (passed|failed|skipped|errors?|xfailed|xpassed|deselected)\b"
     )
-    PYTEST_FAILED_TEST_PATTERN = re.compile(r"FAILED (.+?) -")
-    PYTEST_ERROR_PATTERN = re.compile(r"E\s+(.+)")
+    # "FAILED <nodeid> - <message>" lines and "E   <message>" lines
+    PYTEST_FAILURE_PATTERN = re.compile(r"^(?:FAILED (.+?)(?: - .*)?|E\s+(.+))$", re.MULTILINE)
+
+    # Error messages kept per run
+    MAX_ERROR_MESSAGES = 10
 
     # Jest patterns
     JEST_SUMMARY_PATTERN = re.compile(
@@ -61,26 +76,91 @@ class TestLogParser:
         # Fallback - try to extract any useful info
         return self._parse_generic(log_content)
 
+    def parse_report(self, report: dict[str, Any] | str | bytes) -> TestLogMetrics:
+        """Read metrics from a pytest-json-report file (pytest_report.json).
+
+        Args:
+            report: The parsed report, or its raw JSON
+
+        Returns:
+            TestLogMetrics with extracted data
+        """
+        if isinstance(report, (str, bytes)):
+            report = json.loads(report)
+
+        summary = report.get("summary", {})
+        passed = summary.get("passed", 0)
+        failed = summary.get("failed", 0)
+        skipped = summary.get("skipped", 0)
+        errors = summary.get("error", 0)
+
+        failed_tests = []
+        error_messages = []
+        for test in report.get("tests", []):
+            if test.get("outcome") not in ("failed", "error"):
+                continue
+            failed_tests.append(test.get("nodeid", ""))
+            for stage in ("setup", "call", "teardown"):
+                message = ((test.get(stage) or {}).get("crash") or {}).get("message")
+                if message and len(error_messages) < self.MAX_ERROR_MESSAGES:
+                    error_messages.append(message)
+
+        duration = float(report.get("duration", 0.0))
+
+        logger.info(
+            "Pytest report parsed",
+            passed=passed,
+            failed=failed,
+            skipped=skipped,
+            duration=duration,
+        )
+
+        return TestLogMetrics(
+            tests_passed=failed == 0 and errors == 0,
+            total_tests=summary.get("total", passed + failed + skipped + errors),
+            passed_count=passed,
+            failed_count=failed,
+            skipped_count=skipped,
+            error_count=errors,
+            failed_test_names=failed_tests,
+            error_messages=error_messages,
+            duration_seconds=duration,
+        )
+
     def _parse_pytest(self, log_content: str) -> TestLogMetrics | None:
         """Parse pytest output."""
-        match = self.PYTEST_SUMMARY_PATTERN.search(log_content)
+        match = None
+        for line in _lines_from_end(log_content):
+            # Cheap check before the regex: summary lines are framed by "="
+            if line.startswith("=") and line.endswith("="):
+                match = self.PYTEST_SUMMARY_PATTERN.match(line)
+                if match:
+                    break
         if not match:
             return None
 
-        passed = int(match.group(1) or 0)
-        failed = int(match.group(2) or 0)
-        skipped = int(match.group(3) or 0)
-        errors = int(match.group(4) or 0)
-        duration = float(match.group(5))
+        counts: dict[str, int] = {}
+        for count, outcome in self.PYTEST_COUNT_PATTERN.findall(match.group(1)):
+            counts["error" if outcome.startswith("error") else outcome] = int(count)
+
+        passed = counts.get("passed", 0)
+        failed = counts.get("failed", 0)
+        skipped = counts.get("skipped", 0)
+        errors = counts.get("error", 0)
+        duration = float(match.group(2))
 
         total = passed + failed + skipped + errors
         tests_passed = failed == 0 and errors == 0
 
-        # Extract failed test names
-        failed_tests = self.PYTEST_FAILED_TEST_PATTERN.findall(log_content)
-
-        # Extract error messages
-        error_messages = self.PYTEST_ERROR_PATTERN.findall(log_content)[:10]  # Limit
+        # Extract failed test names and error messages
+        failed_tests: list[str] = []
+        error_messages: list[str] = []
+        if not tests_passed:
+            for name, message in self.PYTEST_FAILURE_PATTERN.findall(log_content):
+                if name:
+                    failed_tests.append(name)
+                elif len(error_messages) < self.MAX_ERROR_MESSAGES:
+                    error_messages.append(message)
 
         logger.info(
             "Pytest log parsed",
@@ -165,3 +245,14 @@ class TestLogParser:
             error_messages=[],
             duration_seconds=0.0,
         )
+
+
+def _lines_from_end(text: str) -> Iterator[str]:
+    """Yield the lines of text, last first, without splitting all of it."""
+    end = len(text)
+    while end > 0:
+        start = text.rfind("\n", 0, end)
+        line = text[start + 1:end].rstrip("\r")
+        if line:
+            yield line
+        end = start if start >= 0 else 0
@@ -1,6 +1,14 @@
-"""Extract evidence from candidate writeups."""
+"""Extract evidence from candidate writeups.
+
+The writeup is lowercased once and indexed once: the first offset of every
+prompt and content keyword is looked up a single time and shared by the
+prompt and content checks, and section headers are found by jumping
+between lines that start with "#" and applying one compiled alternation
+of all header patterns.
+"""
 
 import re
+from collections.abc import Iterator
 from dataclasses import dataclass
 
 from app.logging_config import get_logger
@@ -20,6 +28,24 @@ class WriteupMetrics:
     has_monitoring: bool
 
 
+_WHITESPACE = r"\s"
+_LINE_WHITESPACE = r"[^\S\n]"
+
+
+def _compile_headers(patterns: list[tuple[str, str]]) -> tuple[re.Pattern[str], dict[str, str]]:
+    """One alternation for every header pattern, matched at line starts.
+
+    Alternatives are tried in order, so the first listed pattern wins;
+    \\s is narrowed so a header never extends into the next line.
+    """
+    groups = {f"h{i}": name for i, (_, name) in enumerate(patterns)}
+    alternation = "|".join(
+        f"(?P<h{i}>{pattern.replace(_WHITESPACE, _LINE_WHITESPACE)})"
+        for i, (pattern, _) in enumerate(patterns)
+    )
+    return re.compile(f"^(?:{alternation})", re.IGNORECASE | re.MULTILINE), groups
+
+
 class WriteupExtractor:
     """Extract metrics and structure from candidate writeups."""
 
@@ -48,6 +74,27 @@ class WriteupExtractor:
         (r"#+\s*testing", "testing"),
     ]
 
+    # Keywords that show a kind of content when there is no section for it
+    CONTENT_KEYWORDS = {
+        "root_cause": ["root cause", "because", "the bug was", "issue was"],
+        "tradeoffs": ["tradeoff", "trade-off", "alternatively", "instead of", "considered"],
+        "monitoring": ["monitor", "alert", "detect", "log", "metric", "observ"],
+    }
+
+    # Sections that answer a prompt when they have substantial content
+    SECTION_PROMPTS = {
+        "root_cause": "root cause",
+        "fix_description": "what did you change",
+        "tradeoffs": "tradeoffs",
+        "monitoring": "monitoring",
+    }
+
+    _HEADER_RE, _HEADER_SECTIONS = _compile_headers(SECTION_PATTERNS)
+    _KEYWORDS = list(dict.fromkeys(
+        [p.lower() for p in EXPECTED_PROMPTS]
+        + [k for kws in CONTENT_KEYWORDS.values() for k in kws]
+    ))
+
     def extract(self, writeup_text: str) -> WriteupMetrics:
         """Extract metrics from a writeup.
 
@@ -63,13 +110,17 @@ class WriteupExtractor:
         # Extract sections
         sections = self._extract_sections(writeup_text)
 
+        # First offset of every prompt and keyword, in one scan
+        text_lower = writeup_text.lower()
+        keyword_index = self._index_keywords(text_lower)
+
         # Check which prompts were answered
-        prompts_answered = self._check_prompts_answered(writeup_text, sections)
+        prompts_answered = self._check_prompts_answered(text_lower, keyword_index, sections)
 
         # Check for key content
-        has_root_cause = self._has_content_type(writeup_text, sections, "root_cause")
-        has_tradeoffs = self._has_content_type(writeup_text, sections, "tradeoffs")
-        has_monitoring = self._has_content_type(writeup_text, sections, "monitoring")
+        has_root_cause = self._has_content_type(keyword_index, sections, "root_cause")
+        has_tradeoffs = self._has_content_type(keyword_index, sections, "tradeoffs")
+        has_monitoring = self._has_content_type(keyword_index, sections, "monitoring")
 
         logger.info(
             "Writeup extracted",
@@ -90,67 +141,62 @@ class WriteupExtractor:
         )
 
     def _extract_sections(self, text: str) -> dict[str, str]:
-        """Extract named sections from markdown text."""
+        """Extract named sections from markdown text.
+
+        A section runs from the line after its header to the next
+        recognised header; other headers are part of its content.
+        """
         sections: dict[str, str] = {}
-        lines = text.split("\n")
 
         current_section = None
-        current_content: list[str] = []
+        content_start = 0
 
-        for line in lines:
-            # Check if this line is a section header
-            is_header = False
-            for pattern, section_name in self.SECTION_PATTERNS:
-                if re.match(pattern, line, re.IGNORECASE):
-                    # Save previous section
-                    if current_section:
-                        sections[current_section] = "\n".join(current_content).strip()
+        for line_start in _lines_starting_with_hash(text):
+            match = self._HEADER_RE.match(text, line_start)
+            if match is None:
+                continue
 
-                    current_section = section_name
-                    current_content = []
-                    is_header = True
-                    break
+            # Save previous section
+            if current_section:
+                sections[current_section] = text[content_start:line_start].strip()
 
-            if not is_header and current_section:
-                current_content.append(line)
+            current_section = self._HEADER_SECTIONS[match.lastgroup]
+            line_end = text.find("\n", match.end())
+            content_start = len(text) if line_end < 0 else line_end + 1
 
         # Save last section
         if current_section:
-            sections[current_section] = "\n".join(current_content).strip()
+            sections[current_section] = text[content_start:].strip()
 
         return sections
 
+    def _index_keywords(self, text_lower: str) -> dict[str, int]:
+        """Offset of the first occurrence of each prompt and keyword found."""
+        index = {}
+        for keyword in self._KEYWORDS:
+            offset = text_lower.find(keyword)
+            if offset >= 0:
+                index[keyword] = offset
+        return index
+
     def _check_prompts_answered(
         self,
-        text: str,
+        text_lower: str,
+        keyword_index: dict[str, int],
         sections: dict[str, str],
     ) -> list[str]:
         """Check which expected prompts were answered."""
         answered = []
-        text_lower = text.lower()
 
         for prompt in self.EXPECTED_PROMPTS:
-            prompt_lower = prompt.lower()
-
-            # Check if prompt topic is mentioned with substantial content
-            if prompt_lower in text_lower:
-                # Find the mention and check if followed by content
-                idx = text_lower.find(prompt_lower)
-                if idx >= 0:
-                    # Check next 200 chars have substantial content
-                    following = text_lower[idx : idx + 200]
-                    if len(following.split()) >= 10:
-                        answered.append(prompt)
+            # Check if prompt topic is mentioned with substantial content:
+            # the 200 chars from its first mention hold at least 10 words
+            idx = keyword_index.get(prompt.lower())
+            if idx is not None and len(text_lower[idx : idx + 200].split()) >= 10:
+                answered.append(prompt)
 
         # Also check section coverage
-        section_to_prompt = {
-            "root_cause": "root cause",
-            "fix_description": "what did you change",
-            "tradeoffs": "tradeoffs",
-            "monitoring": "monitoring",
-        }
-
-        for section, prompt in section_to_prompt.items():
+        for section, prompt in self.SECTION_PROMPTS.items():
             if section in sections and len(sections[section]) > 50:
                 if prompt not in answered:
                     answered.append(prompt)
@@ -159,7 +205,7 @@ class WriteupExtractor:
 
     def _has_content_type(
         self,
-        text: str,
+        keyword_index: dict[str, int],
         sections: dict[str, str],
         content_type: str,
     ) -> bool:
@@ -169,12 +215,14 @@ class WriteupExtractor:
             return len(sections[content_type]) > 50
 
         # Fallback: check for keywords
-        text_lower = text.lower()
-        keywords = {
-            "root_cause": ["root cause", "because", "the bug was", "issue was"],
-            "tradeoffs": ["tradeoff", "trade-off", "alternatively", "instead of", "considered"],
-            "monitoring": ["monitor", "alert", "detect", "log", "metric", "observ"],
-        }
-
-        type_keywords = keywords.get(content_type, [])
-        return any(kw in text_lower for kw in type_keywords)
+        return any(kw in keyword_index for kw in self.CONTENT_KEYWORDS.get(content_type, []))
+
+
+def _lines_starting_with_hash(text: str) -> Iterator[int]:
+    """Offsets of the lines that start with "#" (possible headers)."""
+    if text.startswith("#"):
+        yield 0
+    offset = text.find("\n#")
+    while offset >= 0:
+        yield offset + 1
+        offset = text.find("\n#", offset + 1)
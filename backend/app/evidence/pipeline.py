@@ -0,0 +1,265 @@
+"""Evidence extraction stage of the orchestration pipeline.
+
+The runner reports a handful of flat metrics; the uploaded artifacts hold
+much more. Before claims are generated, each known artifact is downloaded
+and parsed by its extractor, and the derived metrics are merged into the
+run's evidence:
+
+- diff.patch          tests_added_count, skipped_tests_added, test_files_changed, ...
+- pytest_report.json  test counts (preferred: exact, and cheap to read)
+- testlog.txt         test counts, when there is no pytest_report.json
+- coverage.xml        coverage_percent, lines_covered, lines_total, ...
+- writeup.md          writeup flags, and the answered prompts as artifact metadata
+
+Artifacts are fetched concurrently, each in a worker thread that streams
+the download straight into its extractor (diffs and coverage reports are
+never held in memory whole). A failed download or parse is logged and
+skipped: the metrics it would have produced are simply missing, and the
+claims that need them stay UNPROVED.
+
+When the grader ran with --evidence it also uploads evidence.json, holding
+the same metrics computed inside the sandbox. That small file is read
+first, and the artifacts it lists as sources are not downloaded at all.
+A missing or unreadable summary, or one with an unknown schema_version,
+just means every artifact is extracted as above.
+"""
+
+import asyncio
+import json
+import time
+from collections.abc import Callable
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from typing import Any, BinaryIO
+
+from app.config import get_settings
+from app.evidence.extractors import CoverageParser, DiffExtractor, TestLogParser, WriteupExtractor
+from app.evidence.extractors.testlog_parser import TestLogMetrics
+from app.evidence.store import ArtifactStore, get_artifact_store
+from app.logging_config import get_logger
+
+logger = get_logger(__name__)
+settings = get_settings()
+
+# (artifact body) -> (derived metrics, extra metadata for the artifact row)
+Extractor = Callable[[BinaryIO], tuple[dict[str, Any], dict[str, Any]]]
+
+# evidence.json versions this backend understands (see runner/sandbox/grader/evidence.py)
+EVIDENCE_SCHEMA_VERSION = 1
+EVIDENCE_ARTIFACT = "evidence.json"
+
+_executor: ThreadPoolExecutor | None = None
+
+
+@dataclass
+class ExtractionResult:
+    """Evidence derived from a run's artifacts."""
+
+    metrics: dict[str, Any] = field(default_factory=dict)
+    artifact_metadata: dict[str, dict[str, Any]] = field(default_factory=dict)  # artifact name -> metadata
+    timings: dict[str, float] = field(default_factory=dict)  # artifact name -> seconds
+    errors: dict[str, str] = field(default_factory=dict)  # artifact name -> error
+
+
+def extract_diff(body: BinaryIO) -> tuple[dict[str, Any], dict[str, Any]]:
+    diff = DiffExtractor().extract_stream(body)
+    metrics = {
+        "test_added": diff.test_added,
+        "tests_added_count": diff.tests_added_count,
+        "skipped_tests_added": diff.skipped_tests_added,
+        "test_files_changed": len(diff.test_files_changed),
+        "files_changed_count": len(diff.files_changed),
+        "lines_added": diff.lines_added,
+        "lines_removed": diff.lines_removed,
+    }
+    return metrics, {"files_changed": diff.files_changed, "test_files_changed": diff.test_files_changed}
+
+
+def extract_pytest_report(body: BinaryIO) -> tuple[dict[str, Any], dict[str, Any]]:
+    return _test_metrics(TestLogParser().parse_report(body.read()))
+
+
+def extract_test_log(body: BinaryIO) -> tuple[dict[str, Any], dict[str, Any]]:
+    return _test_metrics(TestLogParser().parse(body.read().decode("utf-8", errors="replace")))
+
+
+def extract_coverage(body: BinaryIO) -> tuple[dict[str, Any], dict[str, Any]]:
+    coverage = CoverageParser().parse_stream(body)
+    metrics: dict[str, Any] = {
+        "coverage_percent": coverage.line_coverage_percent,
+        "lines_covered": coverage.lines_covered,
+        "lines_total": coverage.lines_total,
+    }
+    if coverage.branch_coverage_percent is not None:
+        metrics["branch_coverage_percent"] = coverage.branch_coverage_percent
+    return metrics, {"uncovered_files_count": len(coverage.uncovered_files)}
+
+
+def extract_writeup(body: BinaryIO) -> tuple[dict[str, Any], dict[str, Any]]:
+    writeup = WriteupExtractor().extract(body.read().decode("utf-8", errors="replace"))
+    metrics = {
+        "writeup_word_count": writeup.word_count,
+        "writeup_has_root_cause": writeup.has_root_cause,
+        "writeup_has_tradeoffs": writeup.has_tradeoffs,
+        "writeup_has_monitoring": writeup.has_monitoring,
+    }
+    # The communication rule reads the answered prompts from the artifact
+    return metrics, {"prompts": writeup.prompts_answered, "sections": sorted(writeup.sections)}
+
+
+def _test_metrics(log: TestLogMetrics) -> tuple[dict[str, Any], dict[str, Any]]:
+    metrics = {
+        "total_tests": log.total_tests,
+        "passed_tests": log.passed_count,
+        "failed_tests_count": log.failed_count,
+        "skipped_tests": log.skipped_count,
+        "test_error_count": log.error_count,
+    }
+    return metrics, {"failed_test_names": log.failed_test_names[:50]}
+
+
+# Artifact name -> extractor
+EXTRACTORS: dict[str, Extractor] = {
+    "diff.patch": extract_diff,
+    "pytest_report.json": extract_pytest_report,
+    "testlog.txt": extract_test_log,
+    "coverage.xml": extract_coverage,
+    "writeup.md": extract_writeup,
+}
+
+
+async def extract_evidence(
+    run_id: str,
+    artifact_names: list[str],
+    store: ArtifactStore | None = None,
+) -> ExtractionResult:
+    """Download and parse a run's artifacts concurrently.
+
+    Args:
+        run_id: The simulation run ID (artifacts live under runs/{run_id}/)
+        artifact_names: Names of the artifacts the runner uploaded
+        store: Artifact store to read from (default: the global one)
+
+    Returns:
+        Derived metrics and artifact metadata, with per-extractor timings
+    """
+    names = [name for name in artifact_names if name in EXTRACTORS]
+    # The JSON report has the same counts as the log, exactly
+    if "pytest_report.json" in names and "testlog.txt" in names:
+        names.remove("testlog.txt")
+
+    result = ExtractionResult()
+    if not names:
+        return result
+
+    store = store or get_artifact_store()
+    loop = asyncio.get_running_loop()
+
+    if EVIDENCE_ARTIFACT in artifact_names:
+        summarised = await loop.run_in_executor(
+            _get_executor(), _read_grader_evidence, store, run_id, result
+        )
+        names = [name for name in names if name not in summarised]
+        if not names:
+            return result
+
+    outcomes = await asyncio.gather(
+        *(
+            loop.run_in_executor(_get_executor(), _run_extractor, store, run_id, name)
+            for name in names
+        ),
+        return_exceptions=True,
+    )
+
+    for name, outcome in zip(names, outcomes, strict=True):
+        if isinstance(outcome, BaseException):
+            result.errors[name] = str(outcome)
+            logger.warning("Evidence extraction failed", run_id=run_id, artifact=name, error=str(outcome))
+            continue
+
+        metrics, metadata, seconds = outcome
+        result.metrics.update(metrics)
+        result.artifact_metadata[name] = metadata
+        result.timings[name] = seconds
+
+    logger.info(
+        "Evidence extracted",
+        run_id=run_id,
+        metrics=len(result.metrics),
+        failed=sorted(result.errors),
+        timings_ms={name: round(seconds * 1000, 1) for name, seconds in result.timings.items()},
+    )
+    return result
+
+
+def _read_grader_evidence(store: ArtifactStore, run_id: str, result: ExtractionResult) -> set[str]:
+    """Merge the grader's evidence.json into result (in a worker thread).
+
+    Returns the names of the artifacts it summarised, which need no extraction.
+    """
+    started = time.perf_counter()
+    try:
+        body = store.open_artifact(f"runs/{run_id}/{EVIDENCE_ARTIFACT}")
+        try:
+            evidence = json.load(body)
+        finally:
+            body.close()
+    except Exception as e:
+        logger.warning("Could not read grader evidence", run_id=run_id, error=str(e))
+        return set()
+
+    if not isinstance(evidence, dict) or evidence.get("schema_version") != EVIDENCE_SCHEMA_VERSION:
+        logger.warning(
+            "Unsupported grader evidence, extracting artifacts instead",
+            run_id=run_id,
+            schema_version=evidence.get("schema_version") if isinstance(evidence, dict) else None,
+        )
+        return set()
+
+    sources = evidence.get("sources", [])
+    metrics = evidence.get("metrics", {})
+    artifacts = evidence.get("artifacts", {})
+    if not (
+        isinstance(sources, list)
+        and all(isinstance(name, str) for name in sources)
+        and isinstance(metrics, dict)
+        and isinstance(artifacts, dict)
+        and all(isinstance(metadata, dict) for metadata in artifacts.values())
+    ):
+        logger.warning("Malformed grader evidence, extracting artifacts instead", run_id=run_id)
+        return set()
+
+    sources = set(sources)
+    result.metrics.update(metrics)
+    for name, metadata in artifacts.items():
+        result.artifact_metadata[name] = metadata
+    result.timings[EVIDENCE_ARTIFACT] = time.perf_counter() - started
+    # The test log is only a fallback for the JSON report
+    if "pytest_report.json" in sources:
+        sources.add("testlog.txt")
+    return sources
+
+
+def _run_extractor(
+    store: ArtifactStore,
+    run_id: str,
+    name: str,
+) -> tuple[dict[str, Any], dict[str, Any], float]:
+    """Fetch one artifact and run its extractor (in a worker thread)."""
+    started = time.perf_counter()
+    body = store.open_artifact(f"runs/{run_id}/{name}")
+    try:
+        metrics, metadata = EXTRACTORS[name](body)
+    finally:
+        body.close()
+    return metrics, metadata, time.perf_counter() - started
+
+
+def _get_executor() -> ThreadPoolExecutor:
+    global _executor
+    if _executor is None:
+        _executor = ThreadPoolExecutor(
+            max_workers=settings.evidence_extraction_workers,
+            thread_name_prefix="evidence",
+        )
+    return _executor
@@ -1,16 +1,46 @@
-"""Evidence artifact storage using S3/MinIO."""
+"""Evidence artifact storage using S3/MinIO.
 
+ArtifactStore wraps a single boto3 client per process. The client is
+thread-safe and keeps a pool of up to s3_max_connections HTTP connections,
+so API requests and extraction workers reuse connections instead of
+opening one per download. Presigned URLs are handed to browsers, so they
+are signed for s3_public_endpoint_url when that is set.
+
+boto3 blocks, so async code (the API routes) goes through
+AsyncArtifactStore: the same calls, run on a shared thread pool sized to
+the connection pool, with response bodies read in chunks off the event
+loop.
+"""
+
+import asyncio
 import hashlib
-from datetime import datetime, timedelta
-from typing import BinaryIO
+from collections.abc import AsyncIterator, Callable
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from typing import Any, BinaryIO, TypeVar
 
 import boto3
+from botocore.config import Config
 from botocore.exceptions import ClientError
 
-from app.config import settings
+from app.config import get_settings
 from app.logging_config import get_logger
 
 logger = get_logger(__name__)
+settings = get_settings()
+
+T = TypeVar("T")
+
+DOWNLOAD_CHUNK_SIZE = 64 * 1024
+
+
+@dataclass
+class ArtifactStream:
+    """An opened artifact body (or byte range of it)."""
+
+    body: BinaryIO
+    content_length: int
+    content_range: str | None = None  # e.g. "bytes 0-99/1234" for a range request
 
 
 class ArtifactStore:
@@ -19,11 +49,23 @@ class ArtifactStore:
     def __init__(self):
         self.s3_client = boto3.client(
             "s3",
-            endpoint_url=settings.S3_ENDPOINT,
-            aws_access_key_id=settings.S3_ACCESS_KEY,
-            aws_secret_access_key=settings.S3_SECRET_KEY,
+            endpoint_url=settings.s3_endpoint_url,
+            aws_access_key_id=settings.s3_access_key,
+            aws_secret_access_key=settings.s3_secret_key,
+            region_name=settings.s3_region,
+            config=Config(max_pool_connections=settings.s3_max_connections),
         )
-        self.bucket = settings.S3_BUCKET
+        # Signing makes no requests, so this client never opens a connection
+        self.presign_client = self.s3_client
+        if settings.s3_public_endpoint_url:
+            self.presign_client = boto3.client(
+                "s3",
+                endpoint_url=settings.s3_public_endpoint_url,
+                aws_access_key_id=settings.s3_access_key,
+                aws_secret_access_key=settings.s3_secret_key,
+                region_name=settings.s3_region,
+            )
+        self.bucket = settings.s3_bucket
 
     def upload_artifact(
         self,
@@ -78,20 +120,66 @@ class ArtifactStore:
             logger.error("Failed to get artifact", key=s3_key, error=str(e))
             raise
 
-    def get_presigned_url(self, s3_key: str, expires_in: int = 3600) -> str:
+    def open_artifact(self, s3_key: str) -> BinaryIO:
+        """Open an artifact for streaming reads; the caller closes it."""
+        try:
+            response = self.s3_client.get_object(Bucket=self.bucket, Key=s3_key)
+            return response["Body"]
+        except ClientError as e:
+            logger.error("Failed to get artifact", key=s3_key, error=str(e))
+            raise
+
+    def stream_artifact(self, s3_key: str, byte_range: str | None = None) -> ArtifactStream:
+        """Open an artifact, or one byte range of it, with its length.
+
+        Args:
+            s3_key: S3 key of the artifact
+            byte_range: HTTP Range header value (e.g. "bytes=0-99"), passed to S3
+
+        Returns:
+            ArtifactStream; the caller closes its body
+        """
+        params = {"Bucket": self.bucket, "Key": s3_key}
+        if byte_range:
+            params["Range"] = byte_range
+        try:
+            response = self.s3_client.get_object(**params)
+        except ClientError as e:
+            logger.error("Failed to get artifact", key=s3_key, range=byte_range, error=str(e))
+            raise
+        return ArtifactStream(
+            body=response["Body"],
+            content_length=response["ContentLength"],
+            content_range=response.get("ContentRange"),
+        )
+
+    def get_presigned_url(
+        self,
+        s3_key: str,
+        expires_in: int = 3600,
+        filename: str | None = None,
+        content_type: str | None = None,
+    ) -> str:
         """Generate a presigned URL for artifact download.
 
         Args:
             s3_key: S3 key of the artifact
             expires_in: URL expiration in seconds (default 1 hour)
+            filename: Served as an attachment with this name, if given
+            content_type: Content-Type S3 should respond with, if given
 
         Returns:
             Presigned URL string
         """
+        params = {"Bucket": self.bucket, "Key": s3_key}
+        if filename:
+            params["ResponseContentDisposition"] = f'attachment; filename="{filename}"'
+        if content_type:
+            params["ResponseContentType"] = content_type
         try:
-            url = self.s3_client.generate_presigned_url(
+            url = self.presign_client.generate_presigned_url(
                 "get_object",
-                Params={"Bucket": self.bucket, "Key": s3_key},
+                Params=params,
                 ExpiresIn=expires_in,
             )
             return url
@@ -107,6 +195,15 @@ class ArtifactStore:
         except ClientError:
             return False
 
+    def artifact_size(self, s3_key: str) -> int:
+        """Size of an artifact in bytes."""
+        try:
+            response = self.s3_client.head_object(Bucket=self.bucket, Key=s3_key)
+        except ClientError as e:
+            logger.error("Failed to get artifact size", key=s3_key, error=str(e))
+            raise
+        return response["ContentLength"]
+
     def delete_artifact(self, s3_key: str) -> None:
         """Delete an artifact."""
         try:
@@ -121,8 +218,76 @@ class ArtifactStore:
         return hashlib.sha256(content).hexdigest()
 
 
-# Global instance
+class AsyncArtifactStore:
+    """Non-blocking access to an ArtifactStore from the event loop."""
+
+    def __init__(self, store: ArtifactStore | None = None, max_workers: int | None = None):
+        self.store = store or get_artifact_store()
+        self._executor = ThreadPoolExecutor(
+            max_workers=max_workers or settings.s3_max_connections,
+            thread_name_prefix="artifact-store",
+        )
+
+    async def run(self, fn: Callable[..., T], *args: Any) -> T:
+        """Run a blocking call on the store's thread pool."""
+        return await asyncio.get_running_loop().run_in_executor(self._executor, fn, *args)
+
+    async def upload_artifact(
+        self,
+        run_id: str,
+        artifact_type: str,
+        content: bytes | BinaryIO,
+        content_type: str = "application/octet-stream",
+    ) -> str:
+        return await self.run(self.store.upload_artifact, run_id, artifact_type, content, content_type)
+
+    async def get_artifact(self, s3_key: str) -> bytes:
+        return await self.run(self.store.get_artifact, s3_key)
+
+    async def open_artifact(self, s3_key: str) -> BinaryIO:
+        return await self.run(self.store.open_artifact, s3_key)
+
+    async def stream_artifact(self, s3_key: str, byte_range: str | None = None) -> ArtifactStream:
+        return await self.run(self.store.stream_artifact, s3_key, byte_range)
+
+    async def iter_artifact(
+        self,
+        body: BinaryIO,
+        chunk_size: int = DOWNLOAD_CHUNK_SIZE,
+    ) -> AsyncIterator[bytes]:
+        """Yield an opened artifact's body in chunks, then close it."""
+        try:
+            while chunk := await self.run(body.read, chunk_size):
+                yield chunk
+        finally:
+            body.close()
+
+    async def get_presigned_url(
+        self,
+        s3_key: str,
+        expires_in: int = 3600,
+        filename: str | None = None,
+        content_type: str | None = None,
+    ) -> str:
+        # Signing is local (no request to S3), but credentials may need refreshing
+        return await self.run(self.store.get_presigned_url, s3_key, expires_in, filename, content_type)
+
+    async def artifact_exists(self, s3_key: str) -> bool:
+        return await self.run(self.store.artifact_exists, s3_key)
+
+    async def artifact_size(self, s3_key: str) -> int:
+        return await self.run(self.store.artifact_size, s3_key)
+
+    async def delete_artifact(self, s3_key: str) -> None:
+        await self.run(self.store.delete_artifact, s3_key)
+
+    def close(self) -> None:
+        self._executor.shutdown(wait=False)
+
+
+# Global instances
 _store: ArtifactStore | None = None
+_async_store: AsyncArtifactStore | None = None
 
 
 def get_artifact_store() -> ArtifactStore:
@@ -131,3 +296,19 @@ def get_artifact_store() -> ArtifactStore:
     if _store is None:
         _store = ArtifactStore()
     return _store
+
+
+def get_async_artifact_store() -> AsyncArtifactStore:
+    """Get the global async artifact store (sharing the global store's client)."""
+    global _async_store
+    if _async_store is None:
+        _async_store = AsyncArtifactStore()
+    return _async_store
+
+
+def close_artifact_stores() -> None:
+    """Shut down the async store's thread pool (on application shutdown)."""
+    global _async_store
+    if _async_store is not None:
+        _async_store.close()
+        _async_store = None
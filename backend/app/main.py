@@ -3,12 +3,17 @@
 from contextlib import asynccontextmanager
 from typing import AsyncGenerator
 
-from fastapi import FastAPI
+from fastapi import Depends, FastAPI
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import Response
 
 from app.api.router import api_router
+from app.api.routes.internal import verify_internal_key
 from app.config import get_settings
+from app.evidence.store import close_artifact_stores
 from app.logging_config import setup_logging, get_logger
+from app.proof.engine import get_proof_engine
+from app.proof.metrics import CONTENT_TYPE as METRICS_CONTENT_TYPE
 
 settings = get_settings()
 logger = get_logger(__name__)
@@ -27,6 +32,7 @@ async def lifespan(app: FastAPI) -> AsyncGenerator[None, None]:
     yield
     # Shutdown
     logger.info("Shutting down ProofHire API")
+    close_artifact_stores()
 
 
 app = FastAPI(
@@ -55,3 +61,12 @@ app.include_router(api_router, prefix="/api")
 async def health_check() -> dict[str, str]:
     """Health check endpoint."""
     return {"status": "healthy", "version": "0.1.0"}
+
+
+@app.get("/metrics", include_in_schema=False, dependencies=[Depends(verify_internal_key)])
+async def metrics() -> Response:
+    """Proof engine metrics in the Prometheus text format.
+
+    Needs the internal API key in X-Internal-Key, like the runner endpoints.
+    """
+    return Response(get_proof_engine().render_metrics(), media_type=METRICS_CONTENT_TYPE)
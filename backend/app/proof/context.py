@@ -0,0 +1,125 @@
+"""Evidence context for proof evaluation.
+
+Rules look metrics up by name and artifacts by type. Converting the raw
+Metric/Artifact rows into those lookups is done once per run here, and the
+same context is handed to every rule evaluating that run's claims.
+
+The context can also fingerprint the part of the evidence a rule reads
+(its RuleInputs), used by the proof memo (app/proof/memo.py) to recognise
+evidence it has seen before, even in another run.
+"""
+
+from dataclasses import dataclass, field
+from typing import Any
+
+from app.core.hashing import hash_json
+from app.db.models import Artifact, ArtifactType, Metric
+
+
+@dataclass(frozen=True)
+class RuleInputs:
+    """The evidence a rule reads.
+
+    Artifacts are (type, metadata key) pairs; a key of None means the rule
+    only checks that an artifact of that type exists. Tags are the llm_tags
+    names the rule looks for.
+    """
+
+    metrics: frozenset[str] = frozenset()
+    com: frozenset[str] = frozenset()
+    artifacts: frozenset[tuple[ArtifactType, str | None]] = frozenset()
+    llm_tags: frozenset[str] = frozenset()
+
+
+@dataclass
+class EvidenceContext:
+    """Indexed evidence for one run."""
+
+    metrics: dict[str, Any] = field(default_factory=dict)
+    artifacts: dict[ArtifactType, Artifact] = field(default_factory=dict)
+    artifacts_by_type: dict[ArtifactType, list[Artifact]] = field(default_factory=dict)
+    artifacts_by_id: dict[str, Artifact] = field(default_factory=dict)
+    llm_tags: list[dict[str, Any]] | None = None
+    com: dict[str, Any] = field(default_factory=dict)
+    _fingerprints: dict[RuleInputs, str | None] = field(default_factory=dict, init=False, repr=False, compare=False)
+
+    @classmethod
+    def build(
+        cls,
+        metrics: list[Metric],
+        artifacts: list[Artifact],
+        llm_tags: list[dict[str, Any]] | None = None,
+        com: dict[str, Any] | None = None,
+    ) -> "EvidenceContext":
+        """Index a run's metrics and artifacts."""
+        context = cls(llm_tags=llm_tags, com=com or {})
+
+        for m in metrics:
+            if m.value_float is not None:
+                context.metrics[m.name] = m.value_float
+            elif m.value_bool is not None:
+                context.metrics[m.name] = m.value_bool
+            elif m.value_text is not None:
+                context.metrics[m.name] = m.value_text
+
+        for a in artifacts:
+            # Last artifact of a type wins, as rules expect one per type
+            context.artifacts[a.type] = a
+            context.artifacts_by_type.setdefault(a.type, []).append(a)
+            if a.id is not None:
+                context.artifacts_by_id[a.id] = a
+
+        return context
+
+    def fingerprint(self, inputs: RuleInputs) -> str | None:
+        """Stable hash of the evidence named by inputs, or None if not hashable.
+
+        Artifact ids are left out, so runs with the same evidence share a
+        fingerprint. Computed once per inputs; build a new context rather
+        than mutating one.
+        """
+        if inputs not in self._fingerprints:
+            artifacts: dict[str, dict[str, Any] | None] = {}
+            for artifact_type, key in inputs.artifacts:
+                name = getattr(artifact_type, "value", artifact_type)
+                artifact = self.artifacts.get(artifact_type)
+                if artifact is None:
+                    artifacts[name] = None
+                    continue
+                metadata = artifacts.setdefault(name, {})
+                if key is not None:
+                    metadata[key] = (artifact.metadata_json or {}).get(key)
+
+            try:
+                self._fingerprints[inputs] = hash_json({
+                    "metrics": {name: self.metrics[name] for name in inputs.metrics if name in self.metrics},
+                    "com": {key: self.com[key] for key in inputs.com if key in self.com},
+                    "artifacts": artifacts,
+                    # Whether tagging ran at all, then the tags asked for in order
+                    "tagged": bool(self.llm_tags) if inputs.llm_tags else None,
+                    "llm_tags": [
+                        [tag.get("tag"), tag.get("evidence_quote")]
+                        for tag in self.llm_tags or []
+                        if tag.get("tag") in inputs.llm_tags
+                    ],
+                })
+            except (TypeError, ValueError):
+                self._fingerprints[inputs] = None
+        return self._fingerprints[inputs]
+
+    def metric_float(self, name: str, default: float | None = None) -> float | None:
+        """A numeric metric, or default if missing or not numeric."""
+        value = self.metrics.get(name)
+        if isinstance(value, bool) or not isinstance(value, (int, float)):
+            return default
+        return float(value)
+
+    def metric_bool(self, name: str, default: bool = False) -> bool:
+        """A boolean metric, or default if missing or not boolean."""
+        value = self.metrics.get(name)
+        return value if isinstance(value, bool) else default
+
+    def metric_text(self, name: str, default: str | None = None) -> str | None:
+        """A text metric, or default if missing or not text."""
+        value = self.metrics.get(name)
+        return value if isinstance(value, str) else default
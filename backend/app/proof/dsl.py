@@ -0,0 +1,514 @@
+"""Declarative proof rules.
+
+Rules can be written as YAML (or JSON) instead of Python. Definitions are
+loaded from app/proof/rules/definitions and, if set, settings.proof_rules_dir,
+and compiled once into closures when the proof engine is created, so adding
+a rule for a simulation does not need a code deploy.
+
+A definition file holds a list of rules:
+
+    rules:
+      - id: time_efficient_v1
+        claim_types: [time_efficient]
+        dimensions: [shipping_speed]
+        com_defaults: {pace: medium}
+        steps:
+          - require: {metric: time_to_green_seconds, op: exists}
+            reason: Time to completion not recorded
+          - prove_if:
+              metric: time_to_green_seconds
+              op: le
+              threshold: {com: pace, values: {high: 2400, medium: 3000}, default: 3000}
+            reason: Completed in {time_to_green_seconds!m} minutes
+          - reject: Took longer than expected for {com[pace]} pace
+
+Steps run in order until one decides the result:
+
+- require / reason      UNPROVED with reason if the predicate is false
+- reject_if / reason    UNPROVED with reason if the predicate is true
+- prove_if / reason     PROVED with reason if the predicate is true
+- record_if             add the predicate's evidence if it is true
+- prove / reject        decide unconditionally (the last step should be one)
+
+Predicates:
+
+- {metric: name, op: <op>, value: x | threshold: {...}, default: d}
+  op is one of exists, truthy, falsy, eq, ne, gt, ge, lt, le. A missing
+  metric takes `default` if given, otherwise the predicate is false.
+- {artifact: <type>}                       artifact of that type exists
+- {artifact: <type>, count: <key>, op: ge, value: n}
+                                           length of a metadata list
+- {llm_tags: [names], min_count: n, min_quote_length: 10}
+                                           tags with a citation quote
+- {all: [...]}, {any: [...]}, {not: {...}}
+
+Reasons are format strings over the metric values (defaults included) and
+com, e.g. "{failed_tests_count} failing" or "{com[pace]}". The !i
+conversion renders a number as an integer and !m renders seconds as whole
+minutes.
+"""
+
+import operator
+import string
+from collections.abc import Callable
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any
+
+import yaml
+
+from app.core.hashing import hash_json
+from app.db.models import Artifact, ArtifactType
+from app.hypothesis.claim_schema import Claim, EvidenceRef, ProofResult
+from app.logging_config import get_logger
+from app.proof.context import RuleInputs
+from app.proof.engine import BaseRule
+
+logger = get_logger(__name__)
+
+DEFINITIONS_DIR = Path(__file__).parent / "rules" / "definitions"
+
+# (metrics, artifacts, llm_tags, com) -> (matched, evidence)
+Predicate = Callable[
+    [dict[str, Any], dict[Any, Artifact], list[dict[str, Any]] | None, dict[str, Any]],
+    tuple[bool, list[EvidenceRef]],
+]
+
+_COMPARISONS: dict[str, Callable[[Any, Any], bool]] = {
+    "eq": operator.eq,
+    "ne": operator.ne,
+    "gt": operator.gt,
+    "ge": operator.ge,
+    "lt": operator.lt,
+    "le": operator.le,
+}
+
+_MISSING = object()
+
+
+class RuleDefinitionError(ValueError):
+    """A rule definition is malformed."""
+
+
+class _ReasonFormatter(string.Formatter):
+    """str.format with !i (integer) and !m (seconds as whole minutes)."""
+
+    def convert_field(self, value: Any, conversion: str | None) -> Any:
+        if conversion == "i":
+            return int(value)
+        if conversion == "m":
+            return int(value / 60)
+        return super().convert_field(value, conversion)
+
+
+_formatter = _ReasonFormatter()
+
+
+class CompiledRule(BaseRule):
+    """A proof rule compiled from a declarative definition."""
+
+    def __init__(
+        self,
+        id: str,
+        claim_types: list[str],
+        dimensions: list[str],
+        steps: list[tuple[str, Predicate | None, str]],
+        metric_defaults: dict[str, Any],
+        com_defaults: dict[str, Any],
+        source: str = "",
+        version: str = "1",
+        inputs: RuleInputs | None = None,
+    ):
+        self.id = id
+        self.claim_types = claim_types
+        self.dimensions = dimensions
+        self.source = source
+        self.version = version
+        self.inputs = inputs
+        self._steps = steps
+        self._metric_defaults = metric_defaults
+        self._com_defaults = com_defaults
+
+    def evaluate(
+        self,
+        claim: Claim,
+        metrics: dict[str, Any],
+        artifacts: dict[str, Artifact],
+        llm_tags: list[dict[str, Any]] | None,
+        com: dict[str, Any],
+    ) -> ProofResult:
+        if self._com_defaults:
+            com = {**self._com_defaults, **com}
+
+        evidence_refs: list[EvidenceRef] = []
+        seen: set[tuple] = set()
+
+        def add(refs: list[EvidenceRef]) -> None:
+            for ref in refs:
+                key = (ref.type, ref.id, ref.field)
+                if key not in seen:
+                    seen.add(key)
+                    evidence_refs.append(ref)
+
+        for kind, predicate, reason in self._steps:
+            if predicate is None:
+                if kind == "prove":
+                    return self._create_proved(claim, evidence_refs, self._reason(reason, metrics, com))
+                return self._create_unproved(claim, evidence_refs, self._reason(reason, metrics, com))
+
+            matched, refs = predicate(metrics, artifacts, llm_tags, com)
+
+            if kind == "require":
+                if not matched:
+                    return self._create_unproved(claim, evidence_refs, self._reason(reason, metrics, com))
+                add(refs)
+            elif kind == "reject_if":
+                if matched:
+                    return self._create_unproved(claim, evidence_refs, self._reason(reason, metrics, com))
+            elif kind == "prove_if":
+                if matched:
+                    add(refs)
+                    return self._create_proved(claim, evidence_refs, self._reason(reason, metrics, com))
+            elif matched:  # record_if
+                add(refs)
+
+        return self._create_unproved(claim, evidence_refs, "No rule condition met")
+
+    def _reason(self, template: str, metrics: dict[str, Any], com: dict[str, Any]) -> str:
+        values = {**self._metric_defaults, **metrics, "com": com}
+        try:
+            return _formatter.vformat(template, (), values)
+        except (KeyError, IndexError, TypeError, ValueError):
+            # A reason referencing missing evidence must not fail the proof
+            return template
+
+
+def compile_rule(definition: dict[str, Any], source: str = "") -> CompiledRule:
+    """Compile one rule definition.
+
+    Raises:
+        RuleDefinitionError: If the definition is malformed
+    """
+    try:
+        return _compile_rule(definition, source)
+    except (TypeError, KeyError, AttributeError) as e:
+        # Wrong shapes the explicit checks below do not anticipate
+        raise RuleDefinitionError(f"Malformed rule in {source or 'definition'}: {e!r}") from e
+
+
+def _compile_rule(definition: dict[str, Any], source: str) -> CompiledRule:
+    if not isinstance(definition, dict):
+        raise RuleDefinitionError(f"Rule in {source or 'definition'} must be a mapping")
+    for key in ("id", "claim_types", "steps"):
+        if key not in definition:
+            raise RuleDefinitionError(f"Rule in {source or 'definition'} is missing '{key}'")
+
+    rule_id = definition["id"]
+    for key in ("claim_types", "steps", "dimensions"):
+        if not isinstance(definition.get(key, []), list):
+            raise RuleDefinitionError(f"{rule_id}: '{key}' must be a list")
+    if not isinstance(definition.get("com_defaults", {}), dict):
+        raise RuleDefinitionError(f"{rule_id}: 'com_defaults' must be a mapping")
+
+    metric_defaults: dict[str, Any] = {}
+    used = _Inputs(com=set(definition.get("com_defaults", {})))
+    steps = []
+
+    for index, step in enumerate(definition["steps"]):
+        where = f"{rule_id} step {index + 1}"
+        if not isinstance(step, dict):
+            raise RuleDefinitionError(f"{where}: step must be a mapping")
+
+        if "prove" in step or "reject" in step:
+            kind = "prove" if "prove" in step else "reject"
+            steps.append((kind, None, str(step[kind])))
+            used.add_reason(steps[-1][2])
+            continue
+
+        kinds = [k for k in ("require", "reject_if", "prove_if", "record_if") if k in step]
+        if len(kinds) != 1:
+            raise RuleDefinitionError(f"{where}: expected exactly one step kind, got {kinds or 'none'}")
+        kind = kinds[0]
+
+        if kind != "record_if" and "reason" not in step:
+            raise RuleDefinitionError(f"{where}: '{kind}' needs a reason")
+
+        predicate = _compile_predicate(step[kind], where, metric_defaults, used)
+        steps.append((kind, predicate, str(step.get("reason", ""))))
+        used.add_reason(steps[-1][2])
+
+    return CompiledRule(
+        id=rule_id,
+        claim_types=list(definition["claim_types"]),
+        dimensions=list(definition.get("dimensions", [])),
+        steps=steps,
+        metric_defaults=metric_defaults,
+        com_defaults=dict(definition.get("com_defaults", {})),
+        source=source,
+        # Editing a definition changes its version, invalidating memoized results
+        version=hash_json(definition)[:16],
+        inputs=used.freeze(),
+    )
+
+
+def load_rules(directories: list[Path]) -> list[CompiledRule]:
+    """Load and compile every rule definition file in the given directories.
+
+    A file that fails to load or compile is logged and skipped; claims it
+    would have covered stay UNPROVED (fail closed).
+    """
+    rules = []
+    for directory in directories:
+        if not directory.exists():
+            logger.warning("Rule definitions directory not found", path=str(directory))
+            continue
+
+        for path in sorted([*directory.glob("*.yaml"), *directory.glob("*.yml"), *directory.glob("*.json")]):
+            try:
+                with open(path) as f:
+                    data = yaml.safe_load(f) or {}
+                if not isinstance(data, dict) or not isinstance(data.get("rules", []), list):
+                    raise RuleDefinitionError("expected a mapping with a 'rules' list")
+                compiled = [compile_rule(d, source=str(path)) for d in data.get("rules", [])]
+            except (OSError, yaml.YAMLError, RuleDefinitionError) as e:
+                logger.error("Failed to load rule definitions", file=str(path), error=str(e))
+                continue
+
+            rules.extend(compiled)
+            logger.info("Loaded rule definitions", file=str(path), count=len(compiled))
+
+    return rules
+
+
+@dataclass
+class _Inputs:
+    """Evidence referenced by a rule definition, collected while compiling."""
+
+    metrics: set[str] = field(default_factory=set)
+    com: set[str] = field(default_factory=set)
+    artifacts: set[tuple[ArtifactType, str | None]] = field(default_factory=set)
+    llm_tags: set[str] = field(default_factory=set)
+    # A reason formats the whole COM, so no subset of it can be named
+    all_com: bool = False
+
+    def add_reason(self, template: str) -> None:
+        try:
+            fields = [name for _, name, _, _ in _formatter.parse(template) if name]
+        except ValueError:
+            # Rendered verbatim at evaluation time
+            return
+        for name in fields:
+            head, _, rest = name.partition("[")
+            head = head.split(".")[0]
+            if head != "com":
+                self.metrics.add(head)
+            elif rest:
+                self.com.add(rest.split("]")[0])
+            else:
+                self.all_com = True
+
+    def freeze(self) -> RuleInputs | None:
+        if self.all_com:
+            return None
+        return RuleInputs(
+            metrics=frozenset(self.metrics),
+            com=frozenset(self.com),
+            artifacts=frozenset(self.artifacts),
+            llm_tags=frozenset(self.llm_tags),
+        )
+
+
+def _compile_predicate(spec: Any, where: str, metric_defaults: dict[str, Any], used: _Inputs) -> Predicate:
+    if not isinstance(spec, dict):
+        raise RuleDefinitionError(f"{where}: predicate must be a mapping")
+
+    if "all" in spec or "any" in spec:
+        combine = all if "all" in spec else any
+        specs = spec["all" if "all" in spec else "any"]
+        if not isinstance(specs, list):
+            raise RuleDefinitionError(f"{where}: 'all' / 'any' needs a list of predicates")
+        parts = [_compile_predicate(p, where, metric_defaults, used) for p in specs]
+
+        def combined(metrics, artifacts, llm_tags, com):
+            refs: list[EvidenceRef] = []
+            results = []
+            for part in parts:
+                matched, part_refs = part(metrics, artifacts, llm_tags, com)
+                results.append(matched)
+                if matched:
+                    refs.extend(part_refs)
+            return combine(results), refs
+
+        return combined
+
+    if "not" in spec:
+        inner = _compile_predicate(spec["not"], where, metric_defaults, used)
+
+        def negated(metrics, artifacts, llm_tags, com):
+            matched, _ = inner(metrics, artifacts, llm_tags, com)
+            return not matched, []
+
+        return negated
+
+    if "metric" in spec:
+        return _compile_metric(spec, where, metric_defaults, used)
+    if "artifact" in spec:
+        return _compile_artifact(spec, where, used)
+    if "llm_tags" in spec:
+        return _compile_llm_tags(spec, where, used)
+
+    raise RuleDefinitionError(f"{where}: unknown predicate {sorted(spec)}")
+
+
+def _compile_metric(
+    spec: dict[str, Any], where: str, metric_defaults: dict[str, Any], used: _Inputs
+) -> Predicate:
+    name = spec["metric"]
+    used.metrics.add(name)
+    op = spec.get("op", "truthy")
+    default = spec.get("default", _MISSING)
+    if default is not _MISSING:
+        metric_defaults.setdefault(name, default)
+
+    test = _compile_test(spec, op, where)
+    if isinstance(spec.get("threshold"), dict):
+        used.com.add(spec["threshold"]["com"])
+
+    def predicate(metrics, _artifacts, _llm_tags, com):
+        value = metrics.get(name, default)
+        if value is _MISSING or value is None:
+            return False, []
+        try:
+            matched = test(value, com)
+        except TypeError:
+            # e.g. a text metric compared with a number
+            return False, []
+        return matched, [EvidenceRef(type="metric", id=name, field="value", value=value)]
+
+    return predicate
+
+
+def _compile_test(spec: dict[str, Any], op: Any, where: str) -> Callable[[Any, dict[str, Any]], bool]:
+    """The (value, com) -> bool check applied to a metric."""
+    if op == "exists":
+
+        def exists(_value, _com):
+            return True
+
+        return exists
+
+    if op == "truthy":
+
+        def truthy(value, _com):
+            return bool(value)
+
+        return truthy
+
+    if op == "falsy":
+
+        def falsy(value, _com):
+            return not value
+
+        return falsy
+
+    if op not in _COMPARISONS:
+        raise RuleDefinitionError(f"{where}: unknown op '{op}'")
+    compare = _COMPARISONS[op]
+
+    if "threshold" in spec:
+        threshold = _compile_threshold(spec["threshold"], where)
+
+        def against_threshold(value, com):
+            return compare(value, threshold(com))
+
+        return against_threshold
+
+    if "value" in spec:
+        expected = spec["value"]
+
+        def against_value(value, _com):
+            return compare(value, expected)
+
+        return against_value
+
+    raise RuleDefinitionError(f"{where}: '{op}' on {spec['metric']} needs a value or threshold")
+
+
+def _compile_threshold(spec: Any, where: str) -> Callable[[dict[str, Any]], Any]:
+    """A threshold that depends on a COM setting, e.g. pace."""
+    if not isinstance(spec, dict) or "com" not in spec or "values" not in spec:
+        raise RuleDefinitionError(f"{where}: threshold needs 'com' and 'values'")
+    if not isinstance(spec["values"], dict):
+        raise RuleDefinitionError(f"{where}: threshold 'values' must be a mapping")
+
+    key = spec["com"]
+    values = dict(spec["values"])
+    default = spec.get("default")
+
+    def threshold(com):
+        return values.get(com.get(key), default)
+
+    return threshold
+
+
+def _compile_artifact(spec: dict[str, Any], where: str, used: _Inputs) -> Predicate:
+    try:
+        artifact_type = ArtifactType(spec["artifact"])
+    except (TypeError, ValueError):
+        raise RuleDefinitionError(f"{where}: unknown artifact type '{spec['artifact']}'") from None
+
+    count_key = spec.get("count")
+    used.artifacts.add((artifact_type, count_key))
+    if count_key is None:
+
+        def exists(_metrics, artifacts, _llm_tags, _com):
+            artifact = artifacts.get(artifact_type)
+            if not artifact:
+                return False, []
+            return True, [
+                EvidenceRef(type="artifact", id=artifact.id, field="type", value=artifact_type.value)
+            ]
+
+        return exists
+
+    op = spec.get("op", "ge")
+    if op not in _COMPARISONS or "value" not in spec:
+        raise RuleDefinitionError(f"{where}: artifact count needs a comparison op and value")
+    compare = _COMPARISONS[op]
+    expected = spec["value"]
+
+    def counted(_metrics, artifacts, _llm_tags, _com):
+        artifact = artifacts.get(artifact_type)
+        if not artifact:
+            return False, []
+        count = len((artifact.metadata_json or {}).get(count_key, []))
+        return compare(count, expected), [
+            EvidenceRef(type="artifact", id=artifact.id, field=count_key, value=count)
+        ]
+
+    return counted
+
+
+def _compile_llm_tags(spec: dict[str, Any], where: str, used: _Inputs) -> Predicate:
+    if not isinstance(spec["llm_tags"], list):
+        raise RuleDefinitionError(f"{where}: 'llm_tags' must be a list of tag names")
+    wanted = set(spec["llm_tags"])
+    used.llm_tags.update(wanted)
+    min_count = spec.get("min_count", 1)
+    min_quote_length = spec.get("min_quote_length", 10)
+
+    def tagged(_metrics, _artifacts, llm_tags, _com):
+        refs = []
+        found = set()
+        for tag in llm_tags or []:
+            name = tag.get("tag", "")
+            quote = tag.get("evidence_quote", "")
+            # Only tags grounded in a citation count as evidence
+            if name in wanted and name not in found and len(quote or "") >= min_quote_length:
+                found.add(name)
+                refs.append(
+                    EvidenceRef(type="llm_tag", id=name, field="evidence_quote", value=quote[:100])
+                )
+        return len(found) >= min_count, refs
+
+    return tagged
@@ -6,11 +6,16 @@ The proof engine is the core of the fail-closed guarantee:
 - All proof attempts are logged for audit
 """
 
+import time
+from pathlib import Path
 from typing import Any, Protocol, runtime_checkable
 from abc import ABC, abstractmethod
 
 from app.hypothesis.claim_schema import Claim, ProofResult, EvidenceRef
 from app.db.models import Metric, Artifact, ArtifactType
+from app.proof.context import EvidenceContext, RuleInputs
+from app.proof.memo import RuleMemo
+from app.proof.metrics import ProofMetrics
 from app.logging_config import get_logger
 
 logger = get_logger(__name__)
@@ -53,6 +58,10 @@ class BaseRule(ABC):
     id: str
     claim_types: list[str]
     dimensions: list[str]
+    # Part of the proof memo key: bump when a rule's logic changes
+    version: str = "1"
+    # Evidence the rule reads; rules without declared inputs are not memoized
+    inputs: RuleInputs | None = None
 
     @abstractmethod
     def evaluate(
@@ -101,11 +110,14 @@ class ProofEngine:
     """Main proof engine that coordinates rule evaluation.
 
     The engine maintains a registry of rules and applies the appropriate
-    rules to each claim type.
+    rules to each claim type. With a memo, a rule that has already seen
+    the same evidence returns its earlier result instead of re-evaluating.
     """
 
-    def __init__(self):
+    def __init__(self, memo: RuleMemo | None = None):
         self._rules: dict[str, list[Rule]] = {}
+        self.memo = memo
+        self.metrics = ProofMetrics()
 
     def register_rule(self, rule: Rule) -> None:
         """Register a rule with the engine."""
@@ -126,19 +138,20 @@ class ProofEngine:
         """Evaluate a single claim.
 
         If multiple rules apply, the claim is PROVED if ANY rule proves it.
+        To evaluate several claims of one run, use evaluate_all, which
+        indexes the evidence once.
         """
-        # Convert metrics and artifacts to dicts
-        metrics_dict = {}
-        for m in metrics:
-            if m.value_float is not None:
-                metrics_dict[m.name] = m.value_float
-            elif m.value_bool is not None:
-                metrics_dict[m.name] = m.value_bool
-            elif m.value_text is not None:
-                metrics_dict[m.name] = m.value_text
-
-        artifacts_dict = {a.type: a for a in artifacts}
+        context = EvidenceContext.build(metrics, artifacts, llm_tags, com)
+        return self.evaluate_with_context(claim, context)
 
+    def evaluate_with_context(self, claim: Claim, context: EvidenceContext) -> ProofResult:
+        """Evaluate a single claim against already indexed evidence."""
+        started = time.perf_counter()
+        result = self._evaluate_rules(claim, context)
+        self.metrics.observe_claim(claim.claim_type, time.perf_counter() - started, result.status)
+        return result
+
+    def _evaluate_rules(self, claim: Claim, context: EvidenceContext) -> ProofResult:
         # Get applicable rules
         rules = self._rules.get(claim.claim_type, [])
 
@@ -158,7 +171,7 @@ class ProofEngine:
 
         for rule in rules:
             try:
-                result = rule.evaluate(claim, metrics_dict, artifacts_dict, llm_tags, com)
+                result = self._evaluate_rule(rule, claim, context)
                 all_evidence_refs.extend(result.evidence_refs)
 
                 if result.status == "PROVED":
@@ -194,6 +207,31 @@ class ProofEngine:
             reason="; ".join(reasons),
         )
 
+    def _evaluate_rule(self, rule: Rule, claim: Claim, context: EvidenceContext) -> ProofResult:
+        key = self.memo.key(rule, claim, context) if self.memo is not None else None
+        if key is not None:
+            cached = self.memo.get(key, claim, context)
+            if cached is not None:
+                return cached
+
+        started = time.perf_counter()
+        try:
+            result = rule.evaluate(
+                claim, context.metrics, context.artifacts, context.llm_tags, context.com
+            )
+        except Exception as e:
+            self.metrics.observe_rule_exception(rule.id, time.perf_counter() - started, e)
+            raise
+        self.metrics.observe_rule(rule.id, time.perf_counter() - started, result.status)
+
+        if key is not None:
+            self.memo.put(key, result, context)
+        return result
+
+    def render_metrics(self) -> str:
+        """Rule and claim metrics in the Prometheus text format."""
+        return self.metrics.render(self.memo.stats if self.memo is not None else None)
+
     def evaluate_all(
         self,
         claims: list[Claim],
@@ -202,12 +240,26 @@ class ProofEngine:
         llm_tags: list[dict[str, Any]] | None,
         com: dict[str, Any],
     ) -> list[ProofResult]:
-        """Evaluate all claims and return results."""
-        results = []
-        for claim in claims:
-            result = self.evaluate_claim(claim, metrics, artifacts, llm_tags, com)
-            results.append(result)
-        return results
+        """Evaluate all claims of one run and return results."""
+        context = EvidenceContext.build(metrics, artifacts, llm_tags, com)
+        return [self.evaluate_with_context(claim, context) for claim in claims]
+
+    def evaluate_batch(
+        self,
+        runs: list[tuple[list[Claim], EvidenceContext]],
+    ) -> list[list[ProofResult]]:
+        """Evaluate the claims of many runs in one call.
+
+        Args:
+            runs: (claims, evidence context) per run
+
+        Returns:
+            One list of results per run, in the same order
+        """
+        return [
+            [self.evaluate_with_context(claim, context) for claim in claims]
+            for claims, context in runs
+        ]
 
 
 # Global engine instance
@@ -217,20 +269,34 @@ _engine: ProofEngine | None = None
 def get_proof_engine() -> ProofEngine:
     """Get the global proof engine instance.
 
-    Lazily initializes and registers all rules.
+    Lazily initializes and registers all rules: the Python rules, then the
+    declarative rules from rules/definitions and settings.proof_rules_dir.
+    Rule results are memoized per settings.proof_memo_size and
+    settings.proof_memo_redis.
     """
     global _engine
 
     if _engine is None:
-        _engine = ProofEngine()
+        from app.config import get_settings
+
+        settings = get_settings()
+        memo = None
+        if settings.proof_memo_size > 0:
+            import redis
+
+            memo = RuleMemo(
+                max_entries=settings.proof_memo_size,
+                redis_client=redis.from_url(settings.redis_url) if settings.proof_memo_redis else None,
+                ttl_seconds=settings.proof_memo_ttl_seconds,
+            )
+        _engine = ProofEngine(memo=memo)
 
         # Import and register rules
+        from app.proof.dsl import DEFINITIONS_DIR, load_rules
         from app.proof.rules.backend_engineer_v1 import (
             AddedRegressionTestRule,
             DebuggingEffectiveRule,
             TestingDisciplineRule,
-            TimeEfficientRule,
-            HandlesEdgeCasesRule,
         )
         from app.proof.rules.communication_v1 import CommunicationClearRule
 
@@ -238,8 +304,14 @@ def get_proof_engine() -> ProofEngine:
         _engine.register_rule(AddedRegressionTestRule())
         _engine.register_rule(DebuggingEffectiveRule())
         _engine.register_rule(TestingDisciplineRule())
-        _engine.register_rule(TimeEfficientRule())
-        _engine.register_rule(HandlesEdgeCasesRule())
         _engine.register_rule(CommunicationClearRule())
 
+        # Declarative rules, compiled once here
+        rule_dirs = [DEFINITIONS_DIR]
+        proof_rules_dir = settings.proof_rules_dir
+        if proof_rules_dir:
+            rule_dirs.append(Path(proof_rules_dir))
+        for rule in load_rules(rule_dirs):
+            _engine.register_rule(rule)
+
     return _engine
@@ -0,0 +1,158 @@
+"""Memoization of rule results.
+
+A rule is a pure function of the claim type and the evidence it reads, so
+its result can be reused whenever the same rule version sees the same
+values again: orchestration retries, bulk re-evaluation of a role, or
+another run with the same outcome.
+
+Only rules that declare their inputs (RuleInputs) are memoized. Results
+are keyed by hash_json of (rule id, rule version, claim type, fingerprint
+of those inputs) and kept in two tiers:
+
+- an in-process LRU, shared by everything using the engine in a process
+- optionally Redis, shared by the API, orchestration workers and the
+  re-evaluation pool (settings.proof_memo_redis)
+
+Cached values hold everything in a ProofResult except the claim, which is
+re-attached on a hit. Artifact ids are not part of the key, so artifact
+evidence is stored by artifact type and pointed at the current run's
+artifact on a hit. Rule versions are part of the key, so changing a
+rule (bumping `version`, or editing a declarative definition) never serves
+results of the old rule.
+"""
+
+import json
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any
+
+import redis
+
+from app.core.hashing import hash_json
+from app.db.models import ArtifactType
+from app.hypothesis.claim_schema import Claim, ProofResult
+from app.logging_config import get_logger
+from app.proof.context import EvidenceContext
+
+logger = get_logger(__name__)
+
+
+@dataclass
+class MemoStats:
+    """Lookup counters since the memo was created."""
+
+    hits: int = 0
+    redis_hits: int = 0
+    misses: int = 0
+    redis_errors: int = 0
+
+    @property
+    def lookups(self) -> int:
+        return self.hits + self.redis_hits + self.misses
+
+    @property
+    def hit_rate(self) -> float:
+        """Fraction of lookups served from either tier."""
+        if not self.lookups:
+            return 0.0
+        return (self.hits + self.redis_hits) / self.lookups
+
+
+class RuleMemo:
+    """Two-tier cache of rule results keyed by evidence fingerprint."""
+
+    def __init__(
+        self,
+        max_entries: int = 10_000,
+        redis_client: redis.Redis | None = None,
+        ttl_seconds: int = 24 * 3600,
+        key_prefix: str = "proofhire:proof_memo",
+    ):
+        self.max_entries = max_entries
+        self.redis = redis_client
+        self.ttl_seconds = ttl_seconds
+        self.key_prefix = key_prefix
+        self.stats = MemoStats()
+        self._entries: OrderedDict[str, dict[str, Any]] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def key(self, rule: Any, claim: Claim, context: EvidenceContext) -> str | None:
+        """Cache key for a rule applied to a claim, or None if not cacheable."""
+        inputs = getattr(rule, "inputs", None)
+        if inputs is None:
+            return None
+        fingerprint = context.fingerprint(inputs)
+        if fingerprint is None:
+            return None
+        return hash_json([rule.id, getattr(rule, "version", None), claim.claim_type, fingerprint])
+
+    def get(self, key: str, claim: Claim, context: EvidenceContext) -> ProofResult | None:
+        """Look a result up, local tier first, and bind it to the claim and run."""
+        with self._lock:
+            value = self._entries.get(key)
+            if value is not None:
+                self._entries.move_to_end(key)
+                self.stats.hits += 1
+
+        if value is None and self.redis is not None:
+            try:
+                raw = self.redis.get(f"{self.key_prefix}:{key}")
+            except redis.RedisError as e:
+                self.stats.redis_errors += 1
+                logger.warning("Proof memo Redis lookup failed", error=str(e))
+                raw = None
+            if raw is not None:
+                value = json.loads(raw)
+                self.stats.redis_hits += 1
+                self._store_local(key, value)
+
+        if value is not None:
+            try:
+                refs = [
+                    {**ref, "id": context.artifacts[ArtifactType(ref["id"])].id} if ref["type"] == "artifact" else ref
+                    for ref in value["evidence_refs"]
+                ]
+            except (KeyError, ValueError):
+                # The rule cited an artifact it did not declare as an input
+                value = None
+
+        if value is None:
+            self.stats.misses += 1
+            return None
+
+        return ProofResult(claim=claim, **{**value, "evidence_refs": refs})
+
+    def put(self, key: str, result: ProofResult, context: EvidenceContext) -> None:
+        """Store a rule result in both tiers."""
+        value = result.model_dump(mode="json", exclude={"claim"})
+        for ref in value["evidence_refs"]:
+            if ref["type"] == "artifact":
+                artifact = context.artifacts_by_id.get(ref["id"])
+                if artifact is None or context.artifacts.get(artifact.type) is not artifact:
+                    # Only the run's current artifact of a type can be re-bound
+                    return
+                ref["id"] = artifact.type.value
+        self._store_local(key, value)
+
+        if self.redis is not None:
+            try:
+                self.redis.set(f"{self.key_prefix}:{key}", json.dumps(value), ex=self.ttl_seconds)
+            except redis.RedisError as e:
+                self.stats.redis_errors += 1
+                logger.warning("Proof memo Redis store failed", error=str(e))
+
+    def clear(self) -> None:
+        """Drop the local tier (Redis entries expire on their own)."""
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def _store_local(self, key: str, value: dict[str, Any]) -> None:
+        with self._lock:
+            self._entries[key] = value
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
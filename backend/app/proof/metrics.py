@@ -0,0 +1,179 @@
+"""Proof engine instrumentation.
+
+The engine records, per rule, how long each evaluation took and how it
+ended (PROVED, UNPROVED or an exception), and per claim type the final
+outcome and total evaluation time. The counters are rendered in the
+Prometheus text exposition format by the API's /metrics endpoint (which
+needs the internal API key in an X-Internal-Key header) and by the
+orchestration worker's metrics listener, e.g.:
+
+    # slowest rules
+    histogram_quantile(0.99, sum by (rule, le) (rate(proofhire_proof_rule_duration_seconds_bucket[5m])))
+    # share of claims proved, per claim type
+    sum by (claim_type) (rate(proofhire_proof_claims_total{status="PROVED"}[1h]))
+      / sum by (claim_type) (rate(proofhire_proof_claims_total[1h]))
+
+Counters are per process and reset on restart, as Prometheus expects.
+"""
+
+import bisect
+import threading
+from collections import defaultdict
+
+from app.proof.memo import MemoStats
+
+# Upper bounds in seconds; rules normally finish in well under a millisecond
+DURATION_BUCKETS = (0.0001, 0.00025, 0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.1, 0.5, 1.0)
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+
+class _Histogram:
+    def __init__(self) -> None:
+        self.counts = [0] * len(DURATION_BUCKETS)
+        self.count = 0
+        self.sum = 0.0
+
+    def observe(self, seconds: float) -> None:
+        index = bisect.bisect_left(DURATION_BUCKETS, seconds)
+        if index < len(self.counts):
+            self.counts[index] += 1
+        self.count += 1
+        self.sum += seconds
+
+
+class ProofMetrics:
+    """Per-rule and per-claim-type counters for one process."""
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._rule_durations: dict[str, _Histogram] = defaultdict(_Histogram)
+        self._rule_outcomes: dict[tuple[str, str], int] = defaultdict(int)
+        self._rule_exceptions: dict[tuple[str, str], int] = defaultdict(int)
+        self._claim_durations: dict[str, _Histogram] = defaultdict(_Histogram)
+        self._claim_outcomes: dict[tuple[str, str], int] = defaultdict(int)
+
+    def observe_rule(self, rule_id: str, seconds: float, status: str) -> None:
+        """Record one rule evaluation that returned a result."""
+        with self._lock:
+            self._rule_durations[rule_id].observe(seconds)
+            self._rule_outcomes[(rule_id, status)] += 1
+
+    def observe_rule_exception(self, rule_id: str, seconds: float, error: Exception) -> None:
+        """Record one rule evaluation that raised."""
+        with self._lock:
+            self._rule_durations[rule_id].observe(seconds)
+            self._rule_outcomes[(rule_id, "ERROR")] += 1
+            self._rule_exceptions[(rule_id, type(error).__name__)] += 1
+
+    def observe_claim(self, claim_type: str, seconds: float, status: str) -> None:
+        """Record the final outcome of one claim across all its rules."""
+        with self._lock:
+            self._claim_durations[claim_type].observe(seconds)
+            self._claim_outcomes[(claim_type, status)] += 1
+
+    def render(self, memo_stats: MemoStats | None = None) -> str:
+        """Render everything in the Prometheus text exposition format."""
+        lines: list[str] = []
+        with self._lock:
+            _render_histogram(
+                lines,
+                "proofhire_proof_rule_duration_seconds",
+                "Time spent evaluating a proof rule (memo hits excluded).",
+                "rule",
+                self._rule_durations,
+            )
+            _render_counter(
+                lines,
+                "proofhire_proof_rule_evaluations_total",
+                "Proof rule evaluations by outcome (PROVED, UNPROVED, ERROR).",
+                ("rule", "status"),
+                self._rule_outcomes,
+            )
+            _render_counter(
+                lines,
+                "proofhire_proof_rule_exceptions_total",
+                "Exceptions raised by proof rules, by exception type.",
+                ("rule", "exception"),
+                self._rule_exceptions,
+            )
+            _render_histogram(
+                lines,
+                "proofhire_proof_claim_duration_seconds",
+                "Time spent evaluating a claim across all its rules.",
+                "claim_type",
+                self._claim_durations,
+            )
+            _render_counter(
+                lines,
+                "proofhire_proof_claims_total",
+                "Claims evaluated, by claim type and final status.",
+                ("claim_type", "status"),
+                self._claim_outcomes,
+            )
+
+        if memo_stats is not None:
+            _render_counter(
+                lines,
+                "proofhire_proof_memo_lookups_total",
+                "Proof memo lookups by result.",
+                ("result",),
+                {
+                    ("hit",): memo_stats.hits,
+                    ("redis_hit",): memo_stats.redis_hits,
+                    ("miss",): memo_stats.misses,
+                },
+            )
+            _render_counter(
+                lines,
+                "proofhire_proof_memo_redis_errors_total",
+                "Failed proof memo Redis operations.",
+                (),
+                {(): memo_stats.redis_errors},
+            )
+
+        return "\n".join(lines) + "\n"
+
+
+def _labels(names: tuple[str, ...], values: tuple[str, ...]) -> str:
+    if not names:
+        return ""
+    pairs = ",".join(f'{n}="{_escape(v)}"' for n, v in zip(names, values, strict=True))
+    return "{" + pairs + "}"
+
+
+def _escape(value: str) -> str:
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _render_counter(
+    lines: list[str],
+    name: str,
+    help_text: str,
+    label_names: tuple[str, ...],
+    values: dict[tuple[str, ...], int],
+) -> None:
+    lines.append(f"# HELP {name} {help_text}")
+    lines.append(f"# TYPE {name} counter")
+    for label_values, value in sorted(values.items()):
+        lines.append(f"{name}{_labels(label_names, label_values)} {value}")
+
+
+def _render_histogram(
+    lines: list[str],
+    name: str,
+    help_text: str,
+    label_name: str,
+    histograms: dict[str, _Histogram],
+) -> None:
+    lines.append(f"# HELP {name} {help_text}")
+    lines.append(f"# TYPE {name} histogram")
+    for label_value, histogram in sorted(histograms.items()):
+        label = f'{label_name}="{_escape(label_value)}"'
+        cumulative = 0
+        for bound, count in zip(DURATION_BUCKETS, histogram.counts, strict=True):
+            cumulative += count
+            lines.append(f'{name}_bucket{{{label},le="{bound}"}} {cumulative}')
+        lines.append(f'{name}_bucket{{{label},le="+Inf"}} {histogram.count}')
+        lines.append(f"{name}_sum{{{label}}} {histogram.sum}")
+        lines.append(f"{name}_count{{{label}}} {histogram.count}")
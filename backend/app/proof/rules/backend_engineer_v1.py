@@ -1,12 +1,14 @@
 """Proof rules for backend engineer evaluation.
 
 These rules evaluate claims about backend engineering skills using
-deterministic evidence from simulation runs.
+deterministic evidence from simulation runs. Rules that fit the
+declarative format live in definitions/backend_engineer_v1.yaml.
 """
 
 from typing import Any
 
 from app.hypothesis.claim_schema import Claim, ProofResult, EvidenceRef
+from app.proof.context import RuleInputs
 from app.proof.engine import BaseRule
 from app.db.models import Artifact, ArtifactType
 
@@ -23,6 +25,9 @@ class AddedRegressionTestRule(BaseRule):
     id = "added_regression_test_v1"
     claim_types = ["added_regression_test"]
     dimensions = ["testing_discipline"]
+    inputs = RuleInputs(
+        metrics=frozenset({"tests_passed", "test_added", "test_files_changed", "tests_added_count"}),
+    )
 
     def evaluate(
         self,
@@ -97,6 +102,11 @@ class DebuggingEffectiveRule(BaseRule):
     id = "debugging_effective_v1"
     claim_types = ["debugging_effective"]
     dimensions = ["debugging_method"]
+    inputs = RuleInputs(
+        metrics=frozenset({"tests_passed", "time_to_green_seconds", "failed_tests_before"}),
+        com=frozenset({"pace"}),
+        llm_tags=frozenset({"root_cause_identified"}),
+    )
 
     def evaluate(
         self,
@@ -196,6 +206,10 @@ class TestingDisciplineRule(BaseRule):
     id = "testing_discipline_v1"
     claim_types = ["testing_discipline"]
     dimensions = ["testing_discipline"]
+    inputs = RuleInputs(
+        metrics=frozenset({"tests_added_count", "skipped_tests_added", "coverage_delta", "tests_passed"}),
+        com=frozenset({"quality_bar"}),
+    )
 
     def evaluate(
         self,
@@ -270,121 +284,3 @@ class TestingDisciplineRule(BaseRule):
             evidence_refs,
             "Could not verify testing discipline - no new tests added",
         )
-
-
-class TimeEfficientRule(BaseRule):
-    """Rule to prove time efficiency.
-
-    PROVE time_efficient if:
-    - time_to_green_seconds < threshold based on COM pace
-    """
-
-    id = "time_efficient_v1"
-    claim_types = ["time_efficient"]
-    dimensions = ["shipping_speed"]
-
-    def evaluate(
-        self,
-        claim: Claim,
-        metrics: dict[str, Any],
-        artifacts: dict[str, Artifact],
-        llm_tags: list[dict[str, Any]] | None,
-        com: dict[str, Any],
-    ) -> ProofResult:
-        evidence_refs = []
-
-        time_to_green = metrics.get("time_to_green_seconds")
-        if time_to_green is None:
-            return self._create_unproved(
-                claim,
-                evidence_refs,
-                "Time to completion not recorded",
-            )
-
-        evidence_refs.append(
-            EvidenceRef(type="metric", id="time_to_green_seconds", field="value", value=time_to_green)
-        )
-
-        # Get threshold based on COM
-        pace = com.get("pace", "medium")
-        threshold = {
-            "high": 2400,  # 40 min for high pace
-            "medium": 3000,  # 50 min
-            "low": 3600,  # 60 min
-        }.get(pace, 3000)
-
-        if time_to_green <= threshold:
-            minutes = int(time_to_green / 60)
-            return self._create_proved(
-                claim,
-                evidence_refs,
-                f"Candidate completed in {minutes} minutes, within threshold for {pace} pace",
-            )
-
-        return self._create_unproved(
-            claim,
-            evidence_refs,
-            f"Completion time ({int(time_to_green/60)} min) exceeded threshold for {pace} pace",
-        )
-
-
-class HandlesEdgeCasesRule(BaseRule):
-    """Rule to prove edge case handling.
-
-    PROVE handles_edge_cases if:
-    - All tests pass (including edge case tests)
-    - No failed assertions
-    """
-
-    id = "handles_edge_cases_v1"
-    claim_types = ["handles_edge_cases"]
-    dimensions = ["correctness"]
-
-    def evaluate(
-        self,
-        claim: Claim,
-        metrics: dict[str, Any],
-        artifacts: dict[str, Artifact],
-        llm_tags: list[dict[str, Any]] | None,
-        com: dict[str, Any],
-    ) -> ProofResult:
-        evidence_refs = []
-
-        # Check tests passed
-        tests_passed = metrics.get("tests_passed", False)
-        if not tests_passed:
-            return self._create_unproved(
-                claim,
-                evidence_refs,
-                "Tests did not pass - edge cases may not be handled",
-            )
-
-        evidence_refs.append(
-            EvidenceRef(type="metric", id="tests_passed", field="value", value=True)
-        )
-
-        # Check for failed tests (should be 0)
-        failed_count = metrics.get("failed_tests_count", 0)
-        evidence_refs.append(
-            EvidenceRef(type="metric", id="failed_tests_count", field="value", value=failed_count)
-        )
-
-        if failed_count > 0:
-            return self._create_unproved(
-                claim,
-                evidence_refs,
-                f"{failed_count} test(s) still failing",
-            )
-
-        # Check total tests to ensure coverage
-        total_tests = metrics.get("total_tests", 0)
-        if total_tests > 0:
-            evidence_refs.append(
-                EvidenceRef(type="metric", id="total_tests", field="value", value=total_tests)
-            )
-
-        return self._create_proved(
-            claim,
-            evidence_refs,
-            f"All {total_tests} tests pass including edge case tests",
-        )
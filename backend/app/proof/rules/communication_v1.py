@@ -7,6 +7,7 @@ writeup artifacts and LLM-derived tags (with citations).
 from typing import Any
 
 from app.hypothesis.claim_schema import Claim, ProofResult, EvidenceRef
+from app.proof.context import RuleInputs
 from app.proof.engine import BaseRule
 from app.db.models import Artifact, ArtifactType
 
@@ -31,6 +32,11 @@ class CommunicationClearRule(BaseRule):
     REQUIRED_TAGS = ["root_cause_identified", "tradeoff_discussed", "monitoring_considered"]
     MIN_TAGS_FOR_PROOF = 2  # Need at least 2 of 3 tags to prove
 
+    inputs = RuleInputs(
+        artifacts=frozenset({(ArtifactType.WRITEUP, "prompts")}),
+        llm_tags=frozenset(REQUIRED_TAGS),
+    )
+
     def evaluate(
         self,
         claim: Claim,
@@ -0,0 +1,225 @@
+"""Durable queue of completed runs waiting for orchestration.
+
+The internal API enqueues a run when the runner reports completion; the
+orchestration worker (app/workers/orchestration.py) consumes it. Redis
+layout, with q = settings.orchestration_queue:
+
+- {q}                  list of run_ids waiting to be processed
+- {q}:payloads         hash run_id -> completion payload (metrics, artifacts)
+- {q}:processing       list of run_ids taken by a worker
+- {q}:lease:{run_id}   held while a worker processes the run (TTL refreshed)
+- {q}:delayed          sorted set run_id -> time of the next retry
+- {q}:attempts         hash run_id -> failed attempts so far
+- {q}:done:{run_id}    set once a run is orchestrated; later deliveries are skipped
+- {q}:dead             list of run_ids that exhausted their attempts
+- {q}:dead:payloads    hash run_id -> payload of a dead-lettered run (for inspection)
+
+Everything is keyed on run_id, so a run is queued at most once no matter
+how often its completion is reported, and a run whose lease has expired
+(worker crashed) is picked up again by the next worker's maintenance pass.
+"""
+
+import json
+import random
+import time
+from typing import Any
+
+import redis.asyncio as redis
+
+from app.config import get_settings
+from app.logging_config import get_logger
+
+logger = get_logger(__name__)
+settings = get_settings()
+
+# How long a finished run is remembered for deduplication
+DONE_TTL_SECONDS = 7 * 24 * 3600
+
+
+async def enqueue_orchestration(
+    r: redis.Redis,
+    run_id: str,
+    metrics: dict[str, Any],
+    artifact_urls: dict[str, str],
+    artifact_hashes: dict[str, str],
+) -> bool:
+    """Queue a completed run for orchestration.
+
+    Returns False if the run is already queued (its payload is refreshed) or
+    has already been orchestrated.
+    """
+    queue = settings.orchestration_queue
+    payloads_key = f"{queue}:payloads"
+    done_key = f"{queue}:done:{run_id}"
+
+    payload = json.dumps({
+        "metrics": metrics,
+        "artifact_urls": artifact_urls,
+        "artifact_hashes": artifact_hashes,
+        "enqueued_at": time.time(),
+    })
+
+    # The payload and the queue entry are written in one MULTI, so a crash
+    # can never leave a payload (which dedupes later notifies) without a
+    # queue entry; WATCH retries if another notify for the run races us
+    async def enqueue(pipe: redis.client.Pipeline) -> str:
+        if await pipe.exists(done_key):
+            return "done"
+        queued = await pipe.hexists(payloads_key, run_id)
+        pipe.multi()
+        pipe.hset(payloads_key, run_id, payload)
+        if not queued:
+            pipe.lpush(queue, run_id)
+        return "queued" if queued else "new"
+
+    outcome = await r.transaction(enqueue, payloads_key, done_key, value_from_callable=True)
+
+    if outcome == "done":
+        logger.info("Run already orchestrated, skipping", run_id=run_id)
+        return False
+    if outcome == "queued":
+        logger.info("Run already queued for orchestration", run_id=run_id)
+        return False
+
+    logger.info("Run queued for orchestration", run_id=run_id)
+    return True
+
+
+class OrchestrationQueue:
+    """Consumer side of the orchestration queue."""
+
+    def __init__(self, r: redis.Redis):
+        self.redis = r
+        self.queue = settings.orchestration_queue
+        self.payloads_key = f"{self.queue}:payloads"
+        self.processing_key = f"{self.queue}:processing"
+        self.delayed_key = f"{self.queue}:delayed"
+        self.attempts_key = f"{self.queue}:attempts"
+        self.dead_letter_key = f"{self.queue}:dead"
+        self.dead_payloads_key = f"{self.queue}:dead:payloads"
+        # Unleased runs seen in the processing list on the last recover pass
+        self._unleased: set[str] = set()
+
+    async def take(self, timeout: int) -> tuple[str, dict[str, Any]] | None:
+        """Wait up to timeout seconds for the next run and lease it.
+
+        Returns None if nothing is available, or if the run turned out to be
+        finished or leased by another worker already.
+        """
+        run_id = await self.redis.blmove(
+            self.queue, self.processing_key, timeout, src="RIGHT", dest="LEFT"
+        )
+        if run_id is None:
+            return None
+        run_id = run_id.decode() if isinstance(run_id, bytes) else run_id
+
+        if await self.redis.exists(self._done_key(run_id)):
+            await self.redis.lrem(self.processing_key, 1, run_id)
+            return None
+
+        lease = settings.orchestration_lease_seconds
+        if not await self.redis.set(self._lease_key(run_id), 1, nx=True, ex=lease):
+            # Another worker is still on it (duplicate from a lease recovery)
+            await self.redis.lrem(self.processing_key, 1, run_id)
+            return None
+
+        raw = await self.redis.hget(self.payloads_key, run_id)
+        if raw is None:
+            await self._release(run_id)
+            return None
+
+        return run_id, json.loads(raw)
+
+    async def extend_lease(self, run_id: str) -> None:
+        """Keep the lease alive while a long orchestration runs."""
+        await self.redis.expire(self._lease_key(run_id), settings.orchestration_lease_seconds)
+
+    async def complete(self, run_id: str) -> None:
+        """Mark a run as orchestrated and forget its payload."""
+        async with self.redis.pipeline(transaction=True) as pipe:
+            pipe.set(self._done_key(run_id), 1, ex=DONE_TTL_SECONDS)
+            pipe.hdel(self.payloads_key, run_id)
+            pipe.hdel(self.attempts_key, run_id)
+            pipe.lrem(self.processing_key, 1, run_id)
+            pipe.delete(self._lease_key(run_id))
+            await pipe.execute()
+
+    async def fail(self, run_id: str, error: str) -> None:
+        """Schedule a retry with exponential backoff, or dead-letter the run."""
+        attempts = await self.redis.hincrby(self.attempts_key, run_id, 1)
+        dead = attempts >= settings.orchestration_max_attempts
+        payload = await self.redis.hget(self.payloads_key, run_id) if dead else None
+
+        async with self.redis.pipeline(transaction=True) as pipe:
+            if dead:
+                pipe.lpush(self.dead_letter_key, run_id)
+                pipe.hdel(self.attempts_key, run_id)
+                # Out of the dedupe hash, so a later notify can queue the run again
+                pipe.hdel(self.payloads_key, run_id)
+                if payload is not None:
+                    pipe.hset(self.dead_payloads_key, run_id, payload)
+                logger.error(
+                    "Orchestration dead-lettered",
+                    run_id=run_id,
+                    attempts=attempts,
+                    error=error,
+                )
+            else:
+                delay = min(300, 2 ** attempts) * random.uniform(0.5, 1.0)
+                pipe.zadd(self.delayed_key, {run_id: time.time() + delay})
+                logger.warning(
+                    "Orchestration failed, will retry",
+                    run_id=run_id,
+                    attempts=attempts,
+                    retry_in_seconds=round(delay, 1),
+                    error=error,
+                )
+            pipe.lrem(self.processing_key, 1, run_id)
+            pipe.delete(self._lease_key(run_id))
+            await pipe.execute()
+
+    async def recover(self) -> int:
+        """Requeue due retries and runs whose worker lost its lease.
+
+        Safe to run from every worker concurrently: ZREM and LREM decide
+        which worker moves a given run.
+        """
+        moved = 0
+
+        for run_id in await self.redis.zrangebyscore(self.delayed_key, "-inf", time.time()):
+            if await self.redis.zrem(self.delayed_key, run_id):
+                await self.redis.lpush(self.queue, run_id)
+                moved += 1
+
+        unleased = set()
+        for run_id in await self.redis.lrange(self.processing_key, 0, -1):
+            run_id = run_id.decode() if isinstance(run_id, bytes) else run_id
+            if await self.redis.exists(self._lease_key(run_id)):
+                continue
+
+            # A run is briefly unleased between being taken and leased, so
+            # only requeue it if it was already unleased on the last pass
+            if run_id not in self._unleased:
+                unleased.add(run_id)
+                continue
+
+            # Requeued at the consuming end so it runs next
+            if await self.redis.lrem(self.processing_key, 1, run_id):
+                await self.redis.rpush(self.queue, run_id)
+                logger.warning("Orchestration lease expired, requeueing", run_id=run_id)
+                moved += 1
+
+        self._unleased = unleased
+        return moved
+
+    async def _release(self, run_id: str) -> None:
+        async with self.redis.pipeline(transaction=True) as pipe:
+            pipe.lrem(self.processing_key, 1, run_id)
+            pipe.delete(self._lease_key(run_id))
+            await pipe.execute()
+
+    def _lease_key(self, run_id: str) -> str:
+        return f"{self.queue}:lease:{run_id}"
+
+    def _done_key(self, run_id: str) -> str:
+        return f"{self.queue}:done:{run_id}"
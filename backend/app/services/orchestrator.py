@@ -1,7 +1,7 @@
 """Orchestration service for processing completed simulation runs.
 
 This service coordinates the entire flow from run completion to brief generation:
-1. Store metrics and artifact references
+1. Extract evidence from the run's artifacts, then store metrics and artifact references
 2. Generate claims from evidence
 3. Evaluate claims using proof engine
 4. Store claim results
@@ -10,106 +10,124 @@ This service coordinates the entire flow from run completion to brief generation
 7. Update application status
 """
 
+from datetime import datetime
 from typing import Any
 
 from sqlalchemy import select
-from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
-from sqlalchemy.orm import sessionmaker
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession, async_sessionmaker
 
 from app.config import get_settings
+from app.db.bulk import bulk_insert
+from app.db.session import create_pooled_engine, create_session_factory
 from app.core.ids import generate_id
 from app.core.time import utc_now
 from app.db.models import (
-    Application,
     ApplicationStatus,
-    SimulationRun,
     Artifact,
     ArtifactType,
     Metric,
     Claim as ClaimModel,
     ClaimStatus,
     Brief,
-    Role,
-    Candidate,
 )
+from app.evidence.pipeline import extract_evidence
 from app.hypothesis.generator import generate_claims, prioritize_claims
 from app.hypothesis.claim_schema import Claim, ProofResult
 from app.proof.engine import get_proof_engine
+from app.services.run_context import RoleCache, load_run_context
 from app.briefs.interview_packet import generate_full_interview_packet
 from app.logging_config import get_logger
 
 logger = get_logger(__name__)
 settings = get_settings()
 
+# Shared by every run orchestrated in this process; created on first use so
+# the engine binds to the event loop that runs the orchestration
+_engine: AsyncEngine | None = None
+_session_factory: async_sessionmaker[AsyncSession] | None = None
+
+
+def get_session_factory() -> async_sessionmaker[AsyncSession]:
+    """Session factory backed by the orchestrator's connection pool."""
+    global _engine, _session_factory
+    if _session_factory is None:
+        _engine = create_pooled_engine(
+            pool_size=settings.orchestration_db_pool_size,
+            max_overflow=settings.orchestration_db_max_overflow,
+        )
+        _session_factory = create_session_factory(_engine)
+    return _session_factory
+
+
+async def dispose_engine() -> None:
+    """Close the orchestrator's pooled connections (on worker shutdown)."""
+    global _engine, _session_factory
+    if _engine is not None:
+        await _engine.dispose()
+    _engine = None
+    _session_factory = None
+
 
 async def process_completed_run(
     run_id: str,
     metrics: dict[str, Any],
     artifact_urls: dict[str, str],
+    artifact_hashes: dict[str, str] | None = None,
+    role_cache: RoleCache | None = None,
 ) -> None:
     """
     Process a completed simulation run through the full evaluation pipeline.
 
-    This is called as a background task after the runner notifies completion.
+    This is called by the orchestration worker (app/workers/orchestration.py)
+    for each run queued after the runner notifies completion.
 
     Args:
         run_id: The simulation run ID
         metrics: Dict of metric name -> value from the runner
         artifact_urls: Dict of artifact name -> S3 presigned URL
+        artifact_hashes: Dict of artifact name -> SHA-256 computed by the runner
+        role_cache: COM/rubric cache shared by the runs of one batch
     """
     logger.info(f"Starting orchestration for run {run_id}")
 
-    # Create a new database session for the background task
-    engine = create_async_engine(settings.database_url.replace("postgresql://", "postgresql+asyncpg://"))
-    async_session = sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
+    # Derived metrics fill in what the runner did not report; the runner's
+    # own values win. Done before taking a DB connection: it is all downloads
+    extraction = None
+    if settings.evidence_extraction_enabled:
+        extraction = await extract_evidence(run_id, list(artifact_urls))
+        metrics = {**extraction.metrics, **metrics}
 
-    async with async_session() as db:
+    async with get_session_factory()() as db:
         try:
-            # 1. Fetch the run and related data
-            result = await db.execute(
-                select(SimulationRun).where(SimulationRun.id == run_id)
-            )
-            run = result.scalar_one_or_none()
-
-            if not run:
-                logger.error(f"Run {run_id} not found")
-                return
+            # 1. Fetch the run and related data in one round trip
+            context = await load_run_context(db, run_id, role_cache=role_cache)
 
-            # Get application and role
-            result = await db.execute(
-                select(Application).where(Application.id == run.application_id)
-            )
-            application = result.scalar_one_or_none()
-
-            if not application:
-                logger.error(f"Application {run.application_id} not found")
+            if not context:
+                logger.error(f"Run {run_id} or its application, role or candidate not found")
                 return
 
-            result = await db.execute(
-                select(Role).where(Role.id == application.role_id)
-            )
-            role = result.scalar_one_or_none()
-
-            result = await db.execute(
-                select(Candidate).where(Candidate.id == application.candidate_id)
-            )
-            candidate = result.scalar_one_or_none()
-
-            if not role or not candidate:
-                logger.error(f"Role or candidate not found for application {application.id}")
+            # Redelivered after its results were committed (e.g. the queue could
+            # not record it as done): orchestrating again would add a second brief
+            if await is_already_orchestrated(db, run_id):
+                logger.info(f"Run {run_id} already orchestrated, skipping")
                 return
 
-            # Get COM from role
-            com = role.com_json or {}
-            rubric = role.rubric_json or {}
+            run = context.run
+            application = context.application
+            role = context.role
+            candidate = context.candidate
+            com = context.com
+            rubric = context.rubric
 
             # 2. Store metrics in database
+            created_at = utc_now()
             metric_records = []
             for name, value in metrics.items():
                 metric = Metric(
                     id=generate_id(),
                     simulation_run_id=run_id,
                     name=name,
+                    created_at=created_at,
                 )
                 # Store in appropriate column based on type
                 if isinstance(value, bool):
@@ -119,10 +137,9 @@ async def process_completed_run(
                 else:
                     metric.value_text = str(value)
 
-                db.add(metric)
                 metric_records.append(metric)
 
-            await db.flush()
+            await bulk_insert(db, metric_records)
 
             # 3. Store artifact references
             artifact_records = []
@@ -132,6 +149,9 @@ async def process_completed_run(
                 "coverage.xml": ArtifactType.COVERAGE,
                 "diff.patch": ArtifactType.DIFF,
                 "grader_output.json": ArtifactType.METRICS_JSON,
+                "pytest_report.json": ArtifactType.METRICS_JSON,
+                "evidence.json": ArtifactType.METRICS_JSON,
+                "writeup.md": ArtifactType.WRITEUP,
             }
 
             for name, url in artifact_urls.items():
@@ -144,13 +164,17 @@ async def process_completed_run(
                     simulation_run_id=run_id,
                     type=artifact_type,
                     s3_key=s3_key,
-                    sha256="pending",  # Would compute from actual content
-                    metadata_json={"url": url, "filename": name},
+                    sha256=(artifact_hashes or {}).get(name, "pending"),
+                    metadata_json={
+                        **(extraction.artifact_metadata.get(name, {}) if extraction else {}),
+                        "url": url,
+                        "filename": name,
+                    },
+                    created_at=created_at,
                 )
-                db.add(artifact)
                 artifact_records.append(artifact)
 
-            await db.flush()
+            await bulk_insert(db, artifact_records)
 
             # 4. Generate claims from evidence
             claims = generate_claims(
@@ -178,85 +202,27 @@ async def process_completed_run(
             )
 
             # 6. Store claim results in database
-            proved_claims = []
-            unproved_claims = []
-
-            for result in proof_results:
-                claim_model = ClaimModel(
-                    id=generate_id(),
-                    application_id=application.id,
-                    claim_type=result.claim.claim_type,
-                    claim_json=result.claim.model_dump(),
-                    status=ClaimStatus.PROVED if result.status == "PROVED" else ClaimStatus.UNPROVED,
-                    evidence_refs_json={
-                        "refs": [ref.model_dump() for ref in result.evidence_refs],
-                        "reason": result.reason,
-                    },
-                    rule_id=result.rule_id,
-                )
-                db.add(claim_model)
-
-                if result.status == "PROVED":
-                    proved_claims.append(result)
-                else:
-                    unproven_claims.append((result.claim, result.reason))
-
-            await db.flush()
+            await bulk_insert(db, build_claim_records(proof_results, application.id, created_at))
 
+            proved_count = sum(1 for r in proof_results if r.status == "PROVED")
             logger.info(
-                f"Evaluated claims: {len(proved_claims)} proved, {len(unproven_claims)} unproved"
+                f"Evaluated claims: {proved_count} proved, {len(proof_results) - proved_count} unproved"
             )
 
-            # 7. Generate interview questions for unproven claims
-            interview_questions = []
-            if unproven_claims:
-                interview_questions = generate_full_interview_packet(
-                    unproven_claims=unproven_claims,
-                    com=com,
-                    max_questions=10,
-                )
-
-            # 8. Build the brief
-            brief_content = {
-                "candidate": {
-                    "id": candidate.id,
-                    "name": candidate.name,
-                    "email": candidate.email,
-                },
-                "role": {
-                    "id": role.id,
-                    "title": role.title,
-                },
-                "simulation": {
+            # 7-8. Generate interview questions and build the brief
+            brief_content = build_brief_content(
+                candidate={"id": candidate.id, "name": candidate.name, "email": candidate.email},
+                role={"id": role.id, "title": role.title},
+                simulation={
                     "id": run.simulation_id,
                     "run_id": run_id,
                     "completed_at": run.finished_at.isoformat() if run.finished_at else None,
                 },
-                "proof_rate": len(proved_claims) / len(proof_results) if proof_results else 0,
-                "proven_claims": [
-                    {
-                        "claim_type": r.claim.claim_type,
-                        "statement": r.claim.statement,
-                        "dimensions": r.claim.dimensions,
-                        "evidence": [ref.model_dump() for ref in r.evidence_refs],
-                        "rule_id": r.rule_id,
-                        "reason": r.reason,
-                    }
-                    for r in proved_claims
-                ],
-                "unproven_claims": [
-                    {
-                        "claim_type": claim.claim_type,
-                        "statement": claim.statement,
-                        "dimensions": claim.dimensions,
-                        "reason": reason,
-                    }
-                    for claim, reason in unproven_claims
-                ],
-                "interview_questions": interview_questions,
-                "risk_flags": _identify_risk_flags(metrics, proof_results),
-                "dimensions_coverage": _compute_dimensions_coverage(proof_results, rubric),
-            }
+                proof_results=proof_results,
+                metrics=metrics,
+                com=com,
+                rubric=rubric,
+            )
 
             # Store the brief
             brief = Brief(
@@ -284,8 +250,96 @@ async def process_completed_run(
             await db.rollback()
             raise
 
-        finally:
-            await engine.dispose()
+
+async def is_already_orchestrated(db: AsyncSession, run_id: str) -> bool:
+    """Whether a run's metrics or artifacts are stored.
+
+    Both are written in the same transaction as the brief, so either one
+    means the run went through the whole pipeline.
+    """
+    for model in (Metric, Artifact):
+        result = await db.execute(
+            select(model.id).where(model.simulation_run_id == run_id).limit(1)
+        )
+        if result.first() is not None:
+            return True
+    return False
+
+
+def build_claim_records(
+    proof_results: list[ProofResult],
+    application_id: str,
+    created_at: datetime,
+) -> list[ClaimModel]:
+    """Claim rows for a set of proof results."""
+    return [
+        ClaimModel(
+            id=generate_id(),
+            application_id=application_id,
+            claim_type=result.claim.claim_type,
+            claim_json=result.claim.model_dump(),
+            status=ClaimStatus.PROVED if result.status == "PROVED" else ClaimStatus.UNPROVED,
+            evidence_refs_json={
+                "refs": [ref.model_dump() for ref in result.evidence_refs],
+                "reason": result.reason,
+            },
+            rule_id=result.rule_id,
+            created_at=created_at,
+        )
+        for result in proof_results
+    ]
+
+
+def build_brief_content(
+    candidate: dict[str, Any],
+    role: dict[str, Any],
+    simulation: dict[str, Any],
+    proof_results: list[ProofResult],
+    metrics: dict[str, Any],
+    com: dict[str, Any],
+    rubric: dict[str, Any],
+) -> dict[str, Any]:
+    """Build the brief JSON, including interview questions for unproven claims."""
+    proved_claims = [r for r in proof_results if r.status == "PROVED"]
+    unproven_claims = [(r.claim, r.reason) for r in proof_results if r.status != "PROVED"]
+
+    interview_questions = []
+    if unproven_claims:
+        interview_questions = generate_full_interview_packet(
+            unproven_claims=unproven_claims,
+            com=com,
+            max_questions=10,
+        )
+
+    return {
+        "candidate": candidate,
+        "role": role,
+        "simulation": simulation,
+        "proof_rate": len(proved_claims) / len(proof_results) if proof_results else 0,
+        "proven_claims": [
+            {
+                "claim_type": r.claim.claim_type,
+                "statement": r.claim.statement,
+                "dimensions": r.claim.dimensions,
+                "evidence": [ref.model_dump() for ref in r.evidence_refs],
+                "rule_id": r.rule_id,
+                "reason": r.reason,
+            }
+            for r in proved_claims
+        ],
+        "unproven_claims": [
+            {
+                "claim_type": claim.claim_type,
+                "statement": claim.statement,
+                "dimensions": claim.dimensions,
+                "reason": reason,
+            }
+            for claim, reason in unproven_claims
+        ],
+        "interview_questions": interview_questions,
+        "risk_flags": _identify_risk_flags(metrics, proof_results),
+        "dimensions_coverage": _compute_dimensions_coverage(proof_results, rubric),
+    }
 
 
 def _identify_risk_flags(
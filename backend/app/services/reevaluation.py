@@ -0,0 +1,357 @@
+"""Bulk re-evaluation of a role's historical runs.
+
+After a role's COM or rubric changes, every candidate's latest successful
+run is evaluated again without going through the full orchestrator:
+
+- runs are streamed from the database a page at a time, with their stored
+  metrics and artifacts loaded in one query each per page
+- claim generation, proof evaluation and brief building (CPU-bound, pure)
+  run across a process pool
+- each page writes new Claim rows and a new Brief version per application,
+  and is committed on its own so a long re-evaluation makes steady progress
+
+A page's database session is closed before its runs are handed to the
+pool and a new one is opened to write the results, so no connection sits
+idle in a transaction while the evaluation runs.
+"""
+
+import asyncio
+import multiprocessing
+import os
+from collections.abc import Callable
+from concurrent.futures import Executor, ProcessPoolExecutor
+from dataclasses import dataclass, field
+from typing import Any
+
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.config import get_settings
+from app.core.ids import generate_id
+from app.core.time import utc_now
+from app.db.bulk import bulk_insert
+from app.db.models import (
+    Application,
+    Artifact,
+    ArtifactType,
+    Brief,
+    Candidate,
+    Metric,
+    Role,
+    SimulationRun,
+    SimulationRunStatus,
+)
+from app.hypothesis.claim_schema import ProofResult
+from app.hypothesis.generator import generate_claims, prioritize_claims
+from app.logging_config import get_logger
+from app.proof.context import EvidenceContext
+from app.proof.engine import get_proof_engine
+from app.services.orchestrator import (
+    build_brief_content,
+    build_claim_records,
+    get_session_factory,
+)
+
+logger = get_logger(__name__)
+settings = get_settings()
+
+
+@dataclass
+class ReevaluationProgress:
+    """Progress of a role re-evaluation, reported after every page."""
+
+    role_id: str
+    processed: int = 0
+    failed: int = 0
+    briefs_written: int = 0
+    failed_run_ids: list[str] = field(default_factory=list)
+
+
+async def reevaluate_role(
+    role_id: str,
+    page_size: int | None = None,
+    workers: int | None = None,
+    on_progress: Callable[[ReevaluationProgress], None] | None = None,
+    executor: Executor | None = None,
+) -> ReevaluationProgress:
+    """Re-evaluate the latest successful run of every application for a role.
+
+    Args:
+        role_id: Role whose runs are re-evaluated with its current COM/rubric
+        page_size: Runs loaded and written per page
+        workers: Evaluation processes (default: CPU count)
+        on_progress: Called after each page with the running totals
+        executor: Runs evaluate_run (default: a process pool of `workers`
+            processes, shut down afterwards)
+
+    Returns:
+        Final progress totals
+    """
+    page_size = page_size or settings.reevaluation_page_size
+    workers = workers or settings.reevaluation_workers or os.cpu_count() or 1
+    progress = ReevaluationProgress(role_id=role_id)
+
+    session_factory = get_session_factory()
+    async with session_factory() as db:
+        role = await db.get(Role, role_id)
+        if role is None:
+            raise ValueError(f"Role {role_id} not found")
+        role_info = {"id": role.id, "title": role.title}
+        com = role.com_json or {}
+        rubric = role.rubric_json or {}
+
+    logger.info("Re-evaluation started", role_id=role_id, page_size=page_size, workers=workers)
+
+    loop = asyncio.get_running_loop()
+    # spawn: forked children would inherit the parent's event loop and DB connections
+    pool = executor or ProcessPoolExecutor(
+        max_workers=workers,
+        mp_context=multiprocessing.get_context("spawn"),
+    )
+    try:
+        after_application_id = ""
+        while True:
+            async with session_factory() as db:
+                jobs = await _load_page(db, role_id, after_application_id, page_size)
+            if not jobs:
+                break
+            after_application_id = jobs[-1]["application_id"]
+
+            outcomes = await asyncio.gather(
+                *(
+                    loop.run_in_executor(pool, evaluate_run, job, role_info, com, rubric)
+                    for job in jobs
+                ),
+                return_exceptions=True,
+            )
+
+            evaluated = []
+            for job, outcome in zip(jobs, outcomes, strict=True):
+                if isinstance(outcome, BaseException):
+                    logger.error(
+                        "Re-evaluation failed for run",
+                        run_id=job["run_id"],
+                        error=str(outcome),
+                    )
+                    progress.failed += 1
+                    progress.failed_run_ids.append(job["run_id"])
+                else:
+                    evaluated.append((job, outcome))
+
+            if evaluated:
+                async with session_factory() as db:
+                    await _write_page(db, evaluated)
+                    await db.commit()
+
+            progress.processed += len(jobs)
+            progress.briefs_written += len(evaluated)
+            logger.info(
+                "Re-evaluation progress",
+                role_id=role_id,
+                processed=progress.processed,
+                failed=progress.failed,
+            )
+            if on_progress:
+                on_progress(progress)
+    finally:
+        if executor is None:
+            pool.shutdown()
+
+    logger.info(
+        "Re-evaluation complete",
+        role_id=role_id,
+        processed=progress.processed,
+        briefs_written=progress.briefs_written,
+        failed=progress.failed,
+    )
+    return progress
+
+
+async def _load_page(
+    db: AsyncSession,
+    role_id: str,
+    after_application_id: str,
+    page_size: int,
+) -> list[dict[str, Any]]:
+    """Load the next page of runs (latest successful run per application).
+
+    Returns plain, picklable job dicts for the evaluation processes.
+    """
+    # Rank each application's runs newest first; rank 1 is the latest run
+    ranked = (
+        select(
+            SimulationRun.id.label("run_id"),
+            func.row_number()
+            .over(
+                partition_by=SimulationRun.application_id,
+                order_by=SimulationRun.finished_at.desc(),
+            )
+            .label("rank"),
+        )
+        .join(Application, Application.id == SimulationRun.application_id)
+        .where(
+            Application.role_id == role_id,
+            Application.id > after_application_id,
+            SimulationRun.status == SimulationRunStatus.SUCCEEDED,
+        )
+        .subquery()
+    )
+    result = await db.execute(
+        select(SimulationRun, Candidate)
+        .join(ranked, ranked.c.run_id == SimulationRun.id)
+        .join(Application, Application.id == SimulationRun.application_id)
+        .join(Candidate, Candidate.id == Application.candidate_id)
+        .where(ranked.c.rank == 1)
+        .order_by(Application.id)
+        .limit(page_size)
+    )
+    rows = result.all()
+    if not rows:
+        return []
+
+    run_ids = [run.id for run, _ in rows]
+
+    metrics_by_run: dict[str, list[tuple]] = {run_id: [] for run_id in run_ids}
+    result = await db.execute(
+        select(
+            Metric.simulation_run_id,
+            Metric.id,
+            Metric.name,
+            Metric.value_float,
+            Metric.value_bool,
+            Metric.value_text,
+        ).where(Metric.simulation_run_id.in_(run_ids))
+    )
+    for run_id, *values in result.all():
+        metrics_by_run[run_id].append(tuple(values))
+
+    artifacts_by_run: dict[str, list[tuple]] = {run_id: [] for run_id in run_ids}
+    result = await db.execute(
+        select(
+            Artifact.simulation_run_id,
+            Artifact.id,
+            Artifact.type,
+            Artifact.s3_key,
+            Artifact.sha256,
+            Artifact.metadata_json,
+        ).where(Artifact.simulation_run_id.in_(run_ids))
+    )
+    for run_id, artifact_id, artifact_type, *values in result.all():
+        artifacts_by_run[run_id].append((artifact_id, artifact_type.value, *values))
+
+    return [
+        {
+            "run_id": run.id,
+            "application_id": run.application_id,
+            "candidate": {"id": candidate.id, "name": candidate.name, "email": candidate.email},
+            "simulation": {
+                "id": run.simulation_id,
+                "run_id": run.id,
+                "completed_at": run.finished_at.isoformat() if run.finished_at else None,
+            },
+            "metrics": metrics_by_run[run.id],
+            "artifacts": artifacts_by_run[run.id],
+        }
+        for run, candidate in rows
+    ]
+
+
+def evaluate_run(
+    job: dict[str, Any],
+    role: dict[str, Any],
+    com: dict[str, Any],
+    rubric: dict[str, Any],
+) -> tuple[list[ProofResult], dict[str, Any]]:
+    """Generate and evaluate claims for one run and build its brief.
+
+    Runs in a pool process, so it only takes and returns picklable values.
+    """
+    run_id = job["run_id"]
+    metrics = [
+        Metric(
+            id=metric_id,
+            simulation_run_id=run_id,
+            name=name,
+            value_float=value_float,
+            value_bool=value_bool,
+            value_text=value_text,
+        )
+        for metric_id, name, value_float, value_bool, value_text in job["metrics"]
+    ]
+    artifacts = [
+        Artifact(
+            id=artifact_id,
+            simulation_run_id=run_id,
+            type=ArtifactType(artifact_type),
+            s3_key=s3_key,
+            sha256=sha256,
+            metadata_json=metadata_json,
+        )
+        for artifact_id, artifact_type, s3_key, sha256, metadata_json in job["artifacts"]
+    ]
+
+    claims = generate_claims(
+        application_id=job["application_id"],
+        candidate_id=job["candidate"]["id"],
+        simulation_run_id=run_id,
+        metrics=metrics,
+        artifacts=artifacts,
+        com=com,
+    )
+    claims = prioritize_claims(claims, rubric)
+
+    proof_results = get_proof_engine().evaluate_all(
+        claims=claims,
+        metrics=metrics,
+        artifacts=artifacts,
+        llm_tags=None,
+        com=com,
+    )
+
+    brief_content = build_brief_content(
+        candidate=job["candidate"],
+        role=role,
+        simulation=job["simulation"],
+        proof_results=proof_results,
+        # Risk flags read metric values by name
+        metrics=EvidenceContext.build(metrics, []).metrics,
+        com=com,
+        rubric=rubric,
+    )
+    return proof_results, brief_content
+
+
+async def _write_page(
+    db: AsyncSession,
+    evaluated: list[tuple[dict[str, Any], tuple[list[ProofResult], dict[str, Any]]]],
+) -> None:
+    """Insert new claims and the next brief version for each evaluated run."""
+    if not evaluated:
+        return
+
+    application_ids = [job["application_id"] for job, _ in evaluated]
+    result = await db.execute(
+        select(Brief.application_id, func.max(Brief.version))
+        .where(Brief.application_id.in_(application_ids))
+        .group_by(Brief.application_id)
+    )
+    latest_versions = dict(result.all())
+
+    created_at = utc_now()
+    claim_records = []
+    briefs = []
+    for job, (proof_results, brief_content) in evaluated:
+        application_id = job["application_id"]
+        claim_records += build_claim_records(proof_results, application_id, created_at)
+        briefs.append(
+            Brief(
+                id=generate_id(),
+                application_id=application_id,
+                brief_json={**brief_content, "reevaluated_at": created_at.isoformat()},
+                version=latest_versions.get(application_id, 0) + 1,
+                created_at=created_at,
+            )
+        )
+
+    await bulk_insert(db, claim_records)
+    await bulk_insert(db, briefs)
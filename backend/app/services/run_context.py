@@ -0,0 +1,98 @@
+"""Loading the records the orchestrator needs for a completed run.
+
+The run, its application, the role and the candidate are fetched with one
+joined SELECT instead of four sequential lookups. When many runs are
+processed as a batch, a RoleCache keeps each role's COM and rubric so they
+are transferred and decoded once per role rather than once per run.
+"""
+
+from dataclasses import dataclass
+from typing import Any
+
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import defer
+
+from app.db.models import Application, Candidate, Role, SimulationRun
+
+
+@dataclass
+class RunContext:
+    """A completed run with the records it is evaluated against."""
+
+    run: SimulationRun
+    application: Application
+    role: Role
+    candidate: Candidate
+    com: dict[str, Any]
+    rubric: dict[str, Any]
+
+
+class RoleCache:
+    """COM and rubric per role, for the duration of a batch.
+
+    Create one per batch and drop it afterwards, so edits to a role are
+    picked up by the next batch.
+    """
+
+    def __init__(self) -> None:
+        self._roles: dict[str, tuple[dict[str, Any], dict[str, Any]]] = {}
+
+    def get(self, role_id: str) -> tuple[dict[str, Any], dict[str, Any]] | None:
+        return self._roles.get(role_id)
+
+    def put(self, role_id: str, com: dict[str, Any], rubric: dict[str, Any]) -> None:
+        self._roles[role_id] = (com, rubric)
+
+    def __len__(self) -> int:
+        return len(self._roles)
+
+
+async def load_run_context(
+    db: AsyncSession,
+    run_id: str,
+    role_cache: RoleCache | None = None,
+) -> RunContext | None:
+    """Fetch a run with its application, role and candidate in one query.
+
+    Returns None if the run or any of the related records is missing.
+    """
+    # Role columns the orchestrator never reads
+    role_options = [defer(Role.description), defer(Role.evaluation_pack_json)]
+    if role_cache:
+        # Likely cached; on a miss they are loaded with one extra query below
+        role_options += [defer(Role.com_json), defer(Role.rubric_json)]
+
+    result = await db.execute(
+        select(SimulationRun, Application, Role, Candidate)
+        .join(Application, Application.id == SimulationRun.application_id)
+        .join(Role, Role.id == Application.role_id)
+        .join(Candidate, Candidate.id == Application.candidate_id)
+        .where(SimulationRun.id == run_id)
+        .options(*role_options)
+    )
+    row = result.one_or_none()
+    if row is None:
+        return None
+
+    run, application, role, candidate = row
+
+    cached = role_cache.get(role.id) if role_cache is not None else None
+    if cached is not None:
+        com, rubric = cached
+    else:
+        if role_cache:
+            await db.refresh(role, ["com_json", "rubric_json"])
+        com = role.com_json or {}
+        rubric = role.rubric_json or {}
+        if role_cache is not None:
+            role_cache.put(role.id, com, rubric)
+
+    return RunContext(
+        run=run,
+        application=application,
+        role=role,
+        candidate=candidate,
+        com=com,
+        rubric=rubric,
+    )
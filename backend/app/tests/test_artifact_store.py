@@ -0,0 +1,222 @@
+"""Tests for artifact storage and downloads."""
+
+import io
+import threading
+from types import SimpleNamespace
+
+import httpx
+from botocore.exceptions import ClientError
+from fastapi import FastAPI
+
+from app.api.routes.artifacts import parse_range, router
+from app.db.models import ArtifactType
+from app.db.session import get_db
+from app.deps import get_current_user
+from app.evidence.store import ArtifactStream, AsyncArtifactStore, get_async_artifact_store
+
+
+class FakeStore:
+    """Synchronous store recording which thread served each call."""
+
+    def __init__(self, objects: dict[str, bytes]):
+        self.objects = objects
+        self.threads: list[str] = []
+
+    def open_artifact(self, s3_key: str) -> io.BytesIO:
+        self.threads.append(threading.current_thread().name)
+        return io.BytesIO(self.objects[s3_key])
+
+    def get_artifact(self, s3_key: str) -> bytes:
+        self.threads.append(threading.current_thread().name)
+        return self.objects[s3_key]
+
+
+class TestAsyncArtifactStore:
+    """Tests for AsyncArtifactStore."""
+
+    def setup_method(self):
+        self.sync_store = FakeStore({"runs/run_1/testlog.txt": b"x" * 10})
+        self.store = AsyncArtifactStore(self.sync_store, max_workers=2)
+
+    def teardown_method(self):
+        self.store.close()
+
+    async def test_runs_calls_off_the_event_loop(self):
+        """Should call the blocking store from the shared pool's threads."""
+        content = await self.store.get_artifact("runs/run_1/testlog.txt")
+
+        assert content == b"x" * 10
+        assert self.sync_store.threads[0].startswith("artifact-store")
+
+    async def test_iterates_body_in_chunks_and_closes_it(self):
+        """Should yield fixed-size chunks and close the body afterwards."""
+        body = await self.store.open_artifact("runs/run_1/testlog.txt")
+
+        chunks = [chunk async for chunk in self.store.iter_artifact(body, chunk_size=4)]
+
+        assert chunks == [b"xxxx", b"xxxx", b"xx"]
+        assert body.closed
+
+
+class TestParseRange:
+    """Tests for parse_range."""
+
+    def test_forwards_single_ranges(self):
+        """Should pass single byte ranges through to S3."""
+        assert parse_range("bytes=0-99") == "bytes=0-99"
+        assert parse_range("bytes=100-") == "bytes=100-"
+        assert parse_range("bytes=-500") == "bytes=-500"
+
+    def test_ignores_unsupported_ranges(self):
+        """Should serve the whole artifact for missing, multiple or malformed ranges."""
+        assert parse_range(None) is None
+        assert parse_range("bytes=0-1,5-6") is None
+        assert parse_range("items=0-1") is None
+        assert parse_range("bytes=50-10") is None
+
+
+class FakeResult:
+    """Query result holding one row."""
+
+    def __init__(self, row):
+        self.row = row
+
+    def scalar_one_or_none(self):
+        return self.row
+
+
+class FakeSession:
+    """Session answering the download route's access checks in order."""
+
+    def __init__(self):
+        self.rows = [
+            SimpleNamespace(
+                id="art_1", type=ArtifactType.TEST_LOG, s3_key="runs/run_1/testlog.txt", simulation_run_id="run_1"
+            ),
+            SimpleNamespace(id="run_1", application_id="app_1"),
+            SimpleNamespace(id="app_1", role_id="role_1"),
+            SimpleNamespace(id="role_1", org_id="org_1"),
+            SimpleNamespace(org_id="org_1", user_id="user_1"),
+        ]
+
+    async def execute(self, _statement):
+        return FakeResult(self.rows.pop(0))
+
+
+class FakeAsyncStore:
+    """Async store serving one object, or failing with an S3 error code."""
+
+    def __init__(self, content: bytes, error_code: str | None = None):
+        self.content = content
+        self.error_code = error_code
+        self.error_fields: dict[str, str] = {}
+        self.head_error_code: str | None = None
+        self.ranges: list[str | None] = []
+
+    async def stream_artifact(self, _s3_key: str, byte_range: str | None = None) -> ArtifactStream:
+        self.ranges.append(byte_range)
+        if self.error_code:
+            raise ClientError({"Error": {"Code": self.error_code, **self.error_fields}}, "GetObject")
+        if byte_range is None:
+            return ArtifactStream(io.BytesIO(self.content), len(self.content))
+        first, _, last = byte_range.removeprefix("bytes=").partition("-")
+        part = self.content[int(first) : int(last) + 1]
+        return ArtifactStream(
+            io.BytesIO(part), len(part), f"bytes {first}-{last}/{len(self.content)}"
+        )
+
+    async def artifact_size(self, _s3_key: str) -> int:
+        if self.head_error_code:
+            raise ClientError({"Error": {"Code": self.head_error_code}}, "HeadObject")
+        return len(self.content)
+
+    async def iter_artifact(self, body, chunk_size: int = 4):
+        while chunk := body.read(chunk_size):
+            yield chunk
+
+    async def get_presigned_url(self, s3_key: str, expires_in: int, filename=None, content_type=None) -> str:
+        return f"https://s3.example.com/{s3_key}?expires={expires_in}&filename={filename}&type={content_type}"
+
+
+class TestDownloadArtifact:
+    """Tests for the artifact download route."""
+
+    def setup_method(self):
+        self.store = FakeAsyncStore(b"0123456789")
+        self.app = FastAPI()
+        self.app.include_router(router)
+        self.app.dependency_overrides[get_db] = FakeSession
+        self.app.dependency_overrides[get_current_user] = lambda: SimpleNamespace(id="user_1")
+        self.app.dependency_overrides[get_async_artifact_store] = lambda: self.store
+
+    async def download(self, **kwargs) -> httpx.Response:
+        transport = httpx.ASGITransport(app=self.app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+            return await client.get("/art_1/download", **kwargs)
+
+    async def test_proxies_whole_artifact(self):
+        """Should stream the whole artifact with its length."""
+        response = await self.download()
+
+        assert response.status_code == 200
+        assert response.content == b"0123456789"
+        assert response.headers["content-length"] == "10"
+        assert response.headers["accept-ranges"] == "bytes"
+
+    async def test_redirects_to_presigned_url(self):
+        """Should answer mode=redirect with a 307 to a presigned URL."""
+        response = await self.download(params={"mode": "redirect"})
+
+        assert response.status_code == 307
+        assert response.headers["location"].startswith("https://s3.example.com/runs/run_1/testlog.txt?")
+        assert "filename=testlog.txt" in response.headers["location"]
+        assert self.store.ranges == []
+
+    async def test_serves_range_as_partial_content(self):
+        """Should answer a single byte range with 206 and its Content-Range."""
+        response = await self.download(headers={"Range": "bytes=2-5"})
+
+        assert response.status_code == 206
+        assert response.content == b"2345"
+        assert response.headers["content-range"] == "bytes 2-5/10"
+        assert response.headers["content-length"] == "4"
+        assert self.store.ranges == ["bytes=2-5"]
+
+    async def test_unsatisfiable_range(self):
+        """Should map S3's InvalidRange to 416 with the artifact's size."""
+        self.store.error_code = "InvalidRange"
+
+        response = await self.download(headers={"Range": "bytes=50-60"})
+
+        assert response.status_code == 416
+        assert response.headers["content-range"] == "bytes */10"
+
+    async def test_unsatisfiable_range_size_from_s3_error(self):
+        """Should take the size from S3's InvalidRange error when it has one."""
+        self.store.error_code = "InvalidRange"
+        self.store.error_fields = {"ActualObjectSize": "1234"}
+        self.store.head_error_code = "AccessDenied"
+
+        response = await self.download(headers={"Range": "bytes=5000-"})
+
+        assert response.status_code == 416
+        assert response.headers["content-range"] == "bytes */1234"
+
+    async def test_unsatisfiable_range_without_size(self):
+        """Should still answer 416 when the size cannot be looked up."""
+        self.store.error_code = "InvalidRange"
+        self.store.head_error_code = "AccessDenied"
+
+        response = await self.download(headers={"Range": "bytes=50-60"})
+
+        assert response.status_code == 416
+        assert "content-range" not in response.headers
+
+    async def test_missing_object(self):
+        """Should map S3's NoSuchKey to 404."""
+        self.store.error_code = "NoSuchKey"
+
+        response = await self.download()
+
+        assert response.status_code == 404
+        assert response.json()["detail"] == "Artifact file not found in storage"
@@ -0,0 +1,62 @@
+"""Tests for bulk persistence helpers."""
+
+from sqlalchemy.dialects import postgresql
+
+from app.db import bulk
+from app.db.bulk import bulk_insert
+from app.db.models import Metric
+
+
+class RecordingSession:
+    """Stands in for AsyncSession, keeping executed statements."""
+
+    def __init__(self):
+        self.statements = []
+
+    async def execute(self, statement):
+        self.statements.append(statement)
+
+
+class TestBulkInsert:
+    """Tests for bulk_insert."""
+
+    def setup_method(self):
+        self.db = RecordingSession()
+
+    async def test_no_records_executes_nothing(self):
+        """Should not issue a statement for an empty list."""
+        await bulk_insert(self.db, [])
+        assert self.db.statements == []
+
+    async def test_fills_defaults_on_instances(self):
+        """Should assign id and created_at so callers can reference them."""
+        metric = Metric(simulation_run_id="run_1", name="tests_passed", value_bool=True)
+        await bulk_insert(self.db, [metric])
+
+        assert metric.id is not None
+        assert metric.created_at is not None
+
+    async def test_single_multi_row_statement(self):
+        """Should insert all rows in one statement, unset columns as SQL NULL."""
+        metrics = [
+            Metric(simulation_run_id="run_1", name="coverage_percent", value_float=81.5),
+            Metric(simulation_run_id="run_1", name="tests_passed", value_bool=True),
+        ]
+        await bulk_insert(self.db, metrics)
+
+        assert len(self.db.statements) == 1
+        sql = str(self.db.statements[0].compile(dialect=postgresql.asyncpg.dialect()))
+        assert sql.startswith("INSERT INTO metrics")
+        assert sql.count("), (") == 1
+        assert "JSONB" not in sql  # metadata_json unset on both rows
+
+    async def test_chunks_by_bind_parameter_limit(self, monkeypatch):
+        """Should split into several statements when rows exceed the limit."""
+        monkeypatch.setattr(bulk, "MAX_BIND_PARAMS", 80)  # 10 rows of 8 columns
+        metrics = [
+            Metric(simulation_run_id="run_1", name=f"m{i}", value_float=float(i))
+            for i in range(25)
+        ]
+        await bulk_insert(self.db, metrics)
+
+        assert len(self.db.statements) == 3
@@ -1,10 +1,13 @@
 """Tests for evidence extractors."""
 
+import io
+import json
+
 import pytest
 
 from app.evidence.extractors.diff_extractor import DiffExtractor
 from app.evidence.extractors.testlog_parser import TestLogParser
-from app.evidence.extractors.coverage_parser import CoverageParser
+from app.evidence.extractors.coverage_parser import CoverageParser, line_ranges
 from app.evidence.extractors.writeup_extractor import WriteupExtractor
 
 
@@ -58,6 +61,39 @@ index 123456..789abc 100644
 
         assert metrics.skipped_tests_added == 1
 
+    def test_reports_per_file_stats(self):
+        """Should attribute added, removed and test lines to each file."""
+        diff = """diff --git a/lib/service.py b/lib/service.py
+--- a/lib/service.py
++++ b/lib/service.py
++    return compute(value)
+-    return value
+diff --git a/tests/test_service.py b/tests/test_service.py
+--- a/tests/test_service.py
++++ b/tests/test_service.py
++def test_compute():
++    assert compute(1) == 2
+"""
+        metrics = self.extractor.extract(diff)
+
+        assert metrics.files_changed == ["lib/service.py", "tests/test_service.py"]
+        service, tests = metrics.file_stats
+        assert (service.lines_added, service.lines_removed, service.is_test_file) == (1, 1, False)
+        assert (tests.lines_added, tests.tests_added, tests.is_test_file) == (2, 1, True)
+
+    def test_extracts_from_byte_stream(self):
+        """Should give the same metrics when reading a byte stream."""
+        diff = """diff --git a/tests/test_service.py b/tests/test_service.py
++@pytest.mark.skip
++def test_flaky():
++    pass
+"""
+        metrics = self.extractor.extract_stream(io.BytesIO(diff.encode()))
+
+        assert metrics == self.extractor.extract(diff)
+        assert metrics.tests_added_count == 1
+        assert metrics.skipped_tests_added == 1
+
 
 class TestTestLogParser:
     """Tests for TestLogParser."""
@@ -107,6 +143,53 @@ Time:        3.456 s
         assert metrics.passed_count == 9
         assert metrics.failed_count == 1
 
+    def test_parses_pytest_failures_from_tail_summary(self):
+        """Should read the last summary in any count order and collect failures."""
+        log = """STDOUT:
+============================= test session starts ==============================
+tests/test_service.py::test_ok PASSED                                    [ 50%]
+tests/test_service.py::test_total FAILED                                 [100%]
+
+=================================== FAILURES ===================================
+__________________________________ test_total __________________________________
+>       assert total([1, 2]) == 4
+E       assert 3 == 4
+=========================== short test summary info ============================
+FAILED tests/test_service.py::test_total - assert 3 == 4
+============ 1 failed, 1 passed, 2 warnings, 1 error in 0.52s (0:00:00) ============
+
+
+STDERR:
+"""
+        metrics = self.parser.parse(log)
+
+        assert (metrics.passed_count, metrics.failed_count, metrics.error_count) == (1, 1, 1)
+        assert metrics.duration_seconds == 0.52
+        assert metrics.failed_test_names == ["tests/test_service.py::test_total"]
+        assert metrics.error_messages == ["assert 3 == 4"]
+
+    def test_parses_pytest_json_report(self):
+        """Should read counts and failures from pytest_report.json."""
+        report = {
+            "duration": 1.5,
+            "summary": {"passed": 3, "failed": 1, "total": 4, "collected": 4},
+            "tests": [
+                {"nodeid": "tests/test_a.py::test_ok", "outcome": "passed"},
+                {
+                    "nodeid": "tests/test_a.py::test_bad",
+                    "outcome": "failed",
+                    "call": {"crash": {"message": "AssertionError: assert 1 == 2"}},
+                },
+            ],
+        }
+        metrics = self.parser.parse_report(json.dumps(report))
+
+        assert metrics.tests_passed is False
+        assert (metrics.total_tests, metrics.passed_count, metrics.failed_count) == (4, 3, 1)
+        assert metrics.failed_test_names == ["tests/test_a.py::test_bad"]
+        assert metrics.error_messages == ["AssertionError: assert 1 == 2"]
+        assert metrics.duration_seconds == 1.5
+
 
 class TestCoverageParser:
     """Tests for CoverageParser."""
@@ -164,6 +247,45 @@ class TestCoverageParser:
         assert "app/service.py" in metrics.uncovered_files
         assert 2 in metrics.uncovered_files["app/service.py"]
 
+    def test_parses_stream_without_counting_method_lines(self):
+        """Should parse a byte stream and count each class line once."""
+        xml = b"""<?xml version="1.0" encoding="UTF-8"?>
+<coverage line-rate="0.5">
+    <packages>
+        <package name="app">
+            <classes>
+                <class filename="app/service.py">
+                    <methods>
+                        <method name="process">
+                            <lines><line number="2" hits="0"/></lines>
+                        </method>
+                    </methods>
+                    <lines>
+                        <line number="1" hits="1"/>
+                        <line number="2" hits="0"/>
+                        <line number="3" hits="0"/>
+                        <line number="5" hits="0"/>
+                    </lines>
+                </class>
+            </classes>
+        </package>
+    </packages>
+</coverage>
+"""
+        metrics = self.parser.parse_stream(io.BytesIO(xml))
+
+        assert metrics.lines_total == 4
+        assert metrics.lines_covered == 1
+        assert list(metrics.uncovered_files["app/service.py"]) == [2, 3, 5]
+        assert line_ranges(metrics.uncovered_files["app/service.py"]) == [(2, 3), (5, 5)]
+
+    def test_returns_empty_metrics_for_invalid_xml(self):
+        """Should fail soft on a truncated report."""
+        metrics = self.parser.parse_stream(io.BytesIO(b"<coverage><packages>"))
+
+        assert metrics.lines_total == 0
+        assert metrics.uncovered_files == {}
+
 
 class TestWriteupExtractor:
     """Tests for WriteupExtractor."""
@@ -226,3 +348,19 @@ I changed the comparison operator from > to >= in the rate limiting check.
 
         # Should identify both prompts as answered
         assert len(metrics.prompts_answered) >= 2
+
+    def test_unrecognised_headers_stay_in_section(self):
+        """Should only split sections on recognised headers."""
+        writeup = """Intro text before any section.
+## Root Cause
+The cache key ignored the tenant id.
+### Details
+Two tenants shared entries.
+## Monitoring
+Alert on cross-tenant cache hits."""
+        metrics = self.extractor.extract(writeup)
+
+        assert metrics.sections == {
+            "root_cause": "The cache key ignored the tenant id.\n### Details\nTwo tenants shared entries.",
+            "monitoring": "Alert on cross-tenant cache hits.",
+        }
@@ -0,0 +1,349 @@
+"""Tests for the evidence extraction stage."""
+
+import importlib.util
+import io
+import json
+from datetime import datetime
+from pathlib import Path
+from unittest.mock import AsyncMock, patch
+
+import pytest
+
+from app.db.models import (
+    Application,
+    ApplicationStatus,
+    Artifact,
+    ArtifactType,
+    Brief,
+    Candidate,
+    Claim,
+    Role,
+    SimulationRun,
+    SimulationRunStatus,
+)
+from app.evidence import pipeline
+from app.evidence.pipeline import extract_evidence
+from app.services import orchestrator
+from app.services.run_context import RunContext
+
+
+class FakeStore:
+    """Artifact store serving in-memory objects."""
+
+    def __init__(self, objects: dict[str, bytes]):
+        self.objects = objects
+        self.opened: list[str] = []
+
+    def open_artifact(self, s3_key: str) -> io.BytesIO:
+        self.opened.append(s3_key)
+        if s3_key not in self.objects:
+            raise KeyError(s3_key)
+        return io.BytesIO(self.objects[s3_key])
+
+
+DIFF = b"""diff --git a/tests/test_limiter.py b/tests/test_limiter.py
+--- a/tests/test_limiter.py
++++ b/tests/test_limiter.py
++def test_allows_request_at_limit():
++    assert limiter.allow(10)
+"""
+
+COVERAGE = b"""<?xml version="1.0"?>
+<coverage line-rate="0.75" branch-rate="0.5">
+    <packages><package name="app"><classes>
+        <class filename="app/limiter.py"><lines>
+            <line number="1" hits="1"/><line number="2" hits="0"/>
+        </lines></class>
+    </classes></package></packages>
+</coverage>
+"""
+
+
+class TestExtractEvidence:
+    """Tests for extract_evidence."""
+
+    async def test_merges_metrics_from_every_extractor(self):
+        """Should derive metrics from the diff, the test report and coverage."""
+        report = {"duration": 1.0, "summary": {"passed": 4, "failed": 1, "total": 5}, "tests": []}
+        store = FakeStore({
+            "runs/run_1/diff.patch": DIFF,
+            "runs/run_1/pytest_report.json": json.dumps(report).encode(),
+            "runs/run_1/testlog.txt": b"==== 9 passed in 1.00s ====",
+            "runs/run_1/coverage.xml": COVERAGE,
+        })
+
+        result = await extract_evidence(
+            "run_1",
+            ["metrics.json", "diff.patch", "pytest_report.json", "testlog.txt", "coverage.xml"],
+            store=store,
+        )
+
+        assert result.metrics["tests_added_count"] == 1
+        assert result.metrics["test_files_changed"] == 1
+        assert result.metrics["skipped_tests_added"] == 0
+        assert result.metrics["failed_tests_count"] == 1
+        assert result.metrics["total_tests"] == 5
+        assert result.metrics["coverage_percent"] == 75.0
+        assert result.artifact_metadata["diff.patch"]["test_files_changed"] == ["tests/test_limiter.py"]
+        assert set(result.timings) == {"diff.patch", "pytest_report.json", "coverage.xml"}
+        # The JSON report replaces the log; unknown artifacts are not fetched
+        assert "runs/run_1/testlog.txt" not in store.opened
+        assert "runs/run_1/metrics.json" not in store.opened
+
+    async def test_skips_artifacts_that_fail(self):
+        """Should keep the other extractors' metrics when one artifact fails."""
+        store = FakeStore({"runs/run_1/diff.patch": DIFF})
+
+        result = await extract_evidence("run_1", ["diff.patch", "coverage.xml"], store=store)
+
+        assert result.metrics["tests_added_count"] == 1
+        assert "coverage_percent" not in result.metrics
+        assert "coverage.xml" in result.errors
+
+    async def test_records_answered_prompts_for_writeup(self):
+        """Should put the answered prompts into the writeup artifact's metadata."""
+        writeup = (
+            "## Root Cause\nThe limiter compared with > instead of >= so requests at the limit "
+            "were rejected.\n## Monitoring\nAlert on the rejection rate per client and log every "
+            "rejected request with its quota."
+        )
+        store = FakeStore({"runs/run_1/writeup.md": writeup.encode()})
+
+        result = await extract_evidence("run_1", ["writeup.md"], store=store)
+
+        assert result.metrics["writeup_has_root_cause"] is True
+        assert "root cause" in result.artifact_metadata["writeup.md"]["prompts"]
+
+    async def test_uses_grader_evidence_instead_of_artifacts(self):
+        """Should take the grader's summarised metrics and skip those downloads."""
+        evidence = {
+            "schema_version": 1,
+            "sources": ["diff.patch", "pytest_report.json"],
+            "metrics": {"tests_added_count": 3, "total_tests": 12},
+            "artifacts": {"diff.patch": {"files_changed": ["app/limiter.py"]}},
+        }
+        store = FakeStore({
+            "runs/run_1/evidence.json": json.dumps(evidence).encode(),
+            "runs/run_1/coverage.xml": COVERAGE,
+        })
+
+        result = await extract_evidence(
+            "run_1",
+            ["diff.patch", "pytest_report.json", "testlog.txt", "coverage.xml", "evidence.json"],
+            store=store,
+        )
+
+        assert result.metrics["tests_added_count"] == 3
+        assert result.metrics["total_tests"] == 12
+        assert result.metrics["coverage_percent"] == 75.0
+        assert result.artifact_metadata["diff.patch"]["files_changed"] == ["app/limiter.py"]
+        assert store.opened == ["runs/run_1/evidence.json", "runs/run_1/coverage.xml"]
+
+    async def test_ignores_unknown_evidence_schema(self):
+        """Should extract the artifacts itself when evidence.json has another version."""
+        evidence = {"schema_version": 99, "sources": ["diff.patch"], "metrics": {"tests_added_count": 7}}
+        store = FakeStore({
+            "runs/run_1/evidence.json": json.dumps(evidence).encode(),
+            "runs/run_1/diff.patch": DIFF,
+        })
+
+        result = await extract_evidence("run_1", ["diff.patch", "evidence.json"], store=store)
+
+        assert result.metrics["tests_added_count"] == 1
+        assert "runs/run_1/diff.patch" in store.opened
+
+    async def test_ignores_malformed_grader_evidence(self):
+        """Should extract the artifacts itself when evidence.json has the wrong shape."""
+        evidence = {"schema_version": 1, "sources": ["diff.patch"], "metrics": ["tests_added_count"]}
+        store = FakeStore({
+            "runs/run_1/evidence.json": json.dumps(evidence).encode(),
+            "runs/run_1/diff.patch": DIFF,
+        })
+
+        result = await extract_evidence("run_1", ["diff.patch", "evidence.json"], store=store)
+
+        assert result.metrics["tests_added_count"] == 1
+        assert "runs/run_1/diff.patch" in store.opened
+
+
+GRADER_EVIDENCE = Path(__file__).parents[3] / "runner" / "sandbox" / "grader" / "evidence.py"
+
+PARITY_DIFF = b"""diff --git a/app/limiter.py b/app/limiter.py
+--- a/app/limiter.py
++++ b/app/limiter.py
+@@ -1,3 +1,3 @@
+-    return count > limit
++    return count >= limit
+diff --git a/tests/test_limiter.py b/tests/test_limiter.py
+--- a/tests/test_limiter.py
++++ b/tests/test_limiter.py
+@@ -1,2 +1,9 @@
++def test_allows_request_at_limit():
++    assert limiter.allow(10)
++
++@pytest.mark.skip(reason="flaky")
++def test_resets_window():
++    assert limiter.reset()
+diff --git a/web/limiter.spec.ts b/web/limiter.spec.ts
+--- a/web/limiter.spec.ts
++++ b/web/limiter.spec.ts
++it("rejects over limit", () => {})
+"""
+
+PARITY_REPORT = {
+    "duration": 2.5,
+    "summary": {"passed": 7, "failed": 2, "skipped": 1, "error": 1, "total": 11},
+    "tests": [
+        {"nodeid": "tests/test_limiter.py::test_allows_request_at_limit", "outcome": "passed"},
+        {"nodeid": "tests/test_limiter.py::test_burst", "outcome": "failed"},
+        {"nodeid": "tests/test_limiter.py::test_window", "outcome": "error"},
+    ],
+}
+
+PARITY_COVERAGE = b"""<?xml version="1.0"?>
+<coverage line-rate="0.6667" branch-rate="0.25">
+    <packages><package name="app"><classes>
+        <class filename="app/limiter.py">
+            <methods><method name="allow"><lines><line number="1" hits="1"/></lines></method></methods>
+            <lines><line number="1" hits="1"/><line number="2" hits="0"/><line number="3" hits="3"/></lines>
+        </class>
+        <class filename="app/window.py"><lines>
+            <line number="1" hits="0"/><line number="2" hits="2"/><line number="3" hits="1"/>
+        </lines></class>
+    </classes></package></packages>
+</coverage>
+"""
+
+
+@pytest.mark.skipif(not GRADER_EVIDENCE.exists(), reason="runner sources not available")
+class TestGraderEvidenceParity:
+    """The grader's evidence.json must match what the backend extracts itself."""
+
+    def load_grader(self):
+        spec = importlib.util.spec_from_file_location("grader_evidence", GRADER_EVIDENCE)
+        module = importlib.util.module_from_spec(spec)
+        spec.loader.exec_module(module)
+        return module
+
+    async def test_grader_and_backend_metrics_match(self, tmp_path):
+        """Should produce identical metrics and metadata from the same artifacts."""
+        artifacts = {
+            "diff.patch": PARITY_DIFF,
+            "pytest_report.json": json.dumps(PARITY_REPORT).encode(),
+            "coverage.xml": PARITY_COVERAGE,
+        }
+        for name, content in artifacts.items():
+            (tmp_path / name).write_bytes(content)
+
+        evidence_path = self.load_grader().write_evidence("run_1", tmp_path)
+        evidence = json.loads(evidence_path.read_text())
+        store = FakeStore({f"runs/run_1/{name}": content for name, content in artifacts.items()})
+        result = await extract_evidence("run_1", list(artifacts), store=store)
+
+        assert not result.errors
+        assert sorted(evidence["sources"]) == sorted(artifacts)
+        assert evidence["metrics"] == result.metrics
+        assert evidence["artifacts"] == result.artifact_metadata
+
+
+WRITEUP = b"""## Root Cause
+The limiter compared with > instead of >= so requests at the limit were rejected.
+
+## Changes
+Switched the comparison to >= and added a regression test for the boundary.
+
+## Tradeoffs
+Considered a token bucket instead of the fixed window, but kept the window for now.
+
+## Monitoring
+Alert on the rejection rate per client and log every rejected request with its quota.
+"""
+
+
+class FakeDB:
+    """Stands in for the orchestrator's AsyncSession."""
+
+    def __init__(self):
+        self.added: list = []
+        self.committed = False
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        return False
+
+    def add(self, record):
+        self.added.append(record)
+
+    async def commit(self):
+        self.committed = True
+
+    async def rollback(self):
+        pass
+
+
+class TestRunCompletionWriteup:
+    """From a completed run to the stored WRITEUP artifact."""
+
+    def _context(self) -> RunContext:
+        return RunContext(
+            run=SimulationRun(
+                id="run_1",
+                application_id="app_1",
+                simulation_id="bugfix_v1",
+                status=SimulationRunStatus.SUCCEEDED,
+                finished_at=datetime(2024, 1, 1),
+            ),
+            application=Application(id="app_1", role_id="role_1", candidate_id="cand_1"),
+            role=Role(id="role_1", org_id="org_1", title="Backend Engineer"),
+            candidate=Candidate(id="cand_1", name="Sam", email="sam@example.com"),
+            com={},
+            rubric={},
+        )
+
+    async def test_writeup_artifact_carries_answered_prompts(self):
+        """Should extract the uploaded writeup.md and store the prompts on its artifact."""
+        store = FakeStore({"runs/run_1/writeup.md": WRITEUP})
+        db = FakeDB()
+        context = self._context()
+        inserted: list = []
+
+        async def bulk_insert(_db, records):
+            inserted.extend(records)
+
+        with (
+            patch.object(pipeline, "get_artifact_store", return_value=store),
+            patch.object(orchestrator, "get_session_factory", return_value=lambda: db),
+            patch.object(orchestrator, "load_run_context", AsyncMock(return_value=context)),
+            patch.object(orchestrator, "is_already_orchestrated", AsyncMock(return_value=False)),
+            patch.object(orchestrator, "bulk_insert", bulk_insert),
+        ):
+            await orchestrator.process_completed_run(
+                "run_1",
+                metrics={"tests_passed": True},
+                artifact_urls={"writeup.md": "https://s3/runs/run_1/writeup.md"},
+                artifact_hashes={"writeup.md": "abc123"},
+            )
+
+        assert store.opened == ["runs/run_1/writeup.md"]
+
+        [writeup] = [r for r in inserted if isinstance(r, Artifact)]
+        assert writeup.type == ArtifactType.WRITEUP
+        assert writeup.s3_key == "runs/run_1/writeup.md"
+        assert writeup.sha256 == "abc123"
+        assert sorted(writeup.metadata_json["prompts"]) == [
+            "monitoring",
+            "root cause",
+            "tradeoffs",
+            "what did you change",
+        ]
+
+        # The communication rule saw the prompts: only the missing LLM tags leave it unproved
+        [communication] = [
+            r for r in inserted if isinstance(r, Claim) and r.claim_type == "communication_clear"
+        ]
+        assert "no LLM tagging" in communication.evidence_refs_json["reason"]
+        assert any(isinstance(r, Brief) for r in db.added)
+        assert context.application.status == ApplicationStatus.COMPLETE
+        assert db.committed
@@ -0,0 +1,106 @@
+"""Tests for the simulation job queue (producer side)."""
+
+import json
+import time
+from unittest.mock import patch
+
+import fakeredis
+import httpx
+from fastapi import FastAPI
+
+from app.api.routes import internal
+from app.services import job_queue
+from app.services.job_queue import enqueue_job, get_queue_stats, lane_for_job
+
+QUEUE = job_queue.settings.job_queue
+
+
+class TestEnqueueJob:
+    """Tests for enqueue_job."""
+
+    def setup_method(self):
+        self.redis = fakeredis.FakeAsyncRedis(decode_responses=True)
+
+    def test_lane_for_job(self):
+        """Should put grading jobs in the grade lane and everything else in bootstrap."""
+        assert lane_for_job({"type": "grade"}) == "grade"
+        assert lane_for_job({"type": "simulation"}) == "bootstrap"
+        assert lane_for_job({}) == "bootstrap"
+
+    async def test_enqueues_on_the_org_lane(self):
+        """Should push the job onto its org's list in its lane and mark the org active."""
+        await enqueue_job(self.redis, {"run_id": "run_1", "type": "grade"}, "org_a")
+
+        jobs = await self.redis.lrange(f"{QUEUE}:lane:grade:org:org_a", 0, -1)
+        assert len(jobs) == 1
+        payload = json.loads(jobs[0])
+        assert payload["run_id"] == "run_1"
+        assert payload["org_id"] == "org_a"
+        assert payload["lane"] == "grade"
+        assert abs(payload["enqueued_at"] - time.time()) < 5
+        assert await self.redis.smembers(f"{QUEUE}:lane:grade:orgs") == {"org_a"}
+        assert await self.redis.llen(QUEUE) == 0
+
+    async def test_keeps_a_single_wakeup_signal(self):
+        """Should leave one signal token however many jobs are enqueued."""
+        for i in range(3):
+            await enqueue_job(self.redis, {"run_id": f"run_{i}"}, "org_a")
+
+        assert await self.redis.llen(f"{QUEUE}:signal") == 1
+        assert await self.redis.llen(f"{QUEUE}:lane:bootstrap:org:org_a") == 3
+
+
+class TestQueueStats:
+    """Tests for get_queue_stats and GET /api/internal/queue/stats."""
+
+    def setup_method(self):
+        self.redis = fakeredis.FakeAsyncRedis()
+
+    async def populate(self):
+        await enqueue_job(self.redis, {"run_id": "run_1", "type": "grade"}, "org_a")
+        await enqueue_job(self.redis, {"run_id": "run_2"}, "org_a")
+        await enqueue_job(self.redis, {"run_id": "run_3"}, "org_a")
+        await self.redis.lpush(QUEUE, "{}")
+        # Written by the runner's scheduler on dequeue
+        await self.redis.hset(
+            f"{QUEUE}:stats:org_b",
+            mapping={"dequeued": 4, "wait_seconds_total": 10.0, "last_wait_seconds": 1.5},
+        )
+
+    async def test_reports_depth_and_waits_per_org(self):
+        """Should report lane depths and average waits per org, plus the legacy list."""
+        await self.populate()
+
+        stats = await get_queue_stats(self.redis)
+
+        assert stats == {
+            "orgs": {
+                "org_a": {"depth": {"grade": 1, "bootstrap": 2}},
+                "org_b": {
+                    "depth": {},
+                    "dequeued": 4,
+                    "avg_wait_seconds": 2.5,
+                    "last_wait_seconds": 1.5,
+                },
+            },
+            "legacy_depth": 1,
+        }
+
+    async def test_stats_endpoint(self):
+        """Should serve the stats to callers with the internal API key only."""
+        await self.populate()
+        app = FastAPI()
+        app.include_router(internal.router)
+        transport = httpx.ASGITransport(app=app)
+
+        with patch.object(internal.redis, "from_url", return_value=self.redis):
+            async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+                denied = await client.get("/queue/stats", headers={"X-Internal-Key": "wrong"})
+                response = await client.get(
+                    "/queue/stats", headers={"X-Internal-Key": internal.settings.internal_api_key}
+                )
+
+        assert denied.status_code == 401
+        assert response.status_code == 200
+        assert response.json()["orgs"]["org_a"]["depth"] == {"grade": 1, "bootstrap": 2}
+        assert response.json()["legacy_depth"] == 1
@@ -0,0 +1,230 @@
+"""Tests for the orchestration queue and worker."""
+
+import asyncio
+import functools
+import time
+from unittest.mock import AsyncMock, patch
+
+import fakeredis
+import pytest
+from redis.exceptions import ConnectionError as RedisConnectionError
+
+from app.services import orchestration_queue
+from app.services.orchestration_queue import OrchestrationQueue, enqueue_orchestration
+from app.workers import orchestration
+from app.workers.orchestration import OrchestrationWorker, _is_loopback, _serve_metrics
+
+QUEUE = orchestration_queue.settings.orchestration_queue
+
+
+async def _enqueue(r, run_id: str = "run_1", metrics: dict | None = None) -> bool:
+    return await enqueue_orchestration(r, run_id, metrics or {}, {}, {})
+
+
+class TestEnqueueOrchestration:
+    """Tests for enqueue_orchestration."""
+
+    def setup_method(self):
+        self.redis = fakeredis.FakeAsyncRedis()
+
+    async def test_queues_a_run_once(self):
+        """Should queue a run once and only refresh its payload afterwards."""
+        assert await _enqueue(self.redis, metrics={"tests_passed": False}) is True
+        assert await _enqueue(self.redis, metrics={"tests_passed": True}) is False
+
+        assert await self.redis.lrange(QUEUE, 0, -1) == [b"run_1"]
+        taken = await OrchestrationQueue(self.redis).take(timeout=1)
+        assert taken[1]["metrics"] == {"tests_passed": True}
+
+    async def test_skips_orchestrated_runs(self):
+        """Should not queue a run that has already been orchestrated."""
+        await self.redis.set(f"{QUEUE}:done:run_1", 1)
+
+        assert await _enqueue(self.redis) is False
+        assert await self.redis.llen(QUEUE) == 0
+
+
+class TestOrchestrationQueue:
+    """Tests for OrchestrationQueue."""
+
+    def setup_method(self):
+        self.redis = fakeredis.FakeAsyncRedis()
+        self.queue = OrchestrationQueue(self.redis)
+
+    async def test_complete_marks_run_done(self):
+        """Should remember the run as done and drop it from processing."""
+        await _enqueue(self.redis)
+        run_id, _ = await self.queue.take(timeout=1)
+
+        await self.queue.complete(run_id)
+
+        assert await self.redis.exists(f"{QUEUE}:done:run_1")
+        assert await self.redis.llen(self.queue.processing_key) == 0
+        assert not await self.redis.hexists(self.queue.payloads_key, "run_1")
+
+    async def test_failed_run_is_retried_after_backoff(self):
+        """Should delay a failed run, then requeue it once the backoff is due."""
+        await _enqueue(self.redis)
+        run_id, _ = await self.queue.take(timeout=1)
+
+        await self.queue.fail(run_id, "database unavailable")
+
+        assert await self.redis.zscore(self.queue.delayed_key, "run_1") > time.time()
+        assert await self.queue.recover() == 0
+
+        await self.redis.zadd(self.queue.delayed_key, {"run_1": 0})
+        assert await self.queue.recover() == 1
+        assert (await self.queue.take(timeout=1))[0] == "run_1"
+
+    async def test_dead_letters_after_max_attempts(self):
+        """Should dead-letter the run and free it to be queued again."""
+        await _enqueue(self.redis)
+        with patch.object(orchestration_queue.settings, "orchestration_max_attempts", 1):
+            run_id, _ = await self.queue.take(timeout=1)
+            await self.queue.fail(run_id, "bad payload")
+
+        assert await self.redis.lrange(self.queue.dead_letter_key, 0, -1) == [b"run_1"]
+        assert await self.redis.hexists(self.queue.dead_payloads_key, "run_1")
+        assert not await self.redis.hexists(self.queue.payloads_key, "run_1")
+        # After a manual fix the run can be reported again
+        assert await _enqueue(self.redis) is True
+
+    async def test_requeues_runs_whose_lease_expired(self):
+        """Should requeue a taken run once it has been unleased for a full pass."""
+        await _enqueue(self.redis)
+        await self.queue.take(timeout=1)
+        await self.redis.delete(self.queue._lease_key("run_1"))
+
+        # First pass only notes it: it might be between take and lease
+        assert await self.queue.recover() == 0
+        assert await self.queue.recover() == 1
+        assert await self.redis.lrange(QUEUE, 0, -1) == [b"run_1"]
+        assert await self.redis.llen(self.queue.processing_key) == 0
+
+
+class TestOrchestrationWorker:
+    """Tests for OrchestrationWorker."""
+
+    def setup_method(self):
+        self.redis = fakeredis.FakeAsyncRedis()
+        self.worker = OrchestrationWorker(self.redis)
+
+    async def test_runs_share_the_batch_role_cache(self):
+        """Should orchestrate with the cache of the current batch."""
+        self.worker.queue.complete = AsyncMock()
+
+        with patch("app.workers.orchestration.process_completed_run", AsyncMock()) as process:
+            await self.worker._process("run_1", {})
+
+        assert process.await_args.kwargs["role_cache"] is self.worker.role_cache
+
+    async def test_redis_error_on_complete_does_not_escape(self):
+        """Should keep the slot alive when Redis fails after the run was orchestrated."""
+        self.worker.queue.complete = AsyncMock(side_effect=RedisConnectionError("down"))
+
+        with (
+            patch("app.workers.orchestration.process_completed_run", AsyncMock()),
+            patch("app.workers.orchestration.asyncio.sleep", AsyncMock()),
+        ):
+            await self.worker._process("run_1", {})
+
+        assert self.worker.queue.complete.await_count > 1
+
+    async def test_redis_error_on_fail_does_not_escape(self):
+        """Should keep the slot alive when a failure cannot be recorded."""
+        self.worker.queue.fail = AsyncMock(side_effect=RedisConnectionError("down"))
+
+        with patch(
+            "app.workers.orchestration.process_completed_run",
+            AsyncMock(side_effect=RuntimeError("boom")),
+        ):
+            await self.worker._process("run_1", {})
+
+        self.worker.queue.fail.assert_awaited_once()
+
+
+class TestMetricsListener:
+    """Tests for the worker's Prometheus listener."""
+
+    async def _request(self, request: bytes, require_key: bool = False) -> bytes:
+        server = await asyncio.start_server(
+            functools.partial(_serve_metrics, require_key=require_key), host="127.0.0.1", port=0
+        )
+        port = server.sockets[0].getsockname()[1]
+        try:
+            reader, writer = await asyncio.open_connection("127.0.0.1", port)
+            writer.write(request)
+            await writer.drain()
+            response = await reader.read()
+            writer.close()
+            return response
+        finally:
+            server.close()
+            await server.wait_closed()
+
+    async def test_serves_metrics(self):
+        """Should answer GET /metrics with the proof engine metrics."""
+        with patch.object(orchestration, "get_proof_engine") as engine:
+            engine.return_value.render_metrics.return_value = "proof_runs_total 1\n"
+            response = await self._request(b"GET /metrics HTTP/1.1\r\nHost: x\r\n\r\n")
+
+        assert response.startswith(b"HTTP/1.1 200 OK\r\n")
+        assert response.endswith(b"\r\n\r\nproof_runs_total 1\n")
+
+    async def test_ignores_query_string(self):
+        """Should serve /metrics with a query string."""
+        with patch.object(orchestration, "get_proof_engine") as engine:
+            engine.return_value.render_metrics.return_value = ""
+            response = await self._request(b"GET /metrics?x=1 HTTP/1.1\r\n\r\n")
+
+        assert response.startswith(b"HTTP/1.1 200 OK\r\n")
+
+    @pytest.mark.parametrize(
+        "request_line",
+        [b"GET / HTTP/1.1", b"GET /admin HTTP/1.1", b"POST /metrics HTTP/1.1", b"garbage"],
+    )
+    async def test_other_paths_not_found(self, request_line):
+        """Should answer 404 for anything but GET /metrics."""
+        with patch.object(orchestration, "get_proof_engine") as engine:
+            response = await self._request(request_line + b"\r\n\r\n")
+
+        assert response.startswith(b"HTTP/1.1 404 Not Found\r\n")
+        engine.assert_not_called()
+
+    async def test_requires_internal_key(self):
+        """Should reject scrapes without the internal API key when exposed."""
+        with patch.object(orchestration, "get_proof_engine") as engine:
+            engine.return_value.render_metrics.return_value = ""
+            missing = await self._request(b"GET /metrics HTTP/1.1\r\n\r\n", require_key=True)
+            wrong = await self._request(
+                b"GET /metrics HTTP/1.1\r\nX-Internal-Key: nope\r\n\r\n", require_key=True
+            )
+            valid = await self._request(
+                b"GET /metrics HTTP/1.1\r\nX-Internal-Key: "
+                + orchestration.settings.internal_api_key.encode()
+                + b"\r\n\r\n",
+                require_key=True,
+            )
+
+        assert missing.startswith(b"HTTP/1.1 401 Unauthorized\r\n")
+        assert wrong.startswith(b"HTTP/1.1 401 Unauthorized\r\n")
+        assert valid.startswith(b"HTTP/1.1 200 OK\r\n")
+
+    def test_is_loopback(self):
+        """Should only treat loopback addresses as private."""
+        assert _is_loopback("127.0.0.1")
+        assert _is_loopback("::1")
+        assert _is_loopback("localhost")
+        assert not _is_loopback("0.0.0.0")
+        assert not _is_loopback("backend")
+
+    def test_binds_to_loopback_by_default(self):
+        """Should bind the listener to loopback unless configured otherwise."""
+        assert orchestration.settings.orchestration_metrics_host == "127.0.0.1"
+
+
+@pytest.fixture(autouse=True)
+def _no_lease_heartbeat():
+    """The worker's lease heartbeat would outlive these short tests."""
+    with patch.object(OrchestrationWorker, "_keep_lease", AsyncMock()):
+        yield
@@ -0,0 +1,202 @@
+"""Tests for declarative proof rules."""
+
+import pytest
+
+from app.db.models import Artifact, ArtifactType
+from app.hypothesis.claim_schema import Claim, ClaimSubject
+from app.proof.context import RuleInputs
+from app.proof.dsl import DEFINITIONS_DIR, RuleDefinitionError, compile_rule, load_rules
+
+
+def make_claim(claim_type: str) -> Claim:
+    """Helper to create a claim of the given type."""
+    return Claim(
+        claim_type=claim_type,
+        subject=ClaimSubject(candidate_id="cand_123", application_id="app_456"),
+        statement="Test claim",
+    )
+
+
+class TestPackagedRules:
+    """Tests for the rules shipped in rules/definitions."""
+
+    def setup_method(self):
+        self.rules = {rule.id: rule for rule in load_rules([DEFINITIONS_DIR])}
+
+    def test_time_efficient_proves_within_pace_threshold(self):
+        """Should prove when time to green is under the COM pace threshold."""
+        rule = self.rules["time_efficient_v1"]
+        result = rule.evaluate(
+            make_claim("time_efficient"), {"time_to_green_seconds": 1800.0}, {}, None, {"pace": "high"}
+        )
+
+        assert result.status == "PROVED"
+        assert result.reason == "Candidate completed in 30 minutes, within threshold for high pace"
+        assert [ref.id for ref in result.evidence_refs] == ["time_to_green_seconds"]
+
+    def test_time_efficient_defaults_pace_to_medium(self):
+        """Should use the medium threshold when COM has no pace."""
+        rule = self.rules["time_efficient_v1"]
+        result = rule.evaluate(
+            make_claim("time_efficient"), {"time_to_green_seconds": 3100.0}, {}, None, {}
+        )
+
+        assert result.status == "UNPROVED"
+        assert result.reason == "Completion time (51 min) exceeded threshold for medium pace"
+
+    def test_handles_edge_cases_rejects_failing_tests(self):
+        """Should not prove while tests are still failing."""
+        rule = self.rules["handles_edge_cases_v1"]
+        metrics = {"tests_passed": True, "failed_tests_count": 2.0}
+        result = rule.evaluate(make_claim("handles_edge_cases"), metrics, {}, None, {})
+
+        assert result.status == "UNPROVED"
+        assert result.reason == "2.0 test(s) still failing"
+
+
+class TestCompileRule:
+    """Tests for compile_rule."""
+
+    def test_artifact_and_llm_tag_predicates(self):
+        """Should prove from artifact metadata and cited LLM tags."""
+        rule = compile_rule({
+            "id": "communication_dsl",
+            "claim_types": ["communication_clear"],
+            "steps": [
+                {
+                    "require": {"artifact": "writeup", "count": "prompts", "op": "ge", "value": 2},
+                    "reason": "Writeup incomplete",
+                },
+                {
+                    "prove_if": {"llm_tags": ["tradeoff_discussed"], "min_count": 1},
+                    "reason": "Tradeoffs discussed",
+                },
+                {"reject": "No tradeoffs"},
+            ],
+        })
+        writeup = Artifact(
+            id="art_1",
+            type=ArtifactType.WRITEUP,
+            s3_key="k",
+            sha256="x",
+            metadata_json={"prompts": ["a", "b"]},
+        )
+        tags = [{"tag": "tradeoff_discussed", "evidence_quote": "We chose a token bucket because"}]
+
+        result = rule.evaluate(
+            make_claim("communication_clear"), {}, {ArtifactType.WRITEUP: writeup}, tags, {}
+        )
+
+        assert result.status == "PROVED"
+        assert [(ref.type, ref.id) for ref in result.evidence_refs] == [
+            ("artifact", "art_1"),
+            ("llm_tag", "tradeoff_discussed"),
+        ]
+
+    def test_declares_the_inputs_it_reads(self):
+        """Should collect metrics, COM keys, artifacts and tags from predicates and reasons."""
+        rule = compile_rule({
+            "id": "inputs",
+            "claim_types": ["x"],
+            "com_defaults": {"pace": "medium"},
+            "steps": [
+                {"require": {"artifact": "writeup", "count": "prompts", "value": 1}, "reason": "No writeup"},
+                {"record_if": {"llm_tags": ["tradeoff_discussed"]}},
+                {
+                    "prove_if": {
+                        "metric": "time_to_green_seconds",
+                        "op": "le",
+                        "threshold": {"com": "pace", "values": {"high": 1}},
+                    },
+                    "reason": "Done in {time_to_green_seconds!m} minutes",
+                },
+                {"reject": "{failed_tests_count} failing at {com[quality_bar]} bar"},
+            ],
+        })
+
+        assert rule.inputs == RuleInputs(
+            metrics=frozenset({"time_to_green_seconds", "failed_tests_count"}),
+            com=frozenset({"pace", "quality_bar"}),
+            artifacts=frozenset({(ArtifactType.WRITEUP, "prompts")}),
+            llm_tags=frozenset({"tradeoff_discussed"}),
+        )
+
+    def test_ignores_tags_without_citation(self):
+        """Should not count LLM tags whose quote is too short."""
+        rule = compile_rule({
+            "id": "tags_only",
+            "claim_types": ["communication_clear"],
+            "steps": [
+                {"prove_if": {"llm_tags": ["tradeoff_discussed"]}, "reason": "ok"},
+                {"reject": "missing"},
+            ],
+        })
+        result = rule.evaluate(
+            make_claim("communication_clear"), {}, {}, [{"tag": "tradeoff_discussed", "evidence_quote": "yes"}], {}
+        )
+
+        assert result.status == "UNPROVED"
+
+    def test_rejects_unknown_op(self):
+        """Should raise for an unknown comparison."""
+        with pytest.raises(RuleDefinitionError):
+            compile_rule({
+                "id": "bad",
+                "claim_types": ["x"],
+                "steps": [{"require": {"metric": "m", "op": "approx"}, "reason": "r"}],
+            })
+
+    def test_rejects_step_without_reason(self):
+        """Should raise when a deciding step has no reason."""
+        with pytest.raises(RuleDefinitionError):
+            compile_rule({
+                "id": "bad",
+                "claim_types": ["x"],
+                "steps": [{"prove_if": {"metric": "m"}}],
+            })
+
+
+class TestLoadRules:
+    """Tests for load_rules."""
+
+    def test_skips_invalid_files(self, tmp_path):
+        """Should load valid files and skip malformed ones."""
+        (tmp_path / "good.yaml").write_text(
+            "rules:\n  - id: good\n    claim_types: [x]\n    steps:\n      - prove: ok\n"
+        )
+        (tmp_path / "bad.yaml").write_text("rules:\n  - id: bad\n")
+
+        rules = load_rules([tmp_path])
+
+        assert [rule.id for rule in rules] == ["good"]
+
+    def test_skips_files_with_wrong_shapes(self, tmp_path):
+        """Should log and skip files whose structure has the wrong types."""
+        (tmp_path / "good.yaml").write_text(
+            "rules:\n  - id: good\n    claim_types: [x]\n    steps:\n      - prove: ok\n"
+        )
+        (tmp_path / "list.yaml").write_text("- id: top_level_list\n")
+        (tmp_path / "threshold.yaml").write_text(
+            "rules:\n"
+            "  - id: bad_threshold\n"
+            "    claim_types: [x]\n"
+            "    steps:\n"
+            "      - prove_if:\n"
+            "          metric: m\n"
+            "          op: le\n"
+            "          threshold: {com: pace, values: [1, 2]}\n"
+            "        reason: ok\n"
+        )
+
+        rules = load_rules([tmp_path])
+
+        assert [rule.id for rule in rules] == ["good"]
+
+    def test_wraps_unexpected_shapes_in_definition_error(self):
+        """Should raise RuleDefinitionError rather than TypeError for odd values."""
+        with pytest.raises(RuleDefinitionError):
+            compile_rule({
+                "id": "x",
+                "claim_types": ["x"],
+                "steps": [{"prove_if": {"metric": "m", "op": ["ge"], "value": 1}, "reason": "ok"}],
+            })
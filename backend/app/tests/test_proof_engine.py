@@ -1,16 +1,20 @@
 """Tests for the proof engine."""
 
+import httpx
 import pytest
 from unittest.mock import MagicMock
 from uuid import uuid4
 
-from app.hypothesis.claim_schema import Claim, ClaimSubject
+from app.hypothesis.claim_schema import Claim, ClaimSubject, ProofResult
+from app.proof.context import EvidenceContext
 from app.proof.engine import ProofEngine, get_proof_engine
+from app.proof.memo import RuleMemo
 from app.proof.rules.backend_engineer_v1 import (
     AddedRegressionTestRule,
     DebuggingEffectiveRule,
     TestingDisciplineRule,
 )
+from app.proof.rules.communication_v1 import CommunicationClearRule
 from app.db.models import Metric, Artifact, ArtifactType
 
 
@@ -281,3 +285,262 @@ class TestProofEngine:
         engine2 = get_proof_engine()
 
         assert engine1 is engine2
+
+    def test_evaluate_batch_returns_results_per_run(self):
+        """Should evaluate each run's claims against that run's evidence."""
+        engine = ProofEngine()
+        engine.register_rule(AddedRegressionTestRule())
+
+        claim = Claim(
+            claim_type="added_regression_test",
+            subject=make_subject(),
+            statement="Test claim",
+            dimensions=["testing_discipline"],
+            confidence=0.8,
+            evidence_requirements=[],
+        )
+        proving = EvidenceContext(metrics={"tests_passed": True, "test_added": True})
+        failing = EvidenceContext(metrics={"tests_passed": False})
+
+        results = engine.evaluate_batch([([claim], proving), ([claim, claim], failing)])
+
+        assert [len(r) for r in results] == [1, 2]
+        assert results[0][0].status == "PROVED"
+        assert all(r.status == "UNPROVED" for r in results[1])
+
+
+class TestEvidenceContext:
+    """Tests for EvidenceContext."""
+
+    def test_builds_typed_metric_lookup(self):
+        """Should pick the populated value column for each metric."""
+        metrics = [
+            Metric(name="tests_passed", value_bool=True),
+            Metric(name="coverage_percent", value_float=82.5),
+            Metric(name="language", value_text="python"),
+        ]
+
+        context = EvidenceContext.build(metrics, [])
+
+        assert context.metrics == {
+            "tests_passed": True,
+            "coverage_percent": 82.5,
+            "language": "python",
+        }
+        assert context.metric_bool("tests_passed") is True
+        assert context.metric_float("coverage_percent") == 82.5
+        assert context.metric_float("tests_passed") is None
+        assert context.metric_text("missing", "n/a") == "n/a"
+
+    def test_indexes_artifacts_by_type_and_id(self):
+        """Should index artifacts by id and keep all artifacts of a type."""
+        first = Artifact(id="a1", type=ArtifactType.TEST_LOG, s3_key="k1", sha256="x")
+        second = Artifact(id="a2", type=ArtifactType.TEST_LOG, s3_key="k2", sha256="y")
+        diff = Artifact(id="a3", type=ArtifactType.DIFF, s3_key="k3", sha256="z")
+
+        context = EvidenceContext.build([], [first, second, diff])
+
+        assert context.artifacts[ArtifactType.TEST_LOG] is second
+        assert context.artifacts_by_type[ArtifactType.TEST_LOG] == [first, second]
+        assert context.artifacts_by_id["a3"] is diff
+
+
+class TestRuleMemo:
+    """Tests for rule result memoization."""
+
+    def setup_method(self):
+        self.rule = AddedRegressionTestRule()
+        self.memo = RuleMemo(max_entries=2)
+        self.engine = ProofEngine(memo=self.memo)
+        self.engine.register_rule(self.rule)
+
+    def make_claim(self, statement="Test claim"):
+        return Claim(
+            claim_type="added_regression_test",
+            subject=make_subject(),
+            statement=statement,
+            dimensions=["testing_discipline"],
+            confidence=0.8,
+            evidence_requirements=[],
+        )
+
+    def test_reuses_result_for_same_evidence(self):
+        """Should serve the second evaluation from the memo, bound to its own claim."""
+        self.rule.evaluate = MagicMock(wraps=self.rule.evaluate)
+        first = EvidenceContext(metrics={"tests_passed": True, "test_added": True})
+        second = EvidenceContext(metrics={"tests_passed": True, "test_added": True})
+        other_claim = self.make_claim("Another claim")
+
+        self.engine.evaluate_with_context(self.make_claim(), first)
+        result = self.engine.evaluate_with_context(other_claim, second)
+
+        assert self.rule.evaluate.call_count == 1
+        assert result.status == "PROVED"
+        assert result.claim is other_claim
+        assert self.memo.stats.hits == 1
+        assert self.memo.stats.misses == 1
+        assert self.memo.stats.hit_rate == 0.5
+
+    def test_different_evidence_or_version_misses(self):
+        """Should re-evaluate when the evidence or the rule version changes."""
+        claim = self.make_claim()
+        self.engine.evaluate_with_context(claim, EvidenceContext(metrics={"tests_passed": True}))
+        self.engine.evaluate_with_context(claim, EvidenceContext(metrics={"tests_passed": False}))
+        self.rule.version = "2"
+        self.engine.evaluate_with_context(claim, EvidenceContext(metrics={"tests_passed": True}))
+
+        assert self.memo.stats.hits == 0
+        assert self.memo.stats.misses == 3
+        # LRU bounded to max_entries
+        assert len(self.memo) == 2
+
+    def test_keys_only_on_declared_inputs(self):
+        """Should hit for another run whose metrics the rule reads are the same."""
+        claim = self.make_claim()
+        first = EvidenceContext(
+            metrics={"tests_passed": True, "test_added": True, "lines_added": 10},
+            com={"pace": "high"},
+        )
+        second = EvidenceContext(
+            metrics={"tests_passed": True, "test_added": True, "lines_added": 99},
+            com={"pace": "low"},
+        )
+
+        self.engine.evaluate_with_context(claim, first)
+        self.engine.evaluate_with_context(claim, second)
+
+        assert self.memo.stats.hits == 1
+
+    def test_rebinds_artifact_evidence_to_current_run(self):
+        """Should cite the current run's artifact on a hit, not the cached run's."""
+        rule = CommunicationClearRule()
+        engine = ProofEngine(memo=RuleMemo())
+        engine.register_rule(rule)
+        claim = Claim(
+            claim_type="communication_clear",
+            subject=make_subject(),
+            statement="Clear writeup",
+            dimensions=["communication"],
+            confidence=0.8,
+            evidence_requirements=[],
+        )
+        metadata = {"prompts": ["a", "b", "c"]}
+
+        def context(artifact_id):
+            writeup = Artifact(
+                id=artifact_id, type=ArtifactType.WRITEUP, s3_key=artifact_id, sha256="x", metadata_json=metadata
+            )
+            return EvidenceContext.build([], [writeup])
+
+        engine.evaluate_with_context(claim, context("w1"))
+        result = engine.evaluate_with_context(claim, context("w2"))
+
+        assert engine.memo.stats.hits == 1
+        assert {ref.id for ref in result.evidence_refs if ref.type == "artifact"} == {"w2"}
+
+    def test_skips_rules_without_declared_inputs(self):
+        """Should always evaluate rules that do not declare their inputs."""
+        self.rule.inputs = None
+        claim = self.make_claim()
+        context = EvidenceContext(metrics={"tests_passed": True, "test_added": True})
+
+        self.engine.evaluate_with_context(claim, context)
+        self.engine.evaluate_with_context(claim, context)
+
+        assert self.memo.stats.lookups == 0
+        assert len(self.memo) == 0
+
+    def test_falls_back_to_redis_tier(self):
+        """Should serve results stored by another process through Redis."""
+        shared = {}
+        client = MagicMock()
+        client.get.side_effect = shared.get
+        client.set.side_effect = lambda key, value, **_: shared.__setitem__(key, value)
+        claim = self.make_claim()
+        context = EvidenceContext(metrics={"tests_passed": True, "test_added": True})
+
+        writer = RuleMemo(redis_client=client)
+        key = writer.key(self.rule, claim, context)
+        writer.put(key, self.rule.evaluate(claim, context.metrics, {}, None, {}), context)
+
+        reader = RuleMemo(redis_client=client)
+        result = reader.get(key, claim, context)
+
+        assert isinstance(result, ProofResult)
+        assert result.status == "PROVED"
+        assert reader.stats.redis_hits == 1
+        assert len(reader) == 1
+
+
+class TestProofMetrics:
+    """Tests for proof engine instrumentation."""
+
+    def make_claim(self, claim_type="added_regression_test"):
+        return Claim(
+            claim_type=claim_type,
+            subject=make_subject(),
+            statement="Test claim",
+            dimensions=["testing_discipline"],
+            confidence=0.8,
+            evidence_requirements=[],
+        )
+
+    def test_records_rule_and_claim_outcomes(self):
+        """Should count outcomes per rule and per claim type and time each rule."""
+        engine = ProofEngine()
+        engine.register_rule(AddedRegressionTestRule())
+
+        engine.evaluate_with_context(
+            self.make_claim(), EvidenceContext(metrics={"tests_passed": True, "test_added": True})
+        )
+        engine.evaluate_with_context(self.make_claim(), EvidenceContext(metrics={}))
+        text = engine.render_metrics()
+
+        assert (
+            'proofhire_proof_rule_evaluations_total{rule="added_regression_test_v1",status="PROVED"} 1'
+            in text
+        )
+        assert (
+            'proofhire_proof_claims_total{claim_type="added_regression_test",status="UNPROVED"} 1'
+            in text
+        )
+        assert (
+            'proofhire_proof_rule_duration_seconds_count{rule="added_regression_test_v1"} 2' in text
+        )
+        assert '# TYPE proofhire_proof_rule_duration_seconds histogram' in text
+
+    def test_counts_rule_exceptions(self):
+        """Should count a raising rule as an ERROR outcome with its exception type."""
+        rule = AddedRegressionTestRule()
+        rule.evaluate = MagicMock(side_effect=KeyError("boom"))
+        engine = ProofEngine()
+        engine.register_rule(rule)
+
+        result = engine.evaluate_with_context(self.make_claim(), EvidenceContext())
+        text = engine.render_metrics()
+
+        assert result.status == "UNPROVED"
+        assert (
+            'proofhire_proof_rule_exceptions_total{rule="added_regression_test_v1",exception="KeyError"} 1'
+            in text
+        )
+        assert (
+            'proofhire_proof_rule_evaluations_total{rule="added_regression_test_v1",status="ERROR"} 1'
+            in text
+        )
+
+    async def test_metrics_endpoint_needs_internal_key(self):
+        """Should only serve /metrics to callers with the internal API key."""
+        from app.config import get_settings
+        from app.main import app
+
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+            denied = await client.get("/metrics", headers={"X-Internal-Key": "wrong"})
+            allowed = await client.get(
+                "/metrics", headers={"X-Internal-Key": get_settings().internal_api_key}
+            )
+
+        assert denied.status_code == 401
+        assert allowed.status_code == 200
+        assert "proofhire_proof_rule_evaluations_total" in allowed.text
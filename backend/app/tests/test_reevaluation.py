@@ -0,0 +1,207 @@
+"""Tests for bulk role re-evaluation."""
+
+import sys
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from unittest.mock import AsyncMock, patch
+
+import pytest
+from sqlalchemy.dialects import postgresql
+from sqlalchemy.sql.dml import Insert
+
+from app.db.models import Candidate, Role, SimulationRun, SimulationRunStatus
+from app.services import reevaluation
+from app.services.reevaluation import ReevaluationProgress, _load_page, _write_page, reevaluate_role
+from app.workers import reevaluate as reevaluate_worker
+
+
+def _sql(statement) -> str:
+    return str(statement.compile(dialect=postgresql.asyncpg.dialect()))
+
+
+class Rows:
+    def __init__(self, rows):
+        self.rows = rows
+
+    def all(self):
+        return self.rows
+
+
+class FakeSession:
+    """Stands in for AsyncSession, answering each query from a handler."""
+
+    def __init__(self, handler, log: list):
+        self.handler = handler
+        self.log = log
+        self.open = False
+
+    async def __aenter__(self):
+        self.open = True
+        self.log.append("open")
+        return self
+
+    async def __aexit__(self, *exc):
+        self.open = False
+        self.log.append("close")
+
+    async def execute(self, statement):
+        self.log.append(statement)
+        return Rows(self.handler(statement))
+
+    async def get(self, _model, key):
+        return Role(id=key, org_id="org_1", title="Backend Engineer", com_json={}, rubric_json={})
+
+    async def commit(self):
+        self.log.append("commit")
+
+
+def _run(application_id: str) -> tuple[SimulationRun, Candidate]:
+    run = SimulationRun(
+        id=f"run_{application_id}",
+        application_id=application_id,
+        simulation_id="bugfix_v1",
+        status=SimulationRunStatus.SUCCEEDED,
+        finished_at=datetime(2024, 1, 1),
+    )
+    return run, Candidate(id=f"cand_{application_id}", name="Sam", email="sam@example.com")
+
+
+class TestLoadPage:
+    """Tests for _load_page."""
+
+    async def test_keyset_pages_latest_run_per_application(self):
+        """Should select the latest run per application, after the last seen application id."""
+        log: list = []
+
+        def handler(statement):
+            sql = _sql(statement)
+            if "FROM simulation_runs JOIN" in sql:
+                return [_run("app_2")]
+            if "FROM metrics" in sql:
+                return [("run_app_2", "m_1", "tests_passed", None, True, None)]
+            return []
+
+        jobs = await _load_page(FakeSession(handler, log), "role_1", "app_1", page_size=50)
+
+        sql = _sql(log[0])
+        assert (
+            "row_number() OVER (PARTITION BY simulation_runs.application_id "
+            "ORDER BY simulation_runs.finished_at DESC) AS rank"
+        ) in sql
+        assert "applications.id > $" in sql
+        assert "WHERE anon_1.rank = $" in sql
+        assert "ORDER BY applications.id \n LIMIT $" in sql
+        assert log[0].compile().params["param_1"] == 50
+        assert [job["application_id"] for job in jobs] == ["app_2"]
+        assert jobs[0]["metrics"] == [("m_1", "tests_passed", None, True, None)]
+        assert jobs[0]["artifacts"] == []
+
+    async def test_empty_page_skips_evidence_queries(self):
+        """Should stop after the run query when no runs are left."""
+        log: list = []
+
+        jobs = await _load_page(FakeSession(lambda _: [], log), "role_1", "app_9", page_size=50)
+
+        assert jobs == []
+        assert len(log) == 1
+
+
+class TestWritePage:
+    """Tests for _write_page."""
+
+    async def test_writes_next_brief_version(self):
+        """Should write version max+1 per application, starting at 1."""
+        log: list = []
+
+        def handler(statement):
+            if "max(briefs.version)" in _sql(statement):
+                return [("app_1", 2)]
+            return []
+
+        evaluated = [
+            ({"application_id": "app_1"}, ([], {"proof_rate": 0.5})),
+            ({"application_id": "app_2"}, ([], {"proof_rate": 1.0})),
+        ]
+        await _write_page(FakeSession(handler, log), evaluated)
+
+        inserts = [s for s in log if isinstance(s, Insert) and s.table.name == "briefs"]
+        assert len(inserts) == 1
+        params = inserts[0].compile().params
+        versions = {params[k]: params[k.replace("application_id", "version")]
+                    for k in params if k.startswith("application_id")}
+        assert versions == {"app_1": 3, "app_2": 1}
+
+
+class TestReevaluateRole:
+    """Tests for reevaluate_role."""
+
+    async def test_pages_through_runs_on_the_executor(self):
+        """Should evaluate every page off the session and write each page separately."""
+        log: list = []
+        pages = {"": [_run("app_1"), _run("app_2")], "app_2": [_run("app_3")], "app_3": []}
+        after_ids: list[str] = []
+
+        def handler(statement):
+            sql = _sql(statement)
+            if "FROM simulation_runs JOIN" in sql:
+                params = statement.compile().params
+                after_id = next(v for k, v in params.items() if k.startswith("id_"))
+                after_ids.append(after_id)
+                return pages[after_id]
+            return []
+
+        sessions: list[FakeSession] = []
+
+        def session_factory():
+            sessions.append(FakeSession(handler, log))
+            return sessions[-1]
+
+        def evaluate(job, _role, _com, _rubric):
+            # No session may be held open while the pool evaluates
+            assert not any(s.open for s in sessions)
+            if job["run_id"] == "run_app_2":
+                raise ValueError("bad evidence")
+            return [], {"proof_rate": 1.0}
+
+        with (
+            patch.object(reevaluation, "get_session_factory", lambda: session_factory),
+            patch.object(reevaluation, "evaluate_run", evaluate),
+            ThreadPoolExecutor(max_workers=2) as executor,
+        ):
+            progress = await reevaluate_role("role_1", page_size=2, executor=executor)
+
+        assert after_ids == ["", "app_2", "app_3"]
+        assert progress.processed == 3
+        assert progress.briefs_written == 2
+        assert progress.failed_run_ids == ["run_app_2"]
+        assert log.count("commit") == 2
+
+
+class TestReevaluateCommand:
+    """Tests for python -m app.workers.reevaluate."""
+
+    def _main(self, progress: ReevaluationProgress, argv: list[str]):
+        reevaluate = AsyncMock(return_value=progress)
+        with (
+            patch.object(reevaluate_worker, "reevaluate_role", reevaluate),
+            patch.object(reevaluate_worker, "dispose_engine", AsyncMock()) as dispose,
+            patch.object(reevaluate_worker, "setup_logging"),
+            patch.object(sys, "argv", ["reevaluate", *argv]),
+        ):
+            reevaluate_worker.main()
+        dispose.assert_awaited_once()
+        return reevaluate
+
+    def test_passes_options_through(self):
+        """Should re-evaluate the role with the given page size and workers."""
+        progress = ReevaluationProgress(role_id="role_1")
+        reevaluate = self._main(progress, ["role_1", "--page-size", "10", "--workers", "2"])
+
+        reevaluate.assert_awaited_once_with("role_1", page_size=10, workers=2)
+
+    def test_exits_non_zero_when_runs_failed(self):
+        """Should exit with status 1 if any run failed to re-evaluate."""
+        with pytest.raises(SystemExit) as exc:
+            self._main(ReevaluationProgress(role_id="role_1", failed=1), ["role_1"])
+
+        assert exc.value.code == 1
@@ -0,0 +1,90 @@
+"""Tests for loading a run's orchestration context."""
+
+from sqlalchemy.dialects import postgresql
+
+from app.db.models import Application, Candidate, Role, SimulationRun
+from app.services.run_context import RoleCache, load_run_context
+
+
+class ScriptedResult:
+    def __init__(self, row):
+        self.row = row
+
+    def one_or_none(self):
+        return self.row
+
+
+class ScriptedSession:
+    """Stands in for AsyncSession: answers the joined SELECT with one row."""
+
+    def __init__(self, row):
+        self.row = row
+        self.statements = []
+        self.refreshed: list[tuple[object, list[str]]] = []
+
+    async def execute(self, statement):
+        self.statements.append(statement)
+        return ScriptedResult(self.row)
+
+    async def refresh(self, instance, attribute_names):
+        self.refreshed.append((instance, attribute_names))
+
+
+def _row(com: dict | None = None):
+    role = Role(id="role_1", org_id="org_1", title="Backend Engineer", com_json=com or {"pace": "high"})
+    role.rubric_json = {"weights": {}}
+    return (
+        SimulationRun(id="run_1", application_id="app_1"),
+        Application(id="app_1", role_id="role_1", candidate_id="cand_1"),
+        role,
+        Candidate(id="cand_1", name="Sam", email="sam@example.com"),
+    )
+
+
+class TestLoadRunContext:
+    """Tests for load_run_context."""
+
+    async def test_loads_everything_in_one_joined_query(self):
+        """Should fetch run, application, role and candidate with a single SELECT."""
+        db = ScriptedSession(_row())
+
+        context = await load_run_context(db, "run_1")
+
+        assert len(db.statements) == 1
+        sql = str(db.statements[0].compile(dialect=postgresql.asyncpg.dialect()))
+        assert sql.count("JOIN") == 3
+        assert context.application.id == "app_1"
+        assert context.candidate.email == "sam@example.com"
+        assert context.com == {"pace": "high"}
+        assert db.refreshed == []
+
+    async def test_missing_records_return_none(self):
+        """Should return None when the run (or a joined record) does not exist."""
+        db = ScriptedSession(None)
+
+        assert await load_run_context(db, "run_missing") is None
+
+    async def test_cache_hit_skips_role_query(self):
+        """Should take COM and rubric from the cache without loading them."""
+        cache = RoleCache()
+        cache.put("role_1", {"pace": "low"}, {"weights": {"testing": 2}})
+        db = ScriptedSession(_row())
+
+        context = await load_run_context(db, "run_1", role_cache=cache)
+
+        assert context.com == {"pace": "low"}
+        assert context.rubric == {"weights": {"testing": 2}}
+        assert db.refreshed == []
+        sql = str(db.statements[0].compile(dialect=postgresql.asyncpg.dialect()))
+        assert "roles.com_json" not in sql
+
+    async def test_cache_miss_loads_role_once_and_fills_cache(self):
+        """Should load a deferred role's COM on a miss and remember it."""
+        cache = RoleCache()
+        cache.put("role_other", {}, {})
+        db = ScriptedSession(_row())
+
+        await load_run_context(db, "run_1", role_cache=cache)
+
+        assert [names for _, names in db.refreshed] == [["com_json", "rubric_json"]]
+        assert cache.get("role_1") == ({"pace": "high"}, {"weights": {}})
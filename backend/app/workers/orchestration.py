@@ -0,0 +1,249 @@
+"""Orchestration worker.
+
+Consumes the orchestration queue (see app/services/orchestration_queue.py)
+and runs process_completed_run for each completed simulation run, with up
+to orchestration_concurrency runs in flight. Runs in its own process so a
+burst of completions never competes with API requests:
+
+    python -m app.workers.orchestration
+
+Runs taken between two maintenance passes (POLL_TIMEOUT seconds) form a
+batch that shares one RoleCache, so a burst of completions for the same
+role decodes its COM and rubric once; an edited role is picked up by the
+next batch.
+
+Proof engine metrics for the runs this process evaluates are served in the
+Prometheus text format at GET /metrics on settings.orchestration_metrics_port.
+The listener binds to settings.orchestration_metrics_host (loopback by
+default); bound to any other address, scrapes must send the internal API key
+in the X-Internal-Key header, as the runner does.
+"""
+
+import asyncio
+import functools
+import hmac
+import ipaddress
+import signal
+
+import redis.asyncio as redis
+
+from app.config import get_settings
+from app.logging_config import get_logger, setup_logging
+from app.proof.engine import get_proof_engine
+from app.proof.metrics import CONTENT_TYPE as METRICS_CONTENT_TYPE
+from app.services.orchestration_queue import OrchestrationQueue
+from app.services.orchestrator import dispose_engine, process_completed_run
+from app.services.run_context import RoleCache
+
+logger = get_logger(__name__)
+settings = get_settings()
+
+# Seconds a worker task blocks waiting for a run before re-checking shutdown
+POLL_TIMEOUT = 5
+
+# Attempts at marking an orchestrated run done before giving up on Redis
+COMPLETE_ATTEMPTS = 5
+
+
+class OrchestrationWorker:
+    """Pulls completed runs off the queue and orchestrates them concurrently."""
+
+    def __init__(self, r: redis.Redis):
+        self.queue = OrchestrationQueue(r)
+        self.concurrency = settings.orchestration_concurrency
+        self.role_cache = RoleCache()
+        self._stopping = asyncio.Event()
+
+    async def run(self) -> None:
+        """Run until stop() is called; in-flight runs finish before returning."""
+        logger.info("Orchestration worker started", concurrency=self.concurrency)
+
+        maintenance = asyncio.create_task(self._maintenance_loop())
+        consumers = [
+            asyncio.create_task(self._consume(i)) for i in range(self.concurrency)
+        ]
+
+        await asyncio.gather(*consumers)
+        maintenance.cancel()
+
+        logger.info("Orchestration worker stopped")
+
+    def stop(self) -> None:
+        """Stop taking new runs."""
+        self._stopping.set()
+
+    async def _consume(self, slot: int) -> None:
+        while not self._stopping.is_set():
+            try:
+                taken = await self.queue.take(timeout=POLL_TIMEOUT)
+            except redis.RedisError as e:
+                logger.error("Orchestration queue unavailable", slot=slot, error=str(e))
+                await asyncio.sleep(POLL_TIMEOUT)
+                continue
+
+            if taken is None:
+                continue
+
+            run_id, payload = taken
+            await self._process(run_id, payload)
+
+    async def _process(self, run_id: str, payload: dict) -> None:
+        heartbeat = asyncio.create_task(self._keep_lease(run_id))
+        try:
+            await process_completed_run(
+                run_id=run_id,
+                metrics=payload.get("metrics", {}),
+                artifact_urls=payload.get("artifact_urls", {}),
+                artifact_hashes=payload.get("artifact_hashes", {}),
+                role_cache=self.role_cache,
+            )
+        except Exception as e:
+            heartbeat.cancel()
+            try:
+                await self.queue.fail(run_id, str(e))
+            except redis.RedisError as redis_error:
+                # The run stays in the processing list; lease recovery retries it
+                logger.error(
+                    "Could not record orchestration failure",
+                    run_id=run_id,
+                    error=str(redis_error),
+                )
+            return
+
+        heartbeat.cancel()
+        await self._complete(run_id)
+
+    async def _complete(self, run_id: str) -> None:
+        """Mark a run done, retrying through brief Redis outages.
+
+        If this never succeeds, the run is delivered again after its lease
+        expires; process_completed_run skips runs whose results are already
+        stored, so it is not orchestrated twice.
+        """
+        for attempt in range(1, COMPLETE_ATTEMPTS + 1):
+            try:
+                await self.queue.complete(run_id)
+                return
+            except redis.RedisError as e:
+                logger.error(
+                    "Could not mark run orchestrated",
+                    run_id=run_id,
+                    attempt=attempt,
+                    error=str(e),
+                )
+                if attempt < COMPLETE_ATTEMPTS:
+                    await asyncio.sleep(min(POLL_TIMEOUT, 2 ** attempt))
+
+    async def _keep_lease(self, run_id: str) -> None:
+        interval = max(1, settings.orchestration_lease_seconds // 3)
+        while True:
+            await asyncio.sleep(interval)
+            try:
+                await self.queue.extend_lease(run_id)
+            except redis.RedisError as e:
+                # Try again next interval; the lease outlives a few missed extensions
+                logger.warning("Could not extend orchestration lease", run_id=run_id, error=str(e))
+
+    async def _maintenance_loop(self) -> None:
+        """Requeue due retries and runs abandoned by crashed workers."""
+        while True:
+            # Start the next batch with a fresh view of roles
+            self.role_cache = RoleCache()
+            try:
+                await self.queue.recover()
+            except redis.RedisError as e:
+                logger.error("Orchestration queue maintenance failed", error=str(e))
+            await asyncio.sleep(POLL_TIMEOUT)
+
+
+async def _serve_metrics(
+    reader: asyncio.StreamReader,
+    writer: asyncio.StreamWriter,
+    require_key: bool = False,
+) -> None:
+    """Answer GET /metrics with the proof engine metrics; anything else is a 404."""
+    try:
+        request_line = await reader.readline()
+        headers = {}
+        # Headers; the body is ignored
+        while (line := await reader.readline()) not in (b"\r\n", b"\n", b""):
+            name, _, value = line.decode("latin-1").partition(":")
+            headers[name.strip().lower()] = value.strip()
+
+        method, _, target = request_line.decode("latin-1").partition(" ")
+        path = target.split(" ", 1)[0].split("?", 1)[0]
+
+        if method != "GET" or path != "/metrics":
+            writer.write(_metrics_response(b"404 Not Found", b"Not Found\n"))
+        elif require_key and not hmac.compare_digest(
+            headers.get("x-internal-key", "").encode(), settings.internal_api_key.encode()
+        ):
+            writer.write(_metrics_response(b"401 Unauthorized", b"Invalid internal API key\n"))
+        else:
+            body = get_proof_engine().render_metrics().encode()
+            writer.write(_metrics_response(b"200 OK", body, METRICS_CONTENT_TYPE))
+        await writer.drain()
+    except ConnectionError:
+        pass
+    finally:
+        writer.close()
+
+
+def _metrics_response(status: bytes, body: bytes, content_type: str = "text/plain") -> bytes:
+    return (
+        b"HTTP/1.1 " + status + b"\r\n"
+        + f"Content-Type: {content_type}\r\n".encode()
+        + f"Content-Length: {len(body)}\r\n".encode()
+        + b"Connection: close\r\n\r\n"
+        + body
+    )
+
+
+def _is_loopback(host: str) -> bool:
+    if host == "localhost":
+        return True
+    try:
+        return ipaddress.ip_address(host).is_loopback
+    except ValueError:
+        return False
+
+
+async def _main() -> None:
+    r = redis.from_url(settings.redis_url)
+    worker = OrchestrationWorker(r)
+
+    metrics_server = None
+    if settings.orchestration_metrics_port:
+        host = settings.orchestration_metrics_host
+        metrics_server = await asyncio.start_server(
+            functools.partial(_serve_metrics, require_key=not _is_loopback(host)),
+            host=host,
+            port=settings.orchestration_metrics_port,
+        )
+        logger.info(
+            "Metrics listener started",
+            host=host,
+            port=settings.orchestration_metrics_port,
+        )
+
+    loop = asyncio.get_running_loop()
+    for sig in (signal.SIGTERM, signal.SIGINT):
+        loop.add_signal_handler(sig, worker.stop)
+
+    try:
+        await worker.run()
+    finally:
+        if metrics_server is not None:
+            metrics_server.close()
+        await r.close()
+        await dispose_engine()
+
+
+def main() -> None:
+    """Entry point."""
+    setup_logging(debug=settings.debug)
+    asyncio.run(_main())
+
+
+if __name__ == "__main__":
+    main()
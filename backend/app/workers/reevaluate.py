@@ -0,0 +1,42 @@
+"""Re-evaluate all runs of a role after its COM or rubric changed.
+
+    python -m app.workers.reevaluate <role_id> [--page-size N] [--workers N]
+
+Writes new claims and a new brief version per application; see
+app/services/reevaluation.py.
+"""
+
+import argparse
+import asyncio
+
+from app.config import get_settings
+from app.logging_config import setup_logging
+from app.services.orchestrator import dispose_engine
+from app.services.reevaluation import ReevaluationProgress, reevaluate_role
+
+settings = get_settings()
+
+
+async def _main(role_id: str, page_size: int | None, workers: int | None) -> ReevaluationProgress:
+    try:
+        return await reevaluate_role(role_id, page_size=page_size, workers=workers)
+    finally:
+        await dispose_engine()
+
+
+def main() -> None:
+    """Entry point."""
+    parser = argparse.ArgumentParser(description="Re-evaluate all runs of a role")
+    parser.add_argument("role_id")
+    parser.add_argument("--page-size", type=int, default=None)
+    parser.add_argument("--workers", type=int, default=None)
+    args = parser.parse_args()
+
+    setup_logging(debug=settings.debug)
+    progress = asyncio.run(_main(args.role_id, args.page_size, args.workers))
+    if progress.failed:
+        raise SystemExit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,5 @@
+"""Performance benchmarks.
+
+Run from the backend directory, e.g. python -m benchmarks.orchestrator_db.
+Benchmarks that need Postgres or Redis use the same settings as the app.
+"""
@@ -0,0 +1,111 @@
+"""Concurrent artifact downloads through the API: per-request boto3 vs AsyncArtifactStore.
+
+Serves the same objects from two endpoints of an in-process FastAPI app,
+one as download_artifact used to (a new boto3 client per request and
+get_object on the event loop) and one through AsyncArtifactStore, and
+fires N concurrent downloads at each through httpx. While they run, a
+trivial endpoint is polled to show how long the event loop stays blocked.
+Needs the S3 / MinIO at S3_ENDPOINT_URL:
+
+    python -m benchmarks.artifact_downloads --downloads 200 --size-kb 512
+"""
+
+import argparse
+import asyncio
+import logging
+import os
+import statistics
+import time
+
+import boto3
+import httpx
+import structlog
+from fastapi import FastAPI
+from fastapi.responses import StreamingResponse
+
+structlog.configure(wrapper_class=structlog.make_filtering_bound_logger(logging.WARNING))
+
+from app.config import get_settings  # noqa: E402
+from app.evidence.store import AsyncArtifactStore, get_artifact_store  # noqa: E402
+
+settings = get_settings()
+OBJECTS = 20
+
+
+def build_app(store: AsyncArtifactStore) -> FastAPI:
+    app = FastAPI()
+
+    @app.get("/legacy/{key:path}")
+    async def legacy(key: str):
+        s3 = boto3.client(
+            "s3",
+            endpoint_url=settings.s3_endpoint_url,
+            aws_access_key_id=settings.s3_access_key,
+            aws_secret_access_key=settings.s3_secret_key,
+            region_name=settings.s3_region,
+        )
+        response = s3.get_object(Bucket=settings.s3_bucket, Key=key)
+        return StreamingResponse(response["Body"], media_type="application/octet-stream")
+
+    @app.get("/store/{key:path}")
+    async def store_download(key: str):
+        body = await store.open_artifact(key)
+        return StreamingResponse(store.iter_artifact(body), media_type="application/octet-stream")
+
+    @app.get("/ping")
+    async def ping():
+        return {}
+
+    return app
+
+
+async def bench(name: str, client: httpx.AsyncClient, downloads: int, size: int) -> None:
+    done = asyncio.Event()
+    ping_ms: list[float] = []
+
+    async def download(i: int) -> None:
+        response = await client.get(f"/{name}/runs/bench/artifact-{i % OBJECTS}")
+        assert len(response.content) == size
+
+    async def poll() -> None:
+        while not done.is_set():
+            start = time.perf_counter()
+            await client.get("/ping")
+            ping_ms.append((time.perf_counter() - start) * 1000)
+            await asyncio.sleep(0.005)
+
+    poller = asyncio.create_task(poll())
+    start = time.perf_counter()
+    try:
+        await asyncio.gather(*(download(i) for i in range(downloads)))
+    finally:
+        elapsed = time.perf_counter() - start
+        done.set()
+        await poller
+
+    print(
+        f"{name:<7} total={elapsed * 1000:8.1f}ms per_download={elapsed / downloads * 1000:6.2f}ms "
+        f"ping_p50={statistics.median(ping_ms):6.1f}ms ping_max={max(ping_ms):7.1f}ms"
+    )
+
+
+async def main(downloads: int, size_kb: int) -> None:
+    sync_store = get_artifact_store()
+    size = size_kb * 1024
+    for i in range(OBJECTS):
+        sync_store.upload_artifact("bench", f"artifact-{i}", os.urandom(size))
+
+    store = AsyncArtifactStore(sync_store)
+    transport = httpx.ASGITransport(app=build_app(store))
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        await bench("legacy", client, downloads, size)
+        await bench("store", client, downloads, size)
+    store.close()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--downloads", type=int, default=200)
+    parser.add_argument("--size-kb", type=int, default=512)
+    args = parser.parse_args()
+    asyncio.run(main(args.downloads, args.size_kb))
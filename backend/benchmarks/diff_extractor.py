@@ -0,0 +1,135 @@
+"""Diff extraction: split + per-pattern re calls vs the single-pass scanner.
+
+Builds a synthetic diff of the requested size (mostly a vendored JS bundle,
+plus source and test files) and extracts it with the previous
+implementation (split("\\n"), uncompiled re.match/re.search per pattern and
+line), with DiffExtractor.extract on the string, and with
+DiffExtractor.extract_stream on a byte stream. No database needed:
+
+    python -m benchmarks.diff_extractor --size-mb 10
+"""
+
+import argparse
+import io
+import logging
+import re
+import time
+from collections.abc import Callable
+
+import structlog
+
+structlog.configure(wrapper_class=structlog.make_filtering_bound_logger(logging.WARNING))
+
+from app.evidence.extractors.diff_extractor import DiffExtractor  # noqa: E402
+
+LEGACY_TEST_FILE_PATTERNS = [
+    r"test_.*\.py$",
+    r".*_test\.py$",
+    r"tests/.*\.py$",
+    r".*\.test\.(js|ts|tsx)$",
+    r".*\.spec\.(js|ts|tsx)$",
+    r"__tests__/.*\.(js|ts|tsx)$",
+]
+LEGACY_TEST_FUNCTION_PATTERNS = [
+    r"^\+\s*def test_",
+    r"^\+\s*async def test_",
+    r"^\+\s*it\(",
+    r"^\+\s*test\(",
+    r"^\+\s*describe\(",
+]
+LEGACY_SKIP_PATTERNS = [
+    r"^\+.*@pytest\.mark\.skip",
+    r"^\+.*@unittest\.skip",
+    r"^\+.*\.skip\(",
+    r"^\+.*xfail",
+]
+
+
+def legacy_extract(diff_content: str) -> tuple[int, int, int, int]:
+    """The extractor as it was before the single-pass rewrite."""
+    files_changed = []
+    lines_added = lines_removed = tests_added_count = skipped_tests_added = 0
+    for line in diff_content.split("\n"):
+        if line.startswith("diff --git"):
+            match = re.search(r"b/(.+)$", line)
+            if match:
+                files_changed.append(match.group(1))
+                any(re.search(p, match.group(1)) for p in LEGACY_TEST_FILE_PATTERNS)
+        elif line.startswith("+") and not line.startswith("+++"):
+            lines_added += 1
+            if any(re.match(p, line) for p in LEGACY_TEST_FUNCTION_PATTERNS):
+                tests_added_count += 1
+            if any(re.search(p, line) for p in LEGACY_SKIP_PATTERNS):
+                skipped_tests_added += 1
+        elif line.startswith("-") and not line.startswith("---"):
+            lines_removed += 1
+    return lines_added, lines_removed, tests_added_count, skipped_tests_added
+
+
+def build_diff(size_bytes: int) -> str:
+    parts = []
+    size = 0
+    index = 0
+    while size < size_bytes:
+        if index % 10 == 0:
+            path = f"tests/test_module_{index}.py"
+            body = [
+                "+@pytest.mark.skip(reason='flaky')\n" if index % 30 == 0 else "",
+                f"+def test_case_{index}():\n",
+                "+    result = module.process(payload)\n",
+                "+    assert result.status == 'ok'\n",
+            ] * 20
+        elif index % 10 == 1:
+            path = f"vendor/bundle_{index}.min.js"
+            body = [f"+var a{i}=function(b,c){{return b+c*{i}}};\n" for i in range(400)]
+        else:
+            path = f"app/module_{index}.py"
+            body = ["-    return old_value\n", "+    return compute(new_value)\n", "     context\n"] * 40
+        header = (
+            f"diff --git a/{path} b/{path}\n"
+            "index 1234567..89abcde 100644\n"
+            f"--- a/{path}\n+++ b/{path}\n@@ -1,40 +1,80 @@\n"
+        )
+        chunk = header + "".join(body)
+        parts.append(chunk)
+        size += len(chunk)
+        index += 1
+    return "".join(parts)
+
+
+def bench(name: str, fn: Callable[[], object], size_mb: float) -> None:
+    start = time.perf_counter()
+    fn()
+    elapsed = time.perf_counter() - start
+    print(f"{name:<16} total={elapsed * 1000:8.1f}ms throughput={size_mb / elapsed:6.1f}MB/s")
+
+
+def main(size_mb: float) -> None:
+    diff = build_diff(int(size_mb * 1024 * 1024))
+    encoded = diff.encode()
+    extractor = DiffExtractor()
+
+    metrics = extractor.extract(diff)
+    legacy = legacy_extract(diff)
+    current = (
+        metrics.lines_added,
+        metrics.lines_removed,
+        metrics.tests_added_count,
+        metrics.skipped_tests_added,
+    )
+    assert legacy == current, (legacy, current)
+    print(
+        f"diff: {len(encoded) / 1e6:.1f}MB, {len(metrics.files_changed)} files, "
+        f"{metrics.lines_added} lines added"
+    )
+
+    bench("legacy", lambda: legacy_extract(diff), size_mb)
+    bench("extract", lambda: extractor.extract(diff), size_mb)
+    bench("extract_stream", lambda: extractor.extract_stream(io.BytesIO(encoded)), size_mb)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--size-mb", type=float, default=10.0)
+    args = parser.parse_args()
+    main(args.size_mb)
@@ -0,0 +1,77 @@
+"""Per-run database overhead of the orchestrator at N concurrent completions.
+
+Compares the old behaviour (a new engine per run, disposed afterwards) with
+the shared orchestrator pool. Each simulated run opens a session and issues
+the same number of round trips as the orchestrator's lookups. Needs the
+Postgres at DATABASE_URL:
+
+    python -m benchmarks.orchestrator_db --runs 100
+"""
+
+import argparse
+import asyncio
+import statistics
+import time
+from collections.abc import Awaitable, Callable
+
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+
+from app.db.session import database_url
+from app.services.orchestrator import dispose_engine, get_session_factory
+
+# Lookups per run in process_completed_run (run, application, role, candidate)
+QUERIES_PER_RUN = 4
+
+
+async def _queries(db: AsyncSession) -> None:
+    for _ in range(QUERIES_PER_RUN):
+        await db.execute(text("SELECT 1"))
+
+
+async def per_run_engine() -> None:
+    engine = create_async_engine(database_url)
+    try:
+        async with async_sessionmaker(engine, class_=AsyncSession)() as db:
+            await _queries(db)
+    finally:
+        await engine.dispose()
+
+
+async def shared_pool() -> None:
+    async with get_session_factory()() as db:
+        await _queries(db)
+
+
+async def _timed(run: Callable[[], Awaitable[None]]) -> float:
+    start = time.perf_counter()
+    await run()
+    return time.perf_counter() - start
+
+
+async def bench(name: str, run: Callable[[], Awaitable[None]], runs: int) -> None:
+    start = time.perf_counter()
+    latencies = sorted(await asyncio.gather(*(_timed(run) for _ in range(runs))))
+    wall = time.perf_counter() - start
+
+    p95 = latencies[int(len(latencies) * 0.95) - 1]
+    print(
+        f"{name:<16} runs={runs} wall={wall * 1000:8.1f}ms "
+        f"mean={statistics.mean(latencies) * 1000:7.1f}ms p95={p95 * 1000:7.1f}ms"
+    )
+
+
+async def main(runs: int) -> None:
+    await bench("per_run_engine", per_run_engine, runs)
+
+    # Warm the pool once, as a long-running worker would be
+    await shared_pool()
+    await bench("shared_pool", shared_pool, runs)
+    await dispose_engine()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--runs", type=int, default=100, help="Concurrent completions")
+    args = parser.parse_args()
+    asyncio.run(main(args.runs))
@@ -0,0 +1,103 @@
+"""Cost of persisting a run's metrics, artifacts and claims.
+
+Compares per-object session.add() + flush() with bulk_insert for runs
+emitting 10, 100 and 1000 metrics (plus 5 artifacts and one claim per 10
+metrics). Each measurement runs in a transaction that is rolled back, with
+foreign key triggers disabled, so no fixture rows are needed. Needs the
+Postgres at DATABASE_URL with a superuser role (the docker-compose default):
+
+    python -m benchmarks.orchestrator_persistence
+"""
+
+import argparse
+import asyncio
+import statistics
+import time
+from collections.abc import Awaitable, Callable
+
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.ids import generate_id
+from app.db.bulk import bulk_insert
+from app.db.models import Artifact, ArtifactType, Claim, ClaimStatus, Metric
+from app.services.orchestrator import dispose_engine, get_session_factory
+
+
+def build_records(metric_count: int) -> tuple[list[Metric], list[Artifact], list[Claim]]:
+    run_id = generate_id()
+    application_id = generate_id()
+
+    metrics = [
+        Metric(simulation_run_id=run_id, name=f"metric_{i}", value_float=float(i))
+        for i in range(metric_count)
+    ]
+    artifacts = [
+        Artifact(
+            simulation_run_id=run_id,
+            type=ArtifactType.METRICS_JSON,
+            s3_key=f"runs/{run_id}/artifact_{i}",
+            sha256="0" * 64,
+            metadata_json={"filename": f"artifact_{i}"},
+        )
+        for i in range(5)
+    ]
+    claims = [
+        Claim(
+            application_id=application_id,
+            claim_type="benchmark",
+            claim_json={"statement": f"claim {i}"},
+            status=ClaimStatus.PROVED,
+            evidence_refs_json={"refs": [], "reason": "benchmark"},
+            rule_id="benchmark",
+        )
+        for i in range(max(1, metric_count // 10))
+    ]
+    return metrics, artifacts, claims
+
+
+async def orm_add(db: AsyncSession, records: tuple[list, list, list]) -> None:
+    for group in records:
+        for record in group:
+            db.add(record)
+        await db.flush()
+
+
+async def bulk(db: AsyncSession, records: tuple[list, list, list]) -> None:
+    for group in records:
+        await bulk_insert(db, group)
+
+
+async def measure(
+    persist: Callable[[AsyncSession, tuple[list, list, list]], Awaitable[None]],
+    metric_count: int,
+) -> float:
+    records = build_records(metric_count)
+    async with get_session_factory()() as db:
+        await db.execute(text("SET LOCAL session_replication_role = replica"))
+        start = time.perf_counter()
+        await persist(db, records)
+        elapsed = time.perf_counter() - start
+        await db.rollback()
+    return elapsed
+
+
+async def main(sizes: list[int], repeat: int) -> None:
+    for metric_count in sizes:
+        for name, persist in (("orm_add", orm_add), ("bulk_insert", bulk)):
+            await measure(persist, metric_count)  # warm up
+            timings = [await measure(persist, metric_count) for _ in range(repeat)]
+            print(
+                f"metrics={metric_count:<5} {name:<12} "
+                f"median={statistics.median(timings) * 1000:8.2f}ms"
+            )
+
+    await dispose_engine()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10, 100, 1000])
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+    asyncio.run(main(args.sizes, args.repeat))
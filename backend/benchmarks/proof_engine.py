@@ -0,0 +1,98 @@
+"""Proof engine: per-claim evidence conversion vs one evidence context per run.
+
+Evaluates every registered claim type for a batch of synthetic runs three
+ways: evaluate_claim per claim (evidence re-indexed for each claim),
+evaluate_all per run (indexed once per run) and evaluate_batch over all
+runs. No database needed:
+
+    python -m benchmarks.proof_engine --runs 1000 --metrics 200
+"""
+
+import argparse
+import logging
+import time
+from collections.abc import Callable
+
+import structlog
+
+# Rule outcomes are logged per claim; keep them out of the measurement
+structlog.configure(wrapper_class=structlog.make_filtering_bound_logger(logging.WARNING))
+
+from app.db.models import Artifact, ArtifactType, Metric  # noqa: E402
+from app.hypothesis.claim_schema import Claim, ClaimSubject  # noqa: E402
+from app.proof.context import EvidenceContext  # noqa: E402
+from app.proof.engine import get_proof_engine  # noqa: E402
+
+COM = {"pace": "medium", "quality_bar": "medium"}
+
+
+def build_run(metric_count: int) -> tuple[list[Claim], list[Metric], list[Artifact]]:
+    metrics = [
+        Metric(name="tests_passed", value_bool=True),
+        Metric(name="test_added", value_bool=False),
+        Metric(name="time_to_green_seconds", value_float=900.0),
+        Metric(name="tests_added_count", value_float=2.0),
+        Metric(name="coverage_delta", value_float=3.5),
+        Metric(name="failed_tests_count", value_float=0.0),
+        Metric(name="total_tests", value_float=40.0),
+    ]
+    metrics += [Metric(name=f"extra_{i}", value_float=float(i)) for i in range(metric_count)]
+    artifacts = [
+        Artifact(id=f"artifact_{t.value}", type=t, s3_key=f"runs/x/{t.value}", sha256="0" * 64)
+        for t in (ArtifactType.DIFF, ArtifactType.TEST_LOG, ArtifactType.COVERAGE)
+    ]
+
+    subject = ClaimSubject(candidate_id="cand", application_id="app")
+    claims = [
+        Claim(
+            claim_type=claim_type,
+            subject=subject,
+            statement=claim_type,
+            dimensions=[],
+            confidence=0.8,
+            evidence_requirements=[],
+        )
+        for claim_type in get_proof_engine()._rules
+    ]
+    return claims, metrics, artifacts
+
+
+def bench(name: str, fn: Callable[[], object], claim_count: int) -> None:
+    start = time.perf_counter()
+    fn()
+    elapsed = time.perf_counter() - start
+    print(f"{name:<16} total={elapsed * 1000:9.1f}ms per_claim={elapsed / claim_count * 1e6:8.1f}us")
+
+
+def main(run_count: int, metric_count: int) -> None:
+    engine = get_proof_engine()
+    runs = [build_run(metric_count) for _ in range(run_count)]
+    claim_count = sum(len(claims) for claims, _, _ in runs)
+
+    def per_claim() -> None:
+        for claims, metrics, artifacts in runs:
+            for claim in claims:
+                engine.evaluate_claim(claim, metrics, artifacts, None, COM)
+
+    def per_run() -> None:
+        for claims, metrics, artifacts in runs:
+            engine.evaluate_all(claims, metrics, artifacts, None, COM)
+
+    def batch() -> None:
+        engine.evaluate_batch([
+            (claims, EvidenceContext.build(metrics, artifacts, None, COM))
+            for claims, metrics, artifacts in runs
+        ])
+
+    print(f"runs={run_count} metrics_per_run={metric_count + 7} claims={claim_count}")
+    bench("per_claim", per_claim, claim_count)
+    bench("evaluate_all", per_run, claim_count)
+    bench("evaluate_batch", batch, claim_count)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--runs", type=int, default=1000)
+    parser.add_argument("--metrics", type=int, default=200, help="Extra metrics per run")
+    args = parser.parse_args()
+    main(args.runs, args.metrics)
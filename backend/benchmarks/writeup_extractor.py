@@ -0,0 +1,126 @@
+"""Writeup extraction: per-line/per-prompt rescans vs the single-pass extractor.
+
+Builds synthetic markdown writeups of the requested size and extracts them
+with the previous implementation (nine re.match calls per line, a
+lowercase copy and rescan per prompt and content type) and with
+WriteupExtractor, checking both give the same result. No database needed:
+
+    python -m benchmarks.writeup_extractor --size-kb 50 --count 200
+"""
+
+import argparse
+import logging
+import random
+import re
+import time
+from collections.abc import Callable
+
+import structlog
+
+structlog.configure(wrapper_class=structlog.make_filtering_bound_logger(logging.WARNING))
+
+from app.evidence.extractors.writeup_extractor import WriteupExtractor  # noqa: E402
+
+CONTENT_KEYWORDS = WriteupExtractor.CONTENT_KEYWORDS
+
+
+def legacy_extract(text: str) -> tuple:
+    """The extractor as it was before the single-pass rewrite."""
+    sections: dict[str, str] = {}
+    current_section = None
+    current_content: list[str] = []
+    for line in text.split("\n"):
+        is_header = False
+        for pattern, section_name in WriteupExtractor.SECTION_PATTERNS:
+            if re.match(pattern, line, re.IGNORECASE):
+                if current_section:
+                    sections[current_section] = "\n".join(current_content).strip()
+                current_section = section_name
+                current_content = []
+                is_header = True
+                break
+        if not is_header and current_section:
+            current_content.append(line)
+    if current_section:
+        sections[current_section] = "\n".join(current_content).strip()
+
+    answered = []
+    text_lower = text.lower()
+    for prompt in WriteupExtractor.EXPECTED_PROMPTS:
+        if prompt in text_lower:
+            idx = text_lower.find(prompt)
+            if len(text_lower[idx : idx + 200].split()) >= 10:
+                answered.append(prompt)
+    for section, prompt in WriteupExtractor.SECTION_PROMPTS.items():
+        if section in sections and len(sections[section]) > 50 and prompt not in answered:
+            answered.append(prompt)
+
+    flags = []
+    for content_type in ("root_cause", "tradeoffs", "monitoring"):
+        if content_type in sections:
+            flags.append(len(sections[content_type]) > 50)
+        else:
+            lowered = text.lower()
+            flags.append(any(kw in lowered for kw in CONTENT_KEYWORDS[content_type]))
+
+    return len(text.split()), answered, sections, *flags
+
+
+HEADERS = [
+    "## Summary", "## Root Cause", "## What was the bug?", "## The Fix", "## Changes",
+    "## Tradeoffs", "## Alternatives", "## Monitoring", "## How to detect", "## Testing",
+    "### Notes", "## Appendix",
+]
+WORDS = [
+    "the", "request", "handler", "retries", "the", "upstream", "call", "when", "the", "connection",
+    "pool", "is", "exhausted", "so", "latency", "spikes", "under", "load", "and", "we", "observed",
+    "timeouts", "because", "of", "the", "missing", "backoff", "instead", "of", "failing", "fast",
+    "I", "considered", "a", "circuit", "breaker", "alternatively", "a", "bounded", "queue", "we",
+    "should", "alert", "on", "the", "error", "rate", "and", "log", "every", "rejected", "request",
+    "with", "its", "metric",
+]
+
+
+def build_writeup(size_bytes: int, rng: random.Random) -> str:
+    parts = []
+    size = 0
+    while size < size_bytes:
+        if rng.random() < 0.08:
+            line = rng.choice(HEADERS)
+        else:
+            line = " ".join(rng.choice(WORDS) for _ in range(rng.randint(5, 20)))
+        parts.append(line)
+        size += len(line) + 1
+    return "\n".join(parts)
+
+
+def bench(name: str, fn: Callable[[], object], count: int) -> None:
+    start = time.perf_counter()
+    fn()
+    elapsed = time.perf_counter() - start
+    print(f"{name:<8} total={elapsed * 1000:8.1f}ms per_writeup={elapsed / count * 1000:7.2f}ms")
+
+
+def main(size_kb: int, count: int) -> None:
+    rng = random.Random(0)
+    writeups = [build_writeup(size_kb * 1024, rng) for _ in range(count)]
+    extractor = WriteupExtractor()
+
+    for text in writeups:
+        m = extractor.extract(text)
+        current = (
+            m.word_count, m.prompts_answered, m.sections,
+            m.has_root_cause, m.has_tradeoffs, m.has_monitoring,
+        )
+        assert current == legacy_extract(text)
+
+    bench("legacy", lambda: [legacy_extract(t) for t in writeups], count)
+    bench("extract", lambda: [extractor.extract(t) for t in writeups], count)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--size-kb", type=int, default=50)
+    parser.add_argument("--count", type=int, default=200)
+    args = parser.parse_args()
+    main(args.size_kb, args.count)
@@ -12,29 +12,44 @@ class RunnerConfig:
     redis_url: str
     job_queue: str = "proofhire:jobs"
     poll_timeout: int = 5
+    reliable_queue: bool = False  # LMOVE + ack with redelivery of stale jobs
+    visibility_timeout: int = 60  # Seconds without heartbeat before a worker's jobs are redelivered
+    max_deliveries: int = 3  # Deliveries before a job is dead-lettered
 
     # S3/MinIO
     s3_endpoint: str = ""
     s3_bucket: str = "proofhire-artifacts"
     s3_access_key: str = ""
     s3_secret_key: str = ""
+    upload_concurrency: int = 8  # Parallel artifact uploads shared by all slots
+    multipart_threshold_mb: int = 8  # Artifacts above this size use multipart upload
 
     # Backend API (for callbacks)
     backend_url: str = "http://backend:8000"
     backend_api_key: str = ""
+    notify_batch_size: int = 20  # Max completions per batch callback (1 = never batch)
+    notify_max_backoff: int = 300  # Cap in seconds for callback retry backoff
+    notify_claim_timeout: int = 120  # Claimed callbacks not acked by then are sent again
 
     # Sandbox settings
     sandbox_image: str = "proofhire-sandbox:latest"
+    prebake_images: bool = True  # Build per-simulation images with requirements installed
     sandbox_timeout: int = 600  # 10 minutes
     sandbox_memory_limit: str = "512m"
     sandbox_cpu_limit: float = 1.0
     sandbox_network_disabled: bool = True
+    warm_pool_size: int = 0  # Paused containers kept per simulation (0 = disabled)
+    grader_evidence: bool = True  # Grader writes evidence.json so the backend skips re-parsing
 
-    # Worker identity
+    # Worker identity and concurrency
     worker_id: str = ""
+    worker_slots: int = 1  # Max jobs executed concurrently by this worker
+    host_cpu_budget: float = 0.0  # CPUs available to sandboxes (0 = all host CPUs)
+    host_memory_budget: str = ""  # Memory available to sandboxes ("" = all host memory)
 
     # Simulation repos path
     sims_path: str = "/app/sims"
+    template_cache_path: str = "/tmp/proofhire-templates"  # Read-only template snapshots
 
     @classmethod
     def from_env(cls) -> "RunnerConfig":
@@ -43,17 +58,60 @@ class RunnerConfig:
             redis_url=os.getenv("REDIS_URL", "redis://localhost:6379/0"),
             job_queue=os.getenv("JOB_QUEUE", "proofhire:jobs"),
             poll_timeout=int(os.getenv("POLL_TIMEOUT", "5")),
+            reliable_queue=os.getenv("RELIABLE_QUEUE", "false").lower() == "true",
+            visibility_timeout=int(os.getenv("VISIBILITY_TIMEOUT", "60")),
+            max_deliveries=int(os.getenv("MAX_DELIVERIES", "3")),
             s3_endpoint=os.getenv("S3_ENDPOINT", "http://minio:9000"),
             s3_bucket=os.getenv("S3_BUCKET", "proofhire-artifacts"),
             s3_access_key=os.getenv("S3_ACCESS_KEY", "minioadmin"),
             s3_secret_key=os.getenv("S3_SECRET_KEY", "minioadmin"),
+            upload_concurrency=int(os.getenv("UPLOAD_CONCURRENCY", "8")),
+            multipart_threshold_mb=int(os.getenv("MULTIPART_THRESHOLD_MB", "8")),
             backend_url=os.getenv("BACKEND_URL", "http://backend:8000"),
             backend_api_key=os.getenv("BACKEND_API_KEY", ""),
+            notify_batch_size=int(os.getenv("NOTIFY_BATCH_SIZE", "20")),
+            notify_max_backoff=int(os.getenv("NOTIFY_MAX_BACKOFF", "300")),
+            notify_claim_timeout=int(os.getenv("NOTIFY_CLAIM_TIMEOUT", "120")),
             sandbox_image=os.getenv("SANDBOX_IMAGE", "proofhire-sandbox:latest"),
+            prebake_images=os.getenv("PREBAKE_IMAGES", "true").lower() == "true",
             sandbox_timeout=int(os.getenv("SANDBOX_TIMEOUT", "600")),
             sandbox_memory_limit=os.getenv("SANDBOX_MEMORY_LIMIT", "512m"),
             sandbox_cpu_limit=float(os.getenv("SANDBOX_CPU_LIMIT", "1.0")),
             sandbox_network_disabled=os.getenv("SANDBOX_NETWORK_DISABLED", "true").lower() == "true",
+            warm_pool_size=int(os.getenv("WARM_POOL_SIZE", "0")),
+            grader_evidence=os.getenv("GRADER_EVIDENCE", "true").lower() == "true",
             worker_id=os.getenv("WORKER_ID", f"worker-{os.getpid()}"),
+            worker_slots=int(os.getenv("WORKER_SLOTS", "1")),
+            host_cpu_budget=float(os.getenv("HOST_CPU_BUDGET", "0")),
+            host_memory_budget=os.getenv("HOST_MEMORY_BUDGET", ""),
             sims_path=os.getenv("SIMS_PATH", "/app/sims"),
+            template_cache_path=os.getenv("TEMPLATE_CACHE_PATH", "/tmp/proofhire-templates"),
         )
+
+    @property
+    def effective_slots(self) -> int:
+        """Number of concurrent sandboxes that fit within the host budgets.
+
+        Each sandbox reserves sandbox_cpu_limit CPUs and sandbox_memory_limit
+        memory, so worker_slots is capped by how many of those fit.
+        """
+        cpu_budget = self.host_cpu_budget or float(os.cpu_count() or 1)
+        memory_budget = (
+            parse_memory(self.host_memory_budget)
+            if self.host_memory_budget
+            else os.sysconf("SC_PAGE_SIZE") * os.sysconf("SC_PHYS_PAGES")
+        )
+
+        by_cpu = int(cpu_budget // self.sandbox_cpu_limit) if self.sandbox_cpu_limit > 0 else self.worker_slots
+        by_memory = memory_budget // parse_memory(self.sandbox_memory_limit)
+
+        return max(1, min(self.worker_slots, by_cpu, by_memory))
+
+
+def parse_memory(value: str) -> int:
+    """Parse a Docker-style memory size ("512m", "2g", "1024") into bytes."""
+    units = {"b": 1, "k": 1024, "m": 1024**2, "g": 1024**3}
+    value = value.strip().lower()
+    if value and value[-1] in units:
+        return int(float(value[:-1]) * units[value[-1]])
+    return int(value)
@@ -0,0 +1,209 @@
+"""Warm pool of pre-created sandbox containers.
+
+Creating a container from the sandbox image dominates the latency of short
+simulations. The pool keeps a few containers per simulation already created,
+started and paused, each with its own empty workspace directory bind-mounted
+at /workspace and the current template snapshot (see template_cache) at /sim. A run takes one container, writes the submission into its
+workspace and execs the grader inside it.
+
+Isolation guarantees are unchanged from cold containers:
+- Each container is used for exactly one run and then destroyed
+- Resource limits and network isolation are applied at creation time
+- Replacement containers are created in the background
+"""
+
+import queue
+import shutil
+import tempfile
+import threading
+from collections.abc import Callable
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from pathlib import Path
+
+import docker
+import structlog
+
+from runner.config import RunnerConfig
+from runner.template_cache import TemplateCache
+
+logger = structlog.get_logger(__name__)
+
+
+@dataclass
+class WarmContainer:
+    """A paused sandbox container reserved for a single run."""
+
+    container: docker.models.containers.Container
+    workspace: Path
+    simulation_id: str
+    template: Path
+    image: str
+
+
+class ContainerPool:
+    """Keeps paused sandbox containers ready for each simulation."""
+
+    def __init__(
+        self,
+        config: RunnerConfig,
+        docker_client: docker.DockerClient,
+        templates: TemplateCache,
+        image_for: Callable[[str, Path], str],
+    ):
+        self.config = config
+        self.docker_client = docker_client
+        self.templates = templates
+        self.image_for = image_for
+        self._pools: dict[str, queue.Queue[WarmContainer]] = {}
+        self._lock = threading.Lock()
+        self._executor = ThreadPoolExecutor(
+            max_workers=2,
+            thread_name_prefix="container-pool",
+        )
+        self._closed = False
+
+    def start(self) -> None:
+        """Pre-warm containers for every simulation found in sims_path."""
+        sims_root = Path(self.config.sims_path)
+        if not sims_root.exists():
+            logger.warning("Sims path not found, pool not warmed", sims_path=str(sims_root))
+            return
+
+        for sim_dir in sorted(p for p in sims_root.iterdir() if p.is_dir()):
+            self._get_pool(sim_dir.name)
+            for _ in range(self.config.warm_pool_size):
+                self._executor.submit(self._replenish, sim_dir.name)
+
+        logger.info(
+            "Container pool warming",
+            simulations=list(self._pools),
+            size_per_simulation=self.config.warm_pool_size,
+        )
+
+    def acquire(self, simulation_id: str, template: Path, image: str) -> WarmContainer | None:
+        """Take a warm container for a simulation.
+
+        Containers built against an older template version or a different
+        image (e.g. before the pre-baked image was ready) are discarded.
+        Returns None if no container is ready; the caller should fall back
+        to creating a container directly. A replacement is always scheduled.
+        """
+        if self._closed:
+            return None
+
+        pool = self._get_pool(simulation_id)
+        warm = None
+        while warm is None:
+            try:
+                warm = pool.get_nowait()
+            except queue.Empty:
+                break
+            if warm.template != template or warm.image != image:
+                self.discard(warm)
+                warm = None
+
+        self._executor.submit(self._replenish, simulation_id)
+
+        if warm is None:
+            logger.info("Container pool empty", simulation_id=simulation_id)
+            return None
+
+        try:
+            warm.container.unpause()
+        except docker.errors.APIError as e:
+            logger.warning("Failed to unpause warm container", error=str(e))
+            self.discard(warm)
+            return None
+
+        return warm
+
+    def discard(self, warm: WarmContainer) -> None:
+        """Destroy a used container and its workspace in the background."""
+        if self._closed:
+            self._destroy(warm)
+        else:
+            self._executor.submit(self._destroy, warm)
+
+    def shutdown(self) -> None:
+        """Stop replenishing and destroy all idle containers."""
+        self._closed = True
+        self._executor.shutdown(wait=True, cancel_futures=True)
+
+        for pool in self._pools.values():
+            while True:
+                try:
+                    self._destroy(pool.get_nowait())
+                except queue.Empty:
+                    break
+
+        logger.info("Container pool shut down")
+
+    def _get_pool(self, simulation_id: str) -> queue.Queue[WarmContainer]:
+        with self._lock:
+            if simulation_id not in self._pools:
+                self._pools[simulation_id] = queue.Queue()
+            return self._pools[simulation_id]
+
+    def _replenish(self, simulation_id: str) -> None:
+        """Create containers until the pool is back to its target size."""
+        pool = self._get_pool(simulation_id)
+        if self._closed or pool.qsize() >= self.config.warm_pool_size:
+            return
+
+        try:
+            warm = self._create(simulation_id)
+        except Exception as e:
+            logger.error("Failed to create warm container", simulation_id=simulation_id, error=str(e))
+            return
+
+        # Another replenish may have filled the pool while we were creating
+        if self._closed or pool.qsize() >= self.config.warm_pool_size:
+            self._destroy(warm)
+            return
+
+        pool.put(warm)
+        logger.debug("Warm container ready", simulation_id=simulation_id, pool_size=pool.qsize())
+
+    def _create(self, simulation_id: str) -> WarmContainer:
+        """Create, start and pause a container with an empty workspace."""
+        template = self.templates.get(simulation_id)
+        image = self.image_for(simulation_id, template)
+        workspace = Path(tempfile.mkdtemp(prefix=f"proofhire-warm-{simulation_id}-"))
+
+        try:
+            container = self.docker_client.containers.run(
+                image=image,
+                entrypoint=["sleep", "infinity"],
+                volumes={
+                    str(workspace): {"bind": "/workspace", "mode": "rw"},
+                    str(template): {"bind": "/sim", "mode": "ro"},
+                },
+                working_dir="/workspace",
+                mem_limit=self.config.sandbox_memory_limit,
+                cpu_period=100000,
+                cpu_quota=int(self.config.sandbox_cpu_limit * 100000),
+                network_disabled=self.config.sandbox_network_disabled,
+                labels={"proofhire.pool": simulation_id},
+                detach=True,
+                remove=False,
+            )
+            container.pause()
+        except Exception:
+            shutil.rmtree(workspace, ignore_errors=True)
+            raise
+
+        return WarmContainer(
+            container=container,
+            workspace=workspace,
+            simulation_id=simulation_id,
+            template=template,
+            image=image,
+        )
+
+    def _destroy(self, warm: WarmContainer) -> None:
+        try:
+            warm.container.remove(force=True)
+        except Exception as e:
+            logger.warning("Failed to remove pooled container", error=str(e))
+        shutil.rmtree(warm.workspace, ignore_errors=True)
@@ -1,14 +1,19 @@
 """Job handlers for different simulation types."""
 
+import hashlib
 import json
-import time
-from typing import Any
+import shutil
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from typing import Any, BinaryIO
 
 import boto3
-import httpx
 import structlog
+from boto3.s3.transfer import TransferConfig
+from botocore.config import Config as BotoConfig
 
 from runner.config import RunnerConfig
+from runner.notifier import BackendNotifier
 from runner.sandbox import SandboxManager, SandboxResult
 
 logger = structlog.get_logger(__name__)
@@ -17,7 +22,8 @@ logger = structlog.get_logger(__name__)
 def handle_simulation_job(
     job: dict[str, Any],
     sandbox_manager: SandboxManager,
-    config: RunnerConfig,
+    uploader: "ArtifactUploader",
+    notifier: BackendNotifier,
 ) -> dict[str, Any]:
     """Handle a simulation job.
 
@@ -48,6 +54,21 @@ def handle_simulation_job(
         run_id=run_id,
     )
 
+    try:
+        return _report_result(run_id, sandbox_result, uploader, notifier)
+    finally:
+        # Uploaded (or failed): the local copies are no longer needed
+        if sandbox_result.artifacts_dir:
+            shutil.rmtree(sandbox_result.artifacts_dir, ignore_errors=True)
+
+
+def _report_result(
+    run_id: str,
+    sandbox_result: SandboxResult,
+    uploader: "ArtifactUploader",
+    notifier: BackendNotifier,
+) -> dict[str, Any]:
+    """Upload the artifacts of a finished run and notify the backend."""
     if not sandbox_result.success:
         return {
             "success": False,
@@ -58,23 +79,23 @@ def handle_simulation_job(
         }
 
     # Upload artifacts to S3
-    artifact_urls = upload_artifacts(
-        run_id=run_id,
-        artifacts=sandbox_result.artifacts,
-        config=config,
-    )
+    uploaded = uploader.upload(run_id, sandbox_result.artifacts)
+    artifact_urls = {name: a.url for name, a in uploaded.items()}
+    artifact_hashes = {name: a.sha256 for name, a in uploaded.items()}
 
     # Parse metrics from grader output
     metrics = parse_metrics(sandbox_result.artifacts)
 
-    # Notify backend of completion
-    notify_backend(
-        run_id=run_id,
-        success=True,
-        metrics=metrics,
-        artifact_urls=artifact_urls,
-        duration_seconds=sandbox_result.duration_seconds,
-        config=config,
+    # Notify backend of completion (delivered via the outbox with retries)
+    notifier.notify(
+        run_id,
+        {
+            "success": True,
+            "metrics": metrics,
+            "artifact_urls": artifact_urls,
+            "artifact_hashes": artifact_hashes,
+            "duration_seconds": sandbox_result.duration_seconds,
+        },
     )
 
     return {
@@ -85,47 +106,121 @@ def handle_simulation_job(
     }
 
 
-def upload_artifacts(
-    run_id: str,
-    artifacts: dict[str, str],
-    config: RunnerConfig,
-) -> dict[str, str]:
-    """Upload artifacts to S3 and return URLs."""
-    s3_client = boto3.client(
-        "s3",
-        endpoint_url=config.s3_endpoint,
-        aws_access_key_id=config.s3_access_key,
-        aws_secret_access_key=config.s3_secret_key,
-    )
+@dataclass
+class UploadedArtifact:
+    """An artifact stored in S3."""
 
-    urls = {}
+    key: str
+    url: str
+    sha256: str
+    size_bytes: int
 
-    for name, local_path in artifacts.items():
-        try:
-            s3_key = f"runs/{run_id}/{name}"
-
-            with open(local_path, "rb") as f:
-                s3_client.upload_fileobj(
-                    f,
-                    config.s3_bucket,
-                    s3_key,
-                    ExtraArgs={"ContentType": _get_content_type(name)},
-                )
-
-            # Generate presigned URL
-            url = s3_client.generate_presigned_url(
-                "get_object",
-                Params={"Bucket": config.s3_bucket, "Key": s3_key},
-                ExpiresIn=86400 * 7,  # 7 days
+
+class ArtifactUploader:
+    """Uploads run artifacts to S3 over a shared, connection-pooled client.
+
+    One instance is owned by the Runner and shared by all worker slots.
+    Artifacts of a run are uploaded concurrently on a bounded thread pool;
+    files above the multipart threshold are sent as multipart uploads.
+    The SHA-256 of each artifact is computed while it is being uploaded.
+    """
+
+    def __init__(self, config: RunnerConfig):
+        self.config = config
+        self.s3_client = boto3.client(
+            "s3",
+            endpoint_url=config.s3_endpoint,
+            aws_access_key_id=config.s3_access_key,
+            aws_secret_access_key=config.s3_secret_key,
+            config=BotoConfig(
+                max_pool_connections=config.upload_concurrency * 4,
+                retries={"max_attempts": 3, "mode": "standard"},
+            ),
+        )
+        self.transfer_config = TransferConfig(
+            multipart_threshold=config.multipart_threshold_mb * 1024 * 1024,
+            multipart_chunksize=config.multipart_threshold_mb * 1024 * 1024,
+            max_concurrency=4,
+        )
+        self._executor = ThreadPoolExecutor(
+            max_workers=config.upload_concurrency,
+            thread_name_prefix="artifact-upload",
+        )
+
+    def upload(self, run_id: str, artifacts: dict[str, str]) -> dict[str, UploadedArtifact]:
+        """Upload all artifacts of a run concurrently.
+
+        Artifacts that fail to upload are logged and left out of the result.
+        """
+        futures = {
+            name: self._executor.submit(self._upload_one, run_id, name, local_path)
+            for name, local_path in artifacts.items()
+        }
+
+        uploaded = {}
+        for name, future in futures.items():
+            try:
+                uploaded[name] = future.result()
+            except Exception as e:
+                logger.error("Failed to upload artifact", run_id=run_id, name=name, error=str(e))
+
+        return uploaded
+
+    def shutdown(self) -> None:
+        """Wait for in-flight uploads and release the thread pool."""
+        self._executor.shutdown(wait=True)
+
+    def _upload_one(self, run_id: str, name: str, local_path: str) -> UploadedArtifact:
+        s3_key = f"runs/{run_id}/{name}"
+
+        with open(local_path, "rb") as f:
+            reader = _HashingReader(f)
+            self.s3_client.upload_fileobj(
+                reader,
+                self.config.s3_bucket,
+                s3_key,
+                ExtraArgs={"ContentType": _get_content_type(name)},
+                Config=self.transfer_config,
             )
-            urls[name] = url
 
-            logger.info("Uploaded artifact", run_id=run_id, name=name, key=s3_key)
+        # Generate presigned URL
+        url = self.s3_client.generate_presigned_url(
+            "get_object",
+            Params={"Bucket": self.config.s3_bucket, "Key": s3_key},
+            ExpiresIn=86400 * 7,  # 7 days
+        )
 
-        except Exception as e:
-            logger.error("Failed to upload artifact", name=name, error=str(e))
+        logger.info("Uploaded artifact", run_id=run_id, name=name, key=s3_key, size_bytes=reader.size)
+
+        return UploadedArtifact(
+            key=s3_key,
+            url=url,
+            sha256=reader.sha256.hexdigest(),
+            size_bytes=reader.size,
+        )
+
+
+class _HashingReader:
+    """File wrapper that hashes bytes as they are read.
+
+    Reports itself as non-seekable so the transfer manager reads the file
+    strictly in order (also for multipart uploads), which keeps the digest
+    correct without a second pass over the file.
+    """
 
-    return urls
+    def __init__(self, f: BinaryIO):
+        self._f = f
+        self.sha256 = hashlib.sha256()
+        self.size = 0
+
+    def read(self, size: int = -1) -> bytes:
+        data = self._f.read(size)
+        self.sha256.update(data)
+        self.size += len(data)
+        return data
+
+    def seekable(self) -> bool:
+        return False
 
 
 def parse_metrics(artifacts: dict[str, str]) -> dict[str, Any]:
@@ -154,36 +249,6 @@ def parse_metrics(artifacts: dict[str, str]) -> dict[str, Any]:
     return metrics
 
 
-def notify_backend(
-    run_id: str,
-    success: bool,
-    metrics: dict[str, Any],
-    artifact_urls: dict[str, str],
-    duration_seconds: float,
-    config: RunnerConfig,
-) -> None:
-    """Notify backend of job completion."""
-    try:
-        with httpx.Client(timeout=30.0) as client:
-            response = client.post(
-                f"{config.backend_url}/api/internal/runs/{run_id}/complete",
-                json={
-                    "success": success,
-                    "metrics": metrics,
-                    "artifact_urls": artifact_urls,
-                    "duration_seconds": duration_seconds,
-                },
-                headers={
-                    "X-Internal-Key": config.backend_api_key,
-                },
-            )
-            response.raise_for_status()
-            logger.info("Backend notified", run_id=run_id)
-
-    except Exception as e:
-        logger.error("Failed to notify backend", run_id=run_id, error=str(e))
-
-
 def _get_content_type(filename: str) -> str:
     """Get content type for artifact file."""
     if filename.endswith(".json"):
@@ -194,5 +259,7 @@ def _get_content_type(filename: str) -> str:
         return "text/plain"
     elif filename.endswith(".patch"):
         return "text/x-diff"
+    elif filename.endswith(".md"):
+        return "text/markdown"
     else:
         return "application/octet-stream"
@@ -0,0 +1,188 @@
+"""Job queues the runner pulls simulation jobs from.
+
+Which org queue a job is taken from is decided by the FairShareScheduler.
+Two delivery modes are supported:
+
+- JobQueue: plain RPOP. A job is removed from Redis as soon as it is
+  pulled, so a worker crash loses it.
+- ReliableJobQueue: LMOVE into a per-worker processing list. The job stays
+  there until acked. Each worker refreshes a heartbeat key with a TTL of
+  visibility_timeout; when a worker's heartbeat expires, any other worker
+  moves its unacked jobs back onto the queue. A job that has been handed
+  out max_deliveries times goes to a dead-letter list instead.
+"""
+
+import hashlib
+import threading
+import time
+from collections.abc import Callable
+
+import redis
+import structlog
+
+from runner.config import RunnerConfig
+from runner.scheduler import FairShareScheduler
+
+logger = structlog.get_logger(__name__)
+
+
+class JobQueue:
+    """Fire-and-forget queue."""
+
+    def __init__(self, client: redis.Redis, config: RunnerConfig):
+        self.redis = client
+        self.config = config
+        self.scheduler = FairShareScheduler(client, config)
+
+    def start(self) -> None:
+        """Start background maintenance (no-op for the plain queue)."""
+
+    def stop(self) -> None:
+        """Stop background maintenance (no-op for the plain queue)."""
+
+    def pop(self) -> str | None:
+        """Block up to poll_timeout for the next job payload."""
+        return self.scheduler.pop(self._take)
+
+    def _take(self, key: str) -> str | None:
+        return self.redis.rpop(key)
+
+    def ack(self, job_data: str) -> None:
+        """Mark a job as done (no-op for the plain queue)."""
+
+
+class ReliableJobQueue(JobQueue):
+    """At-least-once queue with heartbeats, redelivery and a dead-letter list."""
+
+    def __init__(
+        self,
+        client: redis.Redis,
+        config: RunnerConfig,
+        on_dead_letter: Callable[[str], None] | None = None,
+    ):
+        super().__init__(client, config)
+        self.on_dead_letter = on_dead_letter
+        self.worker_id = config.worker_id
+        self.workers_key = f"{config.job_queue}:workers"
+        self.deliveries_key = f"{config.job_queue}:deliveries"
+        self.dead_letter_key = f"{config.job_queue}:dead"
+        self.processing_key = self._processing_key(self.worker_id)
+        self.heartbeat_key = self._heartbeat_key(self.worker_id)
+        self._stop = threading.Event()
+        self._thread: threading.Thread | None = None
+
+    def start(self) -> None:
+        """Register this worker, recover its own leftovers and start heartbeating."""
+        self._heartbeat()
+        self.redis.sadd(self.workers_key, self.worker_id)
+
+        # A restarted worker with the same id may have left jobs behind
+        self._requeue(self.worker_id)
+
+        self._thread = threading.Thread(
+            target=self._maintenance_loop,
+            name="job-queue-heartbeat",
+            daemon=True,
+        )
+        self._thread.start()
+
+        logger.info(
+            "Reliable queue started",
+            worker_id=self.worker_id,
+            visibility_timeout=self.config.visibility_timeout,
+        )
+
+    def stop(self) -> None:
+        """Stop heartbeating and deregister. Unacked jobs will be redelivered."""
+        self._stop.set()
+        if self._thread:
+            self._thread.join()
+
+        if self.redis.llen(self.processing_key) == 0:
+            self.redis.srem(self.workers_key, self.worker_id)
+            self.redis.delete(self.heartbeat_key)
+
+    def _take(self, key: str) -> str | None:
+        """Atomically move the next job into this worker's processing list."""
+        return self.redis.lmove(key, self.processing_key, src="RIGHT", dest="LEFT")
+
+    def ack(self, job_data: str) -> None:
+        """Remove a finished job from the processing list."""
+        pipe = self.redis.pipeline()
+        pipe.lrem(self.processing_key, 1, job_data)
+        pipe.hdel(self.deliveries_key, _fingerprint(job_data))
+        pipe.execute()
+
+    def _maintenance_loop(self) -> None:
+        interval = max(1, self.config.visibility_timeout // 3)
+        while not self._stop.wait(interval):
+            try:
+                self._heartbeat()
+                self._reap_dead_workers()
+            except redis.RedisError as e:
+                logger.error("Queue maintenance failed", error=str(e))
+
+    def _heartbeat(self) -> None:
+        self.redis.set(self.heartbeat_key, time.time(), ex=self.config.visibility_timeout)
+
+    def _reap_dead_workers(self) -> None:
+        """Requeue jobs held by workers whose heartbeat has expired."""
+        for worker_id in self.redis.smembers(self.workers_key):
+            if worker_id == self.worker_id or self.redis.exists(self._heartbeat_key(worker_id)):
+                continue
+
+            # Only one live worker should reap a given dead worker
+            lock_key = f"{self.config.job_queue}:reaping:{worker_id}"
+            if not self.redis.set(lock_key, self.worker_id, nx=True, ex=self.config.visibility_timeout):
+                continue
+
+            logger.warning("Worker heartbeat expired, requeueing its jobs", dead_worker_id=worker_id)
+            self._requeue(worker_id)
+            self.redis.srem(self.workers_key, worker_id)
+
+    def _requeue(self, worker_id: str) -> None:
+        """Move every job in a worker's processing list back to the queue.
+
+        Redelivered jobs go back to the consuming end of their org's queue so
+        they run next. Jobs that
+        have exhausted max_deliveries are moved to the dead-letter list.
+        """
+        processing_key = self._processing_key(worker_id)
+
+        for job_data in self.redis.lrange(processing_key, 0, -1):
+            deliveries = self.redis.hincrby(self.deliveries_key, _fingerprint(job_data), 1)
+
+            pipe = self.redis.pipeline()
+            pipe.lrem(processing_key, 1, job_data)
+            if deliveries >= self.config.max_deliveries:
+                pipe.lpush(self.dead_letter_key, job_data)
+                pipe.hdel(self.deliveries_key, _fingerprint(job_data))
+                logger.error("Job dead-lettered", worker_id=worker_id, deliveries=deliveries)
+            else:
+                self.scheduler.push_front(pipe, job_data)
+                logger.info("Job redelivered", worker_id=worker_id, deliveries=deliveries)
+            pipe.execute()
+
+            if deliveries >= self.config.max_deliveries and self.on_dead_letter:
+                self.on_dead_letter(job_data)
+
+    def _processing_key(self, worker_id: str) -> str:
+        return f"{self.config.job_queue}:processing:{worker_id}"
+
+    def _heartbeat_key(self, worker_id: str) -> str:
+        return f"{self.config.job_queue}:heartbeat:{worker_id}"
+
+
+def create_job_queue(
+    client: redis.Redis,
+    config: RunnerConfig,
+    on_dead_letter: Callable[[str], None] | None = None,
+) -> JobQueue:
+    """Create the queue implementation selected by config."""
+    if config.reliable_queue:
+        return ReliableJobQueue(client, config, on_dead_letter=on_dead_letter)
+    return JobQueue(client, config)
+
+
+def _fingerprint(job_data: str) -> str:
+    return hashlib.sha1(job_data.encode("utf-8")).hexdigest()
@@ -0,0 +1,273 @@
+"""Completion callbacks from the runner to the backend.
+
+Notifications go through an outbox in Redis (a sorted set scored by next
+attempt time) instead of being posted inline, so a slow or unavailable
+backend never blocks a worker slot and never loses a completion:
+
+- notify() adds the payload to the outbox and wakes the sender thread
+- the sender claims due entries by moving them to an in-flight set, scored
+  by a deadline; an entry leaves it only once the backend has accepted it,
+  and entries still in flight after the deadline (the runner crashed
+  mid-send) are moved back to the outbox
+- the sender posts claimed entries over one persistent HTTP/2 connection pool
+- failed entries are rescheduled with exponential backoff
+- when several entries are due at once (backend slow or recovering), they
+  are sent together to the batch endpoint POST /api/internal/runs/complete;
+  if the backend rejects the batch, its entries are retried one by one so
+  only the bad entry is dropped, renewing each entry's claim before its send
+"""
+
+import json
+import random
+import threading
+import time
+from typing import Any
+
+import httpx
+import redis
+import structlog
+
+from runner.config import RunnerConfig
+
+logger = structlog.get_logger(__name__)
+
+# Client errors that will not succeed on retry (for a single entry)
+_PERMANENT_STATUS_CODES = {400, 404, 422}
+
+# The backend refused our internal API key: retried, since the fix (rotating
+# the key on one side or the other) needs no change to the entries
+_AUTH_STATUS_CODES = {401, 403}
+
+# (outbox member, decoded entry)
+Claimed = tuple[str, dict[str, Any]]
+
+
+class BackendNotifier:
+    """Delivers run completion notifications with retries and batching."""
+
+    def __init__(self, client: redis.Redis, config: RunnerConfig):
+        self.redis = client
+        self.config = config
+        self.outbox_key = f"{config.job_queue}:outbox"
+        self.inflight_key = f"{config.job_queue}:outbox:inflight"
+        self.http = httpx.Client(
+            base_url=config.backend_url,
+            http2=True,
+            timeout=30.0,
+            headers={"X-Internal-Key": config.backend_api_key},
+            limits=httpx.Limits(max_connections=10, max_keepalive_connections=10),
+        )
+        self._wake = threading.Event()
+        self._stop = threading.Event()
+        self._thread: threading.Thread | None = None
+
+    def start(self) -> None:
+        """Start the background sender (also drains entries left by a previous run)."""
+        self._thread = threading.Thread(target=self._send_loop, name="backend-notifier", daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        """Make a final delivery attempt and stop. Undelivered entries stay in Redis."""
+        self._stop.set()
+        self._wake.set()
+        if self._thread:
+            self._thread.join()
+        self.http.close()
+
+    def notify(self, run_id: str, payload: dict[str, Any]) -> None:
+        """Queue a completion notification for delivery."""
+        entry = {"run_id": run_id, "payload": payload, "attempts": 0}
+        self.redis.zadd(self.outbox_key, {json.dumps(entry): time.time()})
+        self._wake.set()
+
+    def _send_loop(self) -> None:
+        while True:
+            timeout = float(self.config.poll_timeout)
+            try:
+                self.flush()
+                timeout = self._seconds_until_next_due()
+            except redis.RedisError as e:
+                logger.error("Outbox unavailable", error=str(e))
+            except Exception as e:
+                logger.exception("Unexpected error sending notifications", error=str(e))
+
+            if self._stop.is_set():
+                return
+
+            self._wake.wait(timeout=timeout)
+            self._wake.clear()
+
+    def flush(self) -> None:
+        """Send every entry that is due, in batches."""
+        self._recover_expired()
+        while True:
+            claimed = self._claim_due()
+            if not claimed:
+                return
+
+            if len(claimed) == 1:
+                self._send_single(claimed[0])
+            else:
+                self._send_batch(claimed)
+
+    def _claim_due(self) -> list[Claimed]:
+        """Move up to notify_batch_size due entries from the outbox to the in-flight set.
+
+        The move is one WATCH/MULTI transaction: if several runners share
+        the outbox, only one of them claims (and therefore sends) a given
+        entry. The entry stays in flight until it is acked or rescheduled.
+        """
+        def claim(pipe: redis.client.Pipeline) -> list[str]:
+            members = pipe.zrangebyscore(
+                self.outbox_key,
+                "-inf",
+                time.time(),
+                start=0,
+                num=self.config.notify_batch_size,
+            )
+            if members:
+                deadline = time.time() + self.config.notify_claim_timeout
+                pipe.multi()
+                pipe.zrem(self.outbox_key, *members)
+                pipe.zadd(self.inflight_key, dict.fromkeys(members, deadline))
+            return members
+
+        members = self.redis.transaction(claim, self.outbox_key, value_from_callable=True)
+        return [(m, json.loads(m)) for m in members]
+
+    def _recover_expired(self) -> None:
+        """Return entries whose sender died mid-delivery to the outbox."""
+        def recover(pipe: redis.client.Pipeline) -> list[str]:
+            members = pipe.zrangebyscore(self.inflight_key, "-inf", time.time())
+            if members:
+                pipe.multi()
+                pipe.zrem(self.inflight_key, *members)
+                pipe.zadd(self.outbox_key, {m: time.time() for m in members})
+            return members
+
+        members = self.redis.transaction(recover, self.inflight_key, value_from_callable=True)
+        if members:
+            logger.warning("Recovered notifications left in flight", count=len(members))
+
+    def _renew_claim(self, claimed: Claimed) -> bool:
+        """Push back the in-flight deadline of an entry about to be sent.
+
+        Sending a rejected batch entry by entry can take longer than
+        notify_claim_timeout, so each entry gets a fresh deadline right
+        before its send. Returns False if the entry is no longer in flight
+        (its claim expired and it was recovered), in which case it must not
+        be sent from here.
+        """
+        member, _ = claimed
+        deadline = time.time() + self.config.notify_claim_timeout
+        return bool(self.redis.zadd(self.inflight_key, {member: deadline}, xx=True, ch=True))
+
+    def _ack(self, claimed: list[Claimed]) -> None:
+        """Forget entries the backend accepted (or permanently rejected)."""
+        self.redis.zrem(self.inflight_key, *(member for member, _ in claimed))
+
+    def _send_single(self, claimed: Claimed) -> None:
+        _, entry = claimed
+        run_id = entry["run_id"]
+        try:
+            response = self.http.post(f"/api/internal/runs/{run_id}/complete", json=entry["payload"])
+            response.raise_for_status()
+        except httpx.HTTPStatusError as e:
+            status_code = e.response.status_code
+            if status_code in _PERMANENT_STATUS_CODES:
+                logger.error(
+                    "Backend rejected notification, dropping",
+                    run_id=run_id,
+                    status_code=status_code,
+                    error=str(e),
+                )
+                self._ack([claimed])
+            else:
+                self._handle_failure([claimed], str(e), status_code)
+            return
+        except httpx.HTTPError as e:
+            self._handle_failure([claimed], str(e))
+            return
+
+        self._ack([claimed])
+        logger.info("Backend notified", run_id=run_id, attempts=entry["attempts"] + 1)
+
+    def _send_batch(self, claimed: list[Claimed]) -> None:
+        body = {"runs": [{"run_id": e["run_id"], **e["payload"]} for _, e in claimed]}
+        try:
+            response = self.http.post("/api/internal/runs/complete", json=body)
+            response.raise_for_status()
+        except httpx.HTTPStatusError as e:
+            if e.response.status_code in _PERMANENT_STATUS_CODES:
+                # One bad entry fails the whole batch: find it by sending them singly
+                logger.warning(
+                    "Backend rejected batch, sending entries singly",
+                    run_count=len(claimed),
+                    status_code=e.response.status_code,
+                )
+                for item in claimed:
+                    if self._renew_claim(item):
+                        self._send_single(item)
+            else:
+                self._handle_failure(claimed, str(e), e.response.status_code)
+            return
+        except httpx.HTTPError as e:
+            self._handle_failure(claimed, str(e))
+            return
+
+        # Delivered: the response body only says which runs were unknown
+        self._ack(claimed)
+        try:
+            results = {r["run_id"]: r["status"] for r in response.json().get("results", [])}
+        except (ValueError, KeyError, TypeError, AttributeError) as e:
+            logger.warning("Unreadable batch response", error=str(e))
+            results = {}
+
+        # Unknown runs are dropped, as a 404 on the single endpoint would be
+        for _, entry in claimed:
+            if results.get(entry["run_id"]) == "not_found":
+                logger.error("Backend rejected notification, dropping", run_id=entry["run_id"], status_code=404)
+
+        logger.info("Backend notified in batch", run_count=len(claimed))
+
+    def _handle_failure(
+        self,
+        claimed: list[Claimed],
+        error: str,
+        status_code: int | None = None,
+    ) -> None:
+        """Move failed entries back to the outbox with exponential backoff and jitter."""
+        if status_code in _AUTH_STATUS_CODES:
+            logger.error(
+                "Backend rejected the internal API key, check BACKEND_API_KEY",
+                status_code=status_code,
+                run_count=len(claimed),
+            )
+
+        pipe = self.redis.pipeline()
+        for member, entry in claimed:
+            entry["attempts"] += 1
+            delay = min(self.config.notify_max_backoff, 2 ** entry["attempts"])
+            delay *= random.uniform(0.5, 1.0)
+            pipe.zrem(self.inflight_key, member)
+            pipe.zadd(self.outbox_key, {json.dumps(entry): time.time() + delay})
+
+            logger.warning(
+                "Failed to notify backend, will retry",
+                run_id=entry["run_id"],
+                attempts=entry["attempts"],
+                retry_in_seconds=round(delay, 1),
+                status_code=status_code,
+                error=error,
+            )
+        pipe.execute()
+
+    def _seconds_until_next_due(self) -> float:
+        due = [
+            head[0][1]
+            for key in (self.outbox_key, self.inflight_key)
+            if (head := self.redis.zrange(key, 0, 0, withscores=True))
+        ]
+        if not due:
+            return float(self.config.poll_timeout)
+        return max(0.0, min(float(self.config.poll_timeout), min(due) - time.time()))
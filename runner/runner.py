@@ -3,67 +3,112 @@
 Pulls simulation jobs from Redis queue and executes them in Docker sandboxes.
 """
 
+import json
 import os
 import signal
 import sys
+import threading
 import time
+from concurrent.futures import ThreadPoolExecutor
 from typing import Any
 
 import redis
 import structlog
 
 from runner.config import RunnerConfig
-from runner.job_handlers import handle_simulation_job
+from runner.job_handlers import ArtifactUploader, handle_simulation_job
+from runner.job_queue import create_job_queue
+from runner.notifier import BackendNotifier
 from runner.sandbox import SandboxManager
 
 logger = structlog.get_logger(__name__)
 
 
 class Runner:
-    """Main runner service that processes simulation jobs."""
+    """Main runner service that processes simulation jobs.
+
+    Jobs are executed on a pool of worker slots. The main loop only pulls
+    a job from the queue when a slot is free, so jobs stay in Redis (and
+    available to other workers) while this host is saturated.
+    """
 
     def __init__(self, config: RunnerConfig):
         self.config = config
         self.redis = redis.Redis.from_url(config.redis_url, decode_responses=True)
+        self.queue = create_job_queue(self.redis, config, on_dead_letter=self._handle_dead_letter)
         self.sandbox_manager = SandboxManager(config)
+        self.uploader = ArtifactUploader(config)
+        self.notifier = BackendNotifier(self.redis, config)
+        self.slots = config.effective_slots
+        self._slot_semaphore = threading.BoundedSemaphore(self.slots)
+        self._executor = ThreadPoolExecutor(
+            max_workers=self.slots,
+            thread_name_prefix="runner-slot",
+        )
         self._running = True
 
     def run(self) -> None:
         """Main worker loop - pull jobs and execute."""
-        logger.info("Runner started", worker_id=self.config.worker_id)
+        logger.info("Runner started", worker_id=self.config.worker_id, slots=self.slots)
 
         # Register signal handlers for graceful shutdown
         signal.signal(signal.SIGTERM, self._handle_shutdown)
         signal.signal(signal.SIGINT, self._handle_shutdown)
 
+        self.sandbox_manager.start()
+        self.notifier.start()
+        self.queue.start()
+
         while self._running:
+            # Wait for a free slot before pulling, re-checking for shutdown
+            if not self._slot_semaphore.acquire(timeout=self.config.poll_timeout):
+                continue
+
             try:
-                self._process_next_job()
+                submitted = self._process_next_job()
             except redis.ConnectionError as e:
                 logger.error("Redis connection error", error=str(e))
+                submitted = False
                 time.sleep(5)
             except Exception as e:
                 logger.exception("Unexpected error in worker loop", error=str(e))
+                submitted = False
                 time.sleep(1)
 
+            if not submitted:
+                self._slot_semaphore.release()
+
+        # Drain: let in-flight jobs finish before tearing down sandboxes
+        logger.info("Draining in-flight jobs", worker_id=self.config.worker_id)
+        self._executor.shutdown(wait=True)
+        self.queue.stop()
+        self.uploader.shutdown()
+        self.notifier.stop()
+        self.sandbox_manager.shutdown()
         logger.info("Runner shutdown complete")
 
-    def _process_next_job(self) -> None:
-        """Pull and process the next job from queue."""
+    def _process_next_job(self) -> bool:
+        """Pull the next job from queue and hand it to a free slot.
+
+        Returns True if a job was submitted (the slot is released when the
+        job finishes), False if the queue was empty.
+        """
         # Blocking pop with timeout
-        result = self.redis.brpop(
-            self.config.job_queue,
-            timeout=self.config.poll_timeout,
-        )
+        job_data = self.queue.pop()
 
-        if result is None:
+        if job_data is None:
             # Timeout - no job available
-            return
+            return False
 
-        queue_name, job_data = result
+        future = self._executor.submit(self._execute_job, job_data)
+        future.add_done_callback(lambda _: self._slot_semaphore.release())
+        return True
+
+    def _execute_job(self, job_data: str) -> None:
+        """Execute a single job (runs on a worker slot thread)."""
+        job: dict[str, Any] = {}
 
         try:
-            import json
             job = json.loads(job_data)
             run_id = job.get("run_id")
 
@@ -76,7 +121,8 @@ class Runner:
             result = handle_simulation_job(
                 job=job,
                 sandbox_manager=self.sandbox_manager,
-                config=self.config,
+                uploader=self.uploader,
+                notifier=self.notifier,
             )
 
             # Update final status
@@ -92,6 +138,23 @@ class Runner:
             if "run_id" in job:
                 self._update_status(job["run_id"], "failed", {"error": str(e)})
 
+        finally:
+            # Failures are reported, not retried; only crashed workers redeliver
+            self.queue.ack(job_data)
+
+    def _handle_dead_letter(self, job_data: str) -> None:
+        """Mark a job that exhausted its deliveries as failed."""
+        try:
+            run_id = json.loads(job_data).get("run_id")
+        except json.JSONDecodeError:
+            return
+        if run_id:
+            self._update_status(
+                run_id,
+                "failed",
+                {"error": f"Job dead-lettered after {self.config.max_deliveries} deliveries"},
+            )
+
     def _update_status(
         self,
         run_id: str,
@@ -99,8 +162,6 @@ class Runner:
         result: dict[str, Any] | None = None,
     ) -> None:
         """Update job status in Redis for backend to poll."""
-        import json
-
         status_data = {
             "run_id": run_id,
             "status": status,
@@ -121,7 +182,10 @@ class Runner:
         )
 
     def _handle_shutdown(self, signum: int, frame: Any) -> None:
-        """Handle graceful shutdown."""
+        """Handle graceful shutdown.
+
+        Stops pulling new jobs; jobs already running finish before exit.
+        """
         logger.info("Shutdown signal received", signal=signum)
         self._running = False
 
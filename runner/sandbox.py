@@ -5,12 +5,18 @@ The sandbox ensures:
 - Resource limits (CPU, memory)
 - Timeout enforcement
 - Clean workspace per run
+- Single-use containers, optionally pre-warmed (see container_pool)
 """
 
+import hashlib
+import io
 import os
 import shutil
+import tarfile
 import tempfile
+import threading
 import time
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass
 from pathlib import Path
 from typing import Any
@@ -19,9 +25,21 @@ import docker
 import structlog
 
 from runner.config import RunnerConfig
+from runner.container_pool import ContainerPool, WarmContainer
+from runner.template_cache import TemplateCache
 
 logger = structlog.get_logger(__name__)
 
+# Layer added on top of the base sandbox image for each simulation
+SIMULATION_DOCKERFILE = """\
+FROM {base_image}
+USER root
+COPY requirements.txt /tmp/requirements.txt
+RUN pip install --no-cache-dir -r /tmp/requirements.txt && rm /tmp/requirements.txt
+ENV PROOFHIRE_REQUIREMENTS_SHA256={requirements_sha256}
+USER sandbox
+"""
+
 
 @dataclass
 class SandboxResult:
@@ -34,6 +52,7 @@ class SandboxResult:
     duration_seconds: float
     artifacts: dict[str, str]  # name -> local path
     error: str | None = None
+    artifacts_dir: str | None = None  # Holds the artifacts; the caller removes it after upload
 
 
 class SandboxManager:
@@ -42,6 +61,59 @@ class SandboxManager:
     def __init__(self, config: RunnerConfig):
         self.config = config
         self.docker_client = docker.from_env()
+        self.templates = TemplateCache(config)
+        self.pool = (
+            ContainerPool(config, self.docker_client, self.templates, self.image_for)
+            if config.warm_pool_size > 0
+            else None
+        )
+        self._exec_executor = ThreadPoolExecutor(thread_name_prefix="sandbox-exec")
+        self._build_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="image-build")
+        self._image_lock = threading.Lock()
+        self._ready_images: set[str] = set()
+        self._pending_images: set[str] = set()
+        self._base_image_id: str | None = None
+
+    def start(self) -> None:
+        """Start background resources (image builds, warm container pool)."""
+        sims_root = Path(self.config.sims_path)
+        if sims_root.exists():
+            for sim_dir in sorted(p for p in sims_root.iterdir() if p.is_dir()):
+                try:
+                    self.image_for(sim_dir.name, self.templates.get(sim_dir.name))
+                except Exception as e:
+                    logger.warning("Could not prepare simulation image", simulation_id=sim_dir.name, error=str(e))
+
+        if self.pool:
+            self.pool.start()
+
+    def shutdown(self) -> None:
+        """Release pooled containers and background threads."""
+        if self.pool:
+            self.pool.shutdown()
+        self._build_executor.shutdown(wait=False, cancel_futures=True)
+        self._exec_executor.shutdown(wait=False)
+
+    def image_for(self, simulation_id: str, template: Path) -> str:
+        """Select the sandbox image for a simulation.
+
+        Returns the pre-baked per-simulation image (dependencies already
+        installed) once it has been built. Until then the base image is
+        returned and a build is started in the background.
+        """
+        if not self.config.prebake_images or not (template / "requirements.txt").exists():
+            return self.config.sandbox_image
+
+        tag = self._simulation_image_tag(simulation_id, template)
+
+        with self._image_lock:
+            if tag in self._ready_images:
+                return tag
+            if tag not in self._pending_images:
+                self._pending_images.add(tag)
+                self._build_executor.submit(self._build_simulation_image, template, tag)
+
+        return self.config.sandbox_image
 
     def execute(
         self,
@@ -62,15 +134,22 @@ class SandboxManager:
             SandboxResult with outputs and artifacts
         """
         start_time = time.time()
+        warm = None
         workspace = None
+        template = None
 
         try:
-            # Create temporary workspace
+            template = self.templates.get(simulation_id)
+            image = self.image_for(simulation_id, template)
+            warm = self.pool.acquire(simulation_id, template, image) if self.pool else None
+
+            # Create workspace (reusing the warm container's mount if we have one)
             workspace = self._create_workspace(
-                simulation_id=simulation_id,
+                template=template,
                 candidate_code=candidate_code,
                 candidate_writeup=candidate_writeup,
                 run_id=run_id,
+                workspace=warm.workspace if warm else None,
             )
 
             logger.info(
@@ -78,35 +157,16 @@ class SandboxManager:
                 run_id=run_id,
                 simulation_id=simulation_id,
                 workspace=str(workspace),
+                image=image,
+                warm=warm is not None,
             )
 
-            # Run the container
-            container = self.docker_client.containers.run(
-                image=self.config.sandbox_image,
-                command=["python", "-m", "grader", "--run-id", run_id],
-                volumes={
-                    str(workspace): {"bind": "/workspace", "mode": "rw"},
-                    str(Path(self.config.sims_path) / simulation_id): {
-                        "bind": "/sim",
-                        "mode": "ro",
-                    },
-                },
-                working_dir="/workspace",
-                mem_limit=self.config.sandbox_memory_limit,
-                cpu_period=100000,
-                cpu_quota=int(self.config.sandbox_cpu_limit * 100000),
-                network_disabled=self.config.sandbox_network_disabled,
-                detach=True,
-                remove=False,
-            )
+            if warm:
+                outcome = self._run_warm(warm, run_id)
+            else:
+                outcome = self._run_cold(workspace, template, image, run_id)
 
-            # Wait for completion with timeout
-            try:
-                result = container.wait(timeout=self.config.sandbox_timeout)
-                exit_code = result["StatusCode"]
-            except Exception as e:
-                logger.warning("Container timeout", run_id=run_id, error=str(e))
-                container.kill()
+            if outcome is None:
                 return SandboxResult(
                     success=False,
                     exit_code=-1,
@@ -117,15 +177,10 @@ class SandboxManager:
                     error="Execution timed out",
                 )
 
-            # Collect logs
-            stdout = container.logs(stdout=True, stderr=False).decode("utf-8", errors="replace")
-            stderr = container.logs(stdout=False, stderr=True).decode("utf-8", errors="replace")
+            exit_code, stdout, stderr = outcome
 
-            # Collect artifacts from workspace
-            artifacts = self._collect_artifacts(workspace)
-
-            # Cleanup container
-            container.remove()
+            # Move artifacts out of the workspace, which is removed below
+            artifacts, artifacts_dir = self._collect_artifacts(workspace, run_id)
 
             duration = time.time() - start_time
             success = exit_code == 0
@@ -146,6 +201,7 @@ class SandboxManager:
                 stderr=stderr,
                 duration_seconds=duration,
                 artifacts=artifacts,
+                artifacts_dir=str(artifacts_dir) if artifacts_dir else None,
             )
 
         except docker.errors.ImageNotFound:
@@ -172,24 +228,116 @@ class SandboxManager:
             )
 
         finally:
-            # Cleanup workspace
-            if workspace and workspace.exists():
+            # Cleanup workspace (pooled containers are destroyed with theirs)
+            if warm:
+                self.pool.discard(warm)
+            elif workspace and workspace.exists():
                 shutil.rmtree(workspace, ignore_errors=True)
+            # The run had a private copy, but make sure nothing reached the shared snapshot
+            if template is not None:
+                self.templates.verify(template)
+
+    def _grader_command(self, run_id: str) -> list[str]:
+        command = ["python", "-m", "grader", "--run-id", run_id]
+        if self.config.grader_evidence:
+            command.append("--evidence")
+        return command
+
+    def _run_cold(
+        self,
+        workspace: Path,
+        template: Path,
+        image: str,
+        run_id: str,
+    ) -> tuple[int, str, str] | None:
+        """Run the grader in a freshly created container.
+
+        Returns (exit_code, stdout, stderr), or None on timeout.
+        """
+        container = self.docker_client.containers.run(
+            image=image,
+            command=self._grader_command(run_id),
+            volumes={
+                str(workspace): {"bind": "/workspace", "mode": "rw"},
+                str(template): {
+                    "bind": "/sim",
+                    "mode": "ro",
+                },
+            },
+            working_dir="/workspace",
+            mem_limit=self.config.sandbox_memory_limit,
+            cpu_period=100000,
+            cpu_quota=int(self.config.sandbox_cpu_limit * 100000),
+            network_disabled=self.config.sandbox_network_disabled,
+            detach=True,
+            remove=False,
+        )
+
+        # Wait for completion with timeout
+        try:
+            result = container.wait(timeout=self.config.sandbox_timeout)
+            exit_code = result["StatusCode"]
+        except Exception as e:
+            logger.warning("Container timeout", run_id=run_id, error=str(e))
+            container.kill()
+            return None
+
+        # Collect logs
+        stdout = container.logs(stdout=True, stderr=False).decode("utf-8", errors="replace")
+        stderr = container.logs(stdout=False, stderr=True).decode("utf-8", errors="replace")
+
+        # Cleanup container
+        container.remove()
+
+        return exit_code, stdout, stderr
+
+    def _run_warm(self, warm: WarmContainer, run_id: str) -> tuple[int, str, str] | None:
+        """Exec the grader inside an unpaused pooled container.
+
+        Returns (exit_code, stdout, stderr), or None on timeout.
+        """
+        api = self.docker_client.api
+        exec_id = api.exec_create(
+            warm.container.id,
+            self._grader_command(run_id),
+            workdir="/workspace",
+        )["Id"]
+
+        # exec_start has no timeout of its own, so wait on it from a thread
+        future = self._exec_executor.submit(api.exec_start, exec_id, demux=True)
+        try:
+            stdout, stderr = future.result(timeout=self.config.sandbox_timeout)
+        except TimeoutError:
+            logger.warning("Container timeout", run_id=run_id, warm=True)
+            warm.container.kill()
+            return None
+
+        exit_code = api.exec_inspect(exec_id)["ExitCode"]
+
+        return (
+            exit_code,
+            (stdout or b"").decode("utf-8", errors="replace"),
+            (stderr or b"").decode("utf-8", errors="replace"),
+        )
 
     def _create_workspace(
         self,
-        simulation_id: str,
+        template: Path,
         candidate_code: str,
         candidate_writeup: str,
         run_id: str,
+        workspace: Path | None = None,
     ) -> Path:
-        """Create isolated workspace with candidate submissions."""
-        workspace = Path(tempfile.mkdtemp(prefix=f"proofhire-{run_id}-"))
+        """Create isolated workspace with candidate submissions.
 
-        # Copy simulation template
-        sim_path = Path(self.config.sims_path) / simulation_id
-        if sim_path.exists():
-            shutil.copytree(sim_path, workspace / "sim", dirs_exist_ok=True)
+        If workspace is given (a pooled container's mount), it is populated
+        in place instead of creating a new temp dir.
+        """
+        if workspace is None:
+            workspace = Path(tempfile.mkdtemp(prefix=f"proofhire-{run_id}-"))
+
+        # Copy the simulation template into the grader's work directory
+        self.templates.materialize(template, workspace / "work")
 
         # Write candidate code
         code_path = workspace / "submission" / "code.py"
@@ -205,13 +353,17 @@ class SandboxManager:
 
         return workspace
 
-    def _collect_artifacts(self, workspace: Path) -> dict[str, str]:
-        """Collect generated artifacts from workspace."""
-        artifacts = {}
-        output_dir = workspace / "output"
+    def _collect_artifacts(self, workspace: Path, run_id: str) -> tuple[dict[str, str], Path | None]:
+        """Move generated artifacts from the workspace to a directory of their own.
 
-        if not output_dir.exists():
-            return artifacts
+        The workspace is removed (or goes with its pooled container) as soon
+        as the run ends, before the artifacts are uploaded.
+
+        Returns:
+            Artifact name -> local path, and the directory holding them
+        """
+        found = {}
+        output_dir = workspace / "output"
 
         # Expected artifact files
         artifact_files = [
@@ -220,14 +372,31 @@ class SandboxManager:
             "coverage.xml",
             "diff.patch",
             "grader_output.json",
+            "pytest_report.json",
+            "evidence.json",
         ]
 
         for filename in artifact_files:
             filepath = output_dir / filename
             if filepath.exists():
-                artifacts[filename] = str(filepath)
+                found[filename] = filepath
+
+        # The writeup is uploaded as submitted, for the backend's writeup extractor
+        writeup_path = workspace / "submission" / "writeup.md"
+        if writeup_path.exists():
+            found["writeup.md"] = writeup_path
+
+        if not found:
+            return {}, None
 
-        return artifacts
+        artifacts_dir = Path(tempfile.mkdtemp(prefix=f"proofhire-{run_id}-artifacts-"))
+        artifacts = {}
+        for filename, filepath in found.items():
+            target = artifacts_dir / filename
+            shutil.move(filepath, target)
+            artifacts[filename] = str(target)
+
+        return artifacts, artifacts_dir
 
     def build_sandbox_image(self) -> bool:
         """Build the sandbox Docker image."""
@@ -243,8 +412,60 @@ class SandboxManager:
                 rm=True,
             )
             logger.info("Sandbox image built", tag=self.config.sandbox_image)
+
+            # Per-simulation images are keyed on the base image id
+            with self._image_lock:
+                self._base_image_id = None
             return True
 
         except Exception as e:
             logger.exception("Failed to build sandbox image", error=str(e))
             return False
+
+    def _simulation_image_tag(self, simulation_id: str, template: Path) -> str:
+        """Image tag keyed by the base image and the simulation content version."""
+        if self._base_image_id is None:
+            self._base_image_id = self.docker_client.images.get(self.config.sandbox_image).id
+
+        key = hashlib.sha256(f"{self._base_image_id}:{template.name}".encode("utf-8")).hexdigest()
+        return f"{self.config.sandbox_image.split(':')[0]}-{simulation_id}:{key[:16]}"
+
+    def _build_simulation_image(self, template: Path, tag: str) -> None:
+        """Build a per-simulation image with the simulation's requirements installed."""
+        try:
+            try:
+                self.docker_client.images.get(tag)
+                logger.info("Simulation image found", tag=tag)
+            except docker.errors.ImageNotFound:
+                requirements = (template / "requirements.txt").read_bytes()
+                dockerfile = SIMULATION_DOCKERFILE.format(
+                    base_image=self.config.sandbox_image,
+                    requirements_sha256=hashlib.sha256(requirements).hexdigest(),
+                ).encode("utf-8")
+
+                context = io.BytesIO()
+                with tarfile.open(fileobj=context, mode="w") as tar:
+                    for name, data in (("Dockerfile", dockerfile), ("requirements.txt", requirements)):
+                        info = tarfile.TarInfo(name)
+                        info.size = len(data)
+                        tar.addfile(info, io.BytesIO(data))
+                context.seek(0)
+
+                start_time = time.time()
+                self.docker_client.images.build(
+                    fileobj=context,
+                    custom_context=True,
+                    tag=tag,
+                    rm=True,
+                )
+                logger.info("Simulation image built", tag=tag, duration_seconds=time.time() - start_time)
+
+            with self._image_lock:
+                self._ready_images.add(tag)
+
+        except Exception as e:
+            logger.exception("Failed to build simulation image", tag=tag, error=str(e))
+
+        finally:
+            with self._image_lock:
+                self._pending_images.discard(tag)
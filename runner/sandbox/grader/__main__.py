@@ -1,6 +1,6 @@
 """Main entry point for the grader.
 
-Usage: python -m grader --run-id <run_id>
+Usage: python -m grader --run-id <run_id> [--evidence]
 
 The grader expects:
 - /sim directory: Contains the simulation template (app/, tests/, etc.)
@@ -13,6 +13,8 @@ The grader outputs to /workspace/output/:
 - coverage.xml: Coverage report in Cobertura format
 - diff.patch: Diff showing candidate changes
 - grader_output.json: Detailed grader results
+- pytest_report.json: pytest-json-report output
+- evidence.json: Compact summary of the artifacts above (with --evidence)
 """
 
 import argparse
@@ -25,10 +27,17 @@ import time
 from datetime import datetime
 from pathlib import Path
 
+from grader.evidence import write_evidence
+
 
 def main():
     parser = argparse.ArgumentParser(description="ProofHire Simulation Grader")
     parser.add_argument("--run-id", required=True, help="Unique run identifier")
+    parser.add_argument(
+        "--evidence",
+        action="store_true",
+        help="Also write evidence.json, a versioned summary of the artifacts",
+    )
     args = parser.parse_args()
 
     run_id = args.run_id
@@ -59,7 +68,10 @@ def main():
     try:
         # 1. Copy simulation template to work directory
         print("[grader] Setting up simulation environment...")
-        if sim_dir.exists():
+        if any(work_dir.iterdir()):
+            # The runner already copied the cached template into the workspace
+            print(f"[grader] Using pre-copied simulation template in {work_dir}")
+        elif sim_dir.exists():
             shutil.copytree(sim_dir, work_dir, dirs_exist_ok=True)
             print(f"[grader] Copied simulation from {sim_dir}")
         else:
@@ -82,7 +94,7 @@ def main():
                 create_diff(original_content, candidate_code, target_files[0].name, output_dir)
 
                 # Apply candidate code
-                target_files[0].write_text(candidate_code)
+                replace_file(target_files[0], candidate_code)
                 print(f"[grader] Applied code to {target_files[0]}")
 
                 results["metrics"]["code_applied"] = True
@@ -93,9 +105,12 @@ def main():
             results["errors"].append("Candidate code not found")
             results["metrics"]["code_applied"] = False
 
-        # 3. Install simulation requirements if present
+        # 3. Install simulation requirements if present (skipped when the
+        # runner selected a pre-baked image for exactly these requirements)
         requirements_file = work_dir / "requirements.txt"
-        if requirements_file.exists():
+        if requirements_file.exists() and requirements_preinstalled(requirements_file):
+            print("[grader] Requirements preinstalled in sandbox image")
+        elif requirements_file.exists():
             print("[grader] Installing requirements...")
             subprocess.run(
                 [sys.executable, "-m", "pip", "install", "-q", "-r", str(requirements_file)],
@@ -209,6 +224,14 @@ def main():
         # grader_output.json - full grader results
         (output_dir / "grader_output.json").write_text(json.dumps(results, indent=2))
 
+        # evidence.json - metrics the backend would otherwise parse from the artifacts
+        if args.evidence:
+            try:
+                write_evidence(run_id, output_dir)
+            except Exception as e:
+                # The backend falls back to parsing the artifacts
+                print(f"[grader] Could not write evidence.json: {e}")
+
         print(f"[grader] Grading complete. Success: {results['success']}")
         print(f"[grader] Metrics: {json.dumps(metrics_output, indent=2)}")
 
@@ -216,6 +239,26 @@ def main():
         sys.exit(0 if results["success"] else 1)
 
 
+def requirements_preinstalled(requirements_file: Path) -> bool:
+    """Check whether the image was baked with this exact requirements file."""
+    import hashlib
+
+    digest = hashlib.sha256(requirements_file.read_bytes()).hexdigest()
+    return os.environ.get("PROOFHIRE_REQUIREMENTS_SHA256") == digest
+
+
+def replace_file(path: Path, content: str) -> None:
+    """Write a file by replacing it rather than writing in place.
+
+    Work directory files copied from the runner's template cache keep the
+    snapshot's read-only mode, so they are replaced instead of opened for
+    writing.
+    """
+    tmp_path = path.with_name(f".{path.name}.tmp")
+    tmp_path.write_text(content)
+    os.replace(tmp_path, path)
+
+
 def create_diff(original: str, modified: str, filename: str, output_dir: Path) -> None:
     """Create a unified diff between original and modified content."""
     import difflib
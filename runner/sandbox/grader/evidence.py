@@ -0,0 +1,168 @@
+"""Compact evidence summary written by the grader (evidence.json).
+
+The backend derives metrics from the raw artifacts (diff.patch,
+pytest_report.json / testlog.txt, coverage.xml) before generating claims.
+The grader already has those files on local disk, so with --evidence it
+computes the same metrics here and writes them to a small JSON document.
+The backend then uses that document instead of downloading and parsing
+the multi-MB originals again. The originals are still uploaded for
+auditing.
+
+The metric names and the diff patterns match app/evidence/pipeline.py and
+app/evidence/extractors in the backend. Bump SCHEMA_VERSION whenever the
+document changes incompatibly: the backend ignores versions it does not
+know and falls back to parsing the artifacts itself.
+
+Standard library only: this runs inside the sandbox image.
+"""
+
+import json
+import re
+import xml.etree.ElementTree as ET
+from datetime import datetime
+from pathlib import Path
+
+SCHEMA_VERSION = 1
+
+# Same patterns as the backend's DiffExtractor
+_TEST_FILE_RE = re.compile(
+    r"test_.*\.py$|.*_test\.py$|tests/.*\.py$|.*\.test\.(js|ts|tsx)$"
+    r"|.*\.spec\.(js|ts|tsx)$|__tests__/.*\.(js|ts|tsx)$"
+)
+_TEST_FUNCTION_RE = re.compile(r"\s*(?:def test_|async def test_|it\(|test\(|describe\()")
+_SKIP_RE = re.compile(r"@pytest\.mark\.skip|@unittest\.skip|\.skip\(|xfail")
+_FILE_HEADER_RE = re.compile(r"^diff --git .* b/(.+)$")
+
+
+def write_evidence(run_id: str, output_dir: Path) -> Path:
+    """Summarise the grader's outputs into output_dir/evidence.json."""
+    evidence = {
+        "schema_version": SCHEMA_VERSION,
+        "run_id": run_id,
+        "generated_at": datetime.utcnow().isoformat(),
+        "sources": [],
+        "metrics": {},
+        "artifacts": {},
+    }
+
+    for name, summarise in (
+        ("diff.patch", summarise_diff),
+        ("pytest_report.json", summarise_pytest_report),
+        ("coverage.xml", summarise_coverage),
+    ):
+        path = output_dir / name
+        if not path.exists():
+            continue
+        try:
+            metrics, metadata = summarise(path)
+        except Exception as e:
+            # Left to the backend, which parses the artifact itself
+            print(f"[grader] Could not summarise {name}: {e}")
+            continue
+        evidence["sources"].append(name)
+        evidence["metrics"].update(metrics)
+        evidence["artifacts"][name] = metadata
+
+    evidence_path = output_dir / "evidence.json"
+    evidence_path.write_text(json.dumps(evidence, separators=(",", ":")))
+    return evidence_path
+
+
+def summarise_diff(path: Path) -> tuple[dict, dict]:
+    """Diff metrics, reading the patch line by line."""
+    files_changed = []
+    test_files_changed = []
+    lines_added = lines_removed = tests_added = skipped_added = 0
+
+    # newline="\n": split on LF only, as git does
+    with open(path, encoding="utf-8", errors="replace", newline="\n") as f:
+        for line in f:
+            line = line.rstrip("\n")
+            if line.startswith("+"):
+                if line.startswith("+++"):
+                    continue
+                lines_added += 1
+                if _TEST_FUNCTION_RE.match(line, 1):
+                    tests_added += 1
+                if ("skip" in line or "xfail" in line) and _SKIP_RE.search(line, 1):
+                    skipped_added += 1
+            elif line.startswith("-"):
+                if not line.startswith("---"):
+                    lines_removed += 1
+            elif line.startswith("diff --git"):
+                match = _FILE_HEADER_RE.match(line)
+                if match:
+                    files_changed.append(match.group(1))
+                    if _TEST_FILE_RE.search(match.group(1)):
+                        test_files_changed.append(match.group(1))
+
+    metrics = {
+        "test_added": tests_added > 0 or bool(test_files_changed),
+        "tests_added_count": tests_added,
+        "skipped_tests_added": skipped_added,
+        "test_files_changed": len(test_files_changed),
+        "files_changed_count": len(files_changed),
+        "lines_added": lines_added,
+        "lines_removed": lines_removed,
+    }
+    return metrics, {"files_changed": files_changed, "test_files_changed": test_files_changed}
+
+
+def summarise_pytest_report(path: Path) -> tuple[dict, dict]:
+    """Test counts and failures from pytest-json-report output."""
+    with open(path) as f:
+        report = json.load(f)
+
+    summary = report.get("summary", {})
+    passed = summary.get("passed", 0)
+    failed = summary.get("failed", 0)
+    skipped = summary.get("skipped", 0)
+    errors = summary.get("error", 0)
+
+    failed_tests = [
+        test.get("nodeid", "")
+        for test in report.get("tests", [])
+        if test.get("outcome") in ("failed", "error")
+    ]
+
+    metrics = {
+        "total_tests": summary.get("total", passed + failed + skipped + errors),
+        "passed_tests": passed,
+        "failed_tests_count": failed,
+        "skipped_tests": skipped,
+        "test_error_count": errors,
+    }
+    return metrics, {"failed_test_names": failed_tests[:50]}
+
+
+def summarise_coverage(path: Path) -> tuple[dict, dict]:
+    """Coverage totals from a Cobertura report, streamed with iterparse."""
+    line_rate = "0"
+    branch_rate = None
+    lines_covered = lines_total = 0
+    uncovered_files = set()
+
+    for _, elem in ET.iterparse(path):
+        if elem.tag == "class":
+            # Direct children only: <methods> repeat the class's lines
+            for line in elem.iterfind("lines/line"):
+                lines_total += 1
+                if int(line.get("hits", "0")) > 0:
+                    lines_covered += 1
+                else:
+                    uncovered_files.add(elem.get("filename", "unknown"))
+            elem.clear()
+        elif elem.tag == "package":
+            elem.clear()
+        elif elem.tag == "coverage":
+            line_rate = elem.get("line-rate", "0")
+            branch_rate = elem.get("branch-rate")
+
+    metrics = {
+        "coverage_percent": round(float(line_rate) * 100, 2),
+        "lines_covered": lines_covered,
+        "lines_total": lines_total,
+    }
+    if branch_rate and float(branch_rate):
+        metrics["branch_coverage_percent"] = round(float(branch_rate) * 100, 2)
+    return metrics, {"uncovered_files_count": len(uncovered_files)}
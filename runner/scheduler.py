@@ -0,0 +1,153 @@
+"""Priority lanes and weighted fair-share dequeue across orgs.
+
+The backend enqueues each job onto a per-org list inside a priority lane
+(see app/services/job_queue.py). Redis layout, with q = job_queue:
+
+- {q}:lane:{lane}:org:{org_id}  list of pending jobs for one org
+- {q}:lane:{lane}:orgs          set of orgs with pending jobs in the lane
+- {q}:lane:{lane}:pass          hash org_id -> virtual pass (fair-share clock)
+- {q}:weights                   hash org_id -> weight (default 1)
+- {q}:signal                    single-token list pushed on every enqueue
+- {q}:stats:{org_id}            hash of dequeue count and wait-time totals
+
+Lanes are strictly prioritised: grading jobs always run before bootstrap
+jobs. Within a lane, orgs are served by stride scheduling: each dequeue
+advances the org's pass by 1/weight and the active org with the lowest
+pass goes next, so an org with a large backlog cannot starve the others.
+The legacy single list {q} is drained last for jobs from older producers.
+"""
+
+import json
+import time
+from collections.abc import Callable
+
+import redis
+import structlog
+
+from runner.config import RunnerConfig
+
+logger = structlog.get_logger(__name__)
+
+LANES = ("grade", "bootstrap")
+
+
+class FairShareScheduler:
+    """Chooses which org queue the next job is taken from."""
+
+    def __init__(self, client: redis.Redis, config: RunnerConfig):
+        self.redis = client
+        self.config = config
+        self.queue = config.job_queue
+        self.signal_key = f"{self.queue}:signal"
+        self.weights_key = f"{self.queue}:weights"
+
+    def pop(self, take: Callable[[str], str | None]) -> str | None:
+        """Take the next job, or block up to poll_timeout if all queues are empty.
+
+        Args:
+            take: Non-blocking pop from a list key (plain RPOP, or a move into
+                a processing list for the reliable queue)
+        """
+        job_data = self._pop_once(take)
+        if job_data is not None:
+            return job_data
+
+        # Nothing pending: sleep until an enqueue signals, then try again
+        if self.redis.brpop(self.signal_key, timeout=self.config.poll_timeout) is None:
+            return None
+        return self._pop_once(take)
+
+    def queue_key_for(self, job_data: str) -> str:
+        """The list a job was (or should be) enqueued on."""
+        try:
+            job = json.loads(job_data)
+        except json.JSONDecodeError:
+            return self.queue
+
+        org_id = job.get("org_id")
+        lane = job.get("lane")
+        if not org_id or lane not in LANES:
+            return self.queue
+        return self._org_key(lane, org_id)
+
+    def push_front(self, pipe: redis.client.Pipeline, job_data: str) -> None:
+        """Queue a redelivered job so it is the next one taken for its org."""
+        key = self.queue_key_for(job_data)
+        pipe.rpush(key, job_data)
+
+        if key != self.queue:
+            job = json.loads(job_data)
+            pipe.sadd(self._active_key(job["lane"]), job["org_id"])
+        pipe.lpush(self.signal_key, 1)
+        pipe.ltrim(self.signal_key, 0, 0)
+
+    def _pop_once(self, take: Callable[[str], str | None]) -> str | None:
+        for lane in LANES:
+            for org_id in self._orgs_by_pass(lane):
+                job_data = take(self._org_key(lane, org_id))
+                if job_data is not None:
+                    self._record_dequeue(lane, org_id, job_data)
+                    return job_data
+                self._deactivate(lane, org_id)
+
+        return take(self.queue)
+
+    def _orgs_by_pass(self, lane: str) -> list[str]:
+        """Active orgs in the lane, lowest virtual pass first."""
+        orgs = self.redis.smembers(self._active_key(lane))
+        if not orgs:
+            return []
+
+        passes = self.redis.hgetall(self._pass_key(lane))
+        known = [float(passes[o]) for o in orgs if o in passes]
+        floor = min(known) if known else 0.0
+
+        # Newly active orgs join at the current minimum instead of 0, so they
+        # get their fair share going forward rather than a burst to catch up
+        new_orgs = {o: floor for o in orgs if o not in passes}
+        if new_orgs:
+            self.redis.hset(self._pass_key(lane), mapping=new_orgs)
+            passes.update({o: str(p) for o, p in new_orgs.items()})
+
+        return sorted(orgs, key=lambda o: float(passes[o]))
+
+    def _deactivate(self, lane: str, org_id: str) -> None:
+        """Drop an org whose queue is empty from the lane."""
+        pipe = self.redis.pipeline()
+        pipe.srem(self._active_key(lane), org_id)
+        pipe.hdel(self._pass_key(lane), org_id)
+        pipe.execute()
+
+        # An enqueue may have raced with the removal
+        if self.redis.llen(self._org_key(lane, org_id)) > 0:
+            self.redis.sadd(self._active_key(lane), org_id)
+
+    def _record_dequeue(self, lane: str, org_id: str, job_data: str) -> None:
+        weight = float(self.redis.hget(self.weights_key, org_id) or 1.0)
+
+        wait_seconds = 0.0
+        try:
+            enqueued_at = json.loads(job_data).get("enqueued_at")
+            if enqueued_at:
+                wait_seconds = max(0.0, time.time() - float(enqueued_at))
+        except (json.JSONDecodeError, TypeError, ValueError):
+            pass
+
+        stats_key = f"{self.queue}:stats:{org_id}"
+        pipe = self.redis.pipeline()
+        pipe.hincrbyfloat(self._pass_key(lane), org_id, 1.0 / max(weight, 0.001))
+        pipe.hincrby(stats_key, "dequeued", 1)
+        pipe.hincrbyfloat(stats_key, "wait_seconds_total", wait_seconds)
+        pipe.hset(stats_key, "last_wait_seconds", wait_seconds)
+        pipe.execute()
+
+        logger.info("Job dequeued", org_id=org_id, lane=lane, wait_seconds=round(wait_seconds, 3))
+
+    def _org_key(self, lane: str, org_id: str) -> str:
+        return f"{self.queue}:lane:{lane}:org:{org_id}"
+
+    def _active_key(self, lane: str) -> str:
+        return f"{self.queue}:lane:{lane}:orgs"
+
+    def _pass_key(self, lane: str) -> str:
+        return f"{self.queue}:lane:{lane}:pass"
@@ -0,0 +1,207 @@
+"""Content-addressed cache of simulation templates.
+
+Each simulation directory is snapshotted once per content version into
+template_cache_path/<simulation_id>-<digest>. The snapshot is read-only
+and bind-mounted read-only at /sim.
+
+Each run's work directory gets its own copy of the snapshot's files, never
+hardlinks: candidate code runs as a user that can chmod a file in its
+workspace and overwrite it in place, which through a shared inode would
+change the template for every later run. Copies are made with
+copy_file_range, so filesystems that support it (XFS, btrfs) share the
+extents copy-on-write instead of duplicating every byte.
+
+The digest of the snapshot's own files is recorded when it is built, and
+verify() is called after every run. A snapshot that no longer matches is
+removed, so the next run of that simulation rebuilds it.
+
+Old versions are evicted once they are no longer the current version and
+have not been used for longer than the sandbox timeout.
+"""
+
+import hashlib
+import os
+import re
+import shutil
+import stat
+import tempfile
+import threading
+import time
+from pathlib import Path
+
+import structlog
+
+from runner.config import RunnerConfig
+
+logger = structlog.get_logger(__name__)
+
+LAST_USED_FILE = ".last_used"
+DIGEST_FILE = ".digest"  # Content digest of the snapshot, checked by verify()
+DIGEST_LENGTH = 16  # Hex digits of the content digest in snapshot names
+
+
+class TemplateCache:
+    """Builds and hands out read-only simulation template snapshots."""
+
+    def __init__(self, config: RunnerConfig):
+        self.config = config
+        self.root = Path(config.template_cache_path)
+        self.root.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+        # stat signature of a sim dir -> content digest, so unchanged sims
+        # are not re-read on every run
+        self._digests: dict[tuple, str] = {}
+
+    def get(self, simulation_id: str) -> Path:
+        """Return the snapshot directory for the current version of a simulation."""
+        sim_path = Path(self.config.sims_path) / simulation_id
+        if not sim_path.exists():
+            raise FileNotFoundError(f"Simulation not found: {sim_path}")
+
+        digest = self._digest(sim_path)
+        template = self.root / f"{simulation_id}-{digest[:DIGEST_LENGTH]}"
+
+        with self._lock:
+            if not template.exists():
+                self._build(sim_path, template)
+                self._evict(simulation_id, keep=template)
+
+        (template / LAST_USED_FILE).touch()
+        return template
+
+    def materialize(self, template: Path, dest: Path) -> None:
+        """Populate dest with private copies of the template's files."""
+        shutil.copytree(
+            template,
+            dest,
+            copy_function=_clone_file,
+            ignore=shutil.ignore_patterns(LAST_USED_FILE, DIGEST_FILE),
+            dirs_exist_ok=True,
+        )
+        # copytree copies the template's read-only dir modes; the run needs
+        # to create files (pytest cache, coverage) next to the copied ones
+        for dirpath, _, _ in os.walk(dest):
+            os.chmod(dirpath, 0o755)
+
+    def verify(self, template: Path) -> bool:
+        """Check a snapshot against the digest recorded when it was built.
+
+        A snapshot that changed (or lost its digest) is removed, so the next
+        get() rebuilds it from the simulation directory.
+        """
+        with self._lock:
+            if not template.exists():
+                return True
+            try:
+                expected = (template / DIGEST_FILE).read_text()
+            except OSError:
+                expected = None
+            if expected == _content_digest(template):
+                return True
+
+            logger.error("Template snapshot modified, removing it", template=str(template))
+            _make_writable(template)
+            shutil.rmtree(template, ignore_errors=True)
+            return False
+
+    def _digest(self, sim_path: Path) -> str:
+        files = sorted(p for p in sim_path.rglob("*") if p.is_file())
+        signature = tuple(
+            (str(p.relative_to(sim_path)), st.st_size, st.st_mtime_ns)
+            for p in files
+            for st in [p.stat()]
+        )
+
+        if signature not in self._digests:
+            self._digests[signature] = _hash_files(sim_path, files)
+
+        return self._digests[signature]
+
+    def _build(self, sim_path: Path, template: Path) -> None:
+        """Copy the simulation into a temp dir, lock it down, then rename into place."""
+        staging = Path(tempfile.mkdtemp(prefix=".staging-", dir=self.root))
+        try:
+            shutil.copytree(
+                sim_path,
+                staging,
+                dirs_exist_ok=True,
+                ignore=shutil.ignore_patterns("__pycache__", ".pytest_cache"),
+            )
+            (staging / DIGEST_FILE).write_text(_content_digest(staging))
+            (staging / LAST_USED_FILE).touch()
+            _make_read_only(staging)
+            os.rename(staging, template)
+        except Exception:
+            _make_writable(staging)
+            shutil.rmtree(staging, ignore_errors=True)
+            raise
+
+        logger.info("Template built", simulation_id=sim_path.name, template=str(template))
+
+    def _evict(self, simulation_id: str, keep: Path) -> None:
+        """Remove stale versions of a simulation that are no longer in use."""
+        cutoff = time.time() - self.config.sandbox_timeout
+        # Exactly <simulation_id>-<digest>: "bugfix-*" would also match "bugfix-v2-<digest>"
+        own_version = re.compile(rf"{re.escape(simulation_id)}-[0-9a-f]{{{DIGEST_LENGTH}}}")
+
+        for template in self.root.glob(f"{simulation_id}-*"):
+            if template == keep or not own_version.fullmatch(template.name):
+                continue
+
+            last_used = template / LAST_USED_FILE
+            if last_used.exists() and last_used.stat().st_mtime > cutoff:
+                continue
+
+            _make_writable(template)
+            shutil.rmtree(template, ignore_errors=True)
+            logger.info("Template evicted", simulation_id=simulation_id, template=str(template))
+
+
+def _hash_files(root: Path, files: list[Path]) -> str:
+    h = hashlib.sha256()
+    for p in files:
+        h.update(str(p.relative_to(root)).encode("utf-8"))
+        h.update(b"\0")
+        h.update(p.read_bytes())
+        h.update(b"\0")
+    return h.hexdigest()
+
+
+def _content_digest(template: Path) -> str:
+    """Digest of a snapshot's files, excluding the cache's own bookkeeping."""
+    files = sorted(
+        p for p in template.rglob("*") if p.is_file() and p.name not in (LAST_USED_FILE, DIGEST_FILE)
+    )
+    return _hash_files(template, files)
+
+
+def _clone_file(src: str, dst: str) -> None:
+    """Copy a file, sharing extents copy-on-write where the filesystem can."""
+    with open(src, "rb") as fsrc, open(dst, "wb") as fdst:
+        try:
+            remaining = os.fstat(fsrc.fileno()).st_size
+            while remaining > 0:
+                copied = os.copy_file_range(fsrc.fileno(), fdst.fileno(), remaining)
+                if copied == 0:
+                    break
+                remaining -= copied
+        except (AttributeError, OSError):
+            # No copy_file_range (non-Linux) or not across these filesystems
+            fsrc.seek(0)
+            fdst.seek(0)
+            fdst.truncate()
+            shutil.copyfileobj(fsrc, fdst)
+    shutil.copystat(src, dst)
+
+
+def _make_read_only(root: Path) -> None:
+    for dirpath, _, filenames in os.walk(root):
+        for name in filenames:
+            if name != LAST_USED_FILE:
+                os.chmod(Path(dirpath) / name, stat.S_IRUSR | stat.S_IRGRP | stat.S_IROTH)
+        os.chmod(dirpath, 0o555)
+
+
+def _make_writable(root: Path) -> None:
+    for dirpath, _, _ in os.walk(root):
+        os.chmod(dirpath, 0o755)
@@ -0,0 +1,25 @@
+"""Pytest configuration and fixtures."""
+
+import fakeredis
+import pytest
+
+from runner.config import RunnerConfig
+
+
+@pytest.fixture
+def redis_client():
+    """In-memory Redis returning str values, like the runner's client."""
+    return fakeredis.FakeRedis(decode_responses=True)
+
+
+@pytest.fixture
+def config(tmp_path):
+    """Runner config pointing at temporary directories."""
+    return RunnerConfig(
+        redis_url="redis://localhost:6379/0",
+        job_queue="test:jobs",
+        poll_timeout=1,
+        worker_id="worker-1",
+        sims_path=str(tmp_path / "sims"),
+        template_cache_path=str(tmp_path / "templates"),
+    )
@@ -0,0 +1,124 @@
+"""Tests for runner configuration."""
+
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from runner.config import parse_memory
+from runner.runner import Runner
+
+
+class TestParseMemory:
+    """Tests for parse_memory."""
+
+    def test_parses_docker_sizes(self):
+        """Should accept Docker-style suffixes, case-insensitively."""
+        assert parse_memory("512m") == 512 * 1024**2
+        assert parse_memory("2G") == 2 * 1024**3
+        assert parse_memory("1.5g") == int(1.5 * 1024**3)
+        assert parse_memory("64k") == 64 * 1024
+        assert parse_memory("100b") == 100
+        assert parse_memory(" 1024 ") == 1024
+
+    def test_rejects_garbage(self):
+        """Should raise ValueError for sizes it cannot parse."""
+        with pytest.raises(ValueError):
+            parse_memory("lots")
+
+
+class TestEffectiveSlots:
+    """Tests for RunnerConfig.effective_slots."""
+
+    def test_capped_by_cpu_budget(self, config):
+        """Should run no more sandboxes than the CPU budget fits."""
+        config.worker_slots = 8
+        config.sandbox_cpu_limit = 1.5
+        config.host_cpu_budget = 4
+        config.host_memory_budget = "64g"
+
+        assert config.effective_slots == 2
+
+    def test_capped_by_memory_budget(self, config):
+        """Should run no more sandboxes than the memory budget fits."""
+        config.worker_slots = 8
+        config.sandbox_memory_limit = "512m"
+        config.host_cpu_budget = 16
+        config.host_memory_budget = "1500m"
+
+        assert config.effective_slots == 2
+
+    def test_uses_requested_slots_when_they_fit(self, config):
+        """Should use worker_slots when both budgets have room."""
+        config.worker_slots = 3
+        config.host_cpu_budget = 16
+        config.host_memory_budget = "16g"
+
+        assert config.effective_slots == 3
+
+    def test_at_least_one_slot(self, config):
+        """Should keep one slot even if a single sandbox exceeds the budgets."""
+        config.worker_slots = 4
+        config.sandbox_cpu_limit = 8
+        config.host_cpu_budget = 2
+        config.host_memory_budget = "256m"
+
+        assert config.effective_slots == 1
+
+    def test_defaults_to_host_resources(self, config):
+        """Should fall back to the host's CPU count when no budget is set."""
+        config.worker_slots = 1000
+        config.sandbox_cpu_limit = 1
+        config.sandbox_memory_limit = "1m"
+
+        assert config.effective_slots == os.cpu_count()
+
+
+class FakeQueue:
+    """Job queue handing out a fixed list of jobs."""
+
+    def __init__(self, jobs: list[str]):
+        self.jobs = jobs
+
+    def pop(self) -> str | None:
+        return self.jobs.pop(0) if self.jobs else None
+
+
+class TestWorkerSlots:
+    """Tests for running jobs on worker slots."""
+
+    def setup_method(self):
+        self.runner = Runner.__new__(Runner)
+        self.runner.queue = FakeQueue(['{"run_id": "run_1"}'])
+        self.runner._slot_semaphore = threading.BoundedSemaphore(1)
+        self.runner._executor = ThreadPoolExecutor(max_workers=1)
+        self.started = threading.Event()
+        self.release = threading.Event()
+
+        def execute(_job_data):
+            self.started.set()
+            self.release.wait(5)
+
+        self.runner._execute_job = execute
+
+    def teardown_method(self):
+        self.release.set()
+        self.runner._executor.shutdown(wait=True)
+
+    def test_slot_held_until_job_finishes(self):
+        """Should keep the slot taken while the job runs and free it afterwards."""
+        assert self.runner._slot_semaphore.acquire(timeout=1)
+        assert self.runner._process_next_job() is True
+        assert self.started.wait(5)
+
+        assert not self.runner._slot_semaphore.acquire(timeout=0.05)
+
+        self.release.set()
+        assert self.runner._slot_semaphore.acquire(timeout=5)
+
+    def test_empty_queue_submits_nothing(self):
+        """Should report that no job was submitted when the queue is empty."""
+        self.runner.queue = FakeQueue([])
+
+        assert self.runner._process_next_job() is False
@@ -0,0 +1,162 @@
+"""Tests for the warm container pool."""
+
+from pathlib import Path
+
+import docker
+import pytest
+
+from runner.container_pool import ContainerPool
+
+
+class FakeContainer:
+    """Container recording the lifecycle calls made on it."""
+
+    def __init__(self):
+        self.paused = False
+        self.removed = False
+        self.fail_unpause = False
+
+    def pause(self):
+        self.paused = True
+
+    def unpause(self):
+        if self.fail_unpause:
+            raise docker.errors.APIError("container is dead")
+        self.paused = False
+
+    def remove(self, force=False):
+        assert force
+        self.removed = True
+
+
+class FakeContainers:
+    """docker_client.containers, creating FakeContainers."""
+
+    def __init__(self):
+        self.created: list[FakeContainer] = []
+        self.run_kwargs: list[dict] = []
+
+    def run(self, **kwargs):
+        self.run_kwargs.append(kwargs)
+        container = FakeContainer()
+        self.created.append(container)
+        return container
+
+
+class FakeTemplates:
+    """Template cache handing out a fixed snapshot per simulation."""
+
+    def __init__(self, root: Path):
+        self.root = root
+        self.version = "v1"
+
+    def get(self, simulation_id: str) -> Path:
+        return self.root / f"{simulation_id}-{self.version}"
+
+
+class InlineExecutor:
+    """Runs submitted work immediately, so pool refills are deterministic."""
+
+    def submit(self, fn, *args):
+        fn(*args)
+
+    def shutdown(self, wait=True, cancel_futures=False):
+        pass
+
+
+class TestContainerPool:
+    """Tests for ContainerPool."""
+
+    @pytest.fixture(autouse=True)
+    def setup(self, config, tmp_path):
+        config.warm_pool_size = 2
+        self.docker_client = type("FakeDocker", (), {"containers": FakeContainers()})()
+        self.templates = FakeTemplates(tmp_path / "templates")
+        self.image = "proofhire-sandbox:latest"
+        self.pool = ContainerPool(config, self.docker_client, self.templates, lambda *_: self.image)
+        self.pool._executor = InlineExecutor()
+        (Path(config.sims_path) / "bugfix_v1").mkdir(parents=True)
+
+    @property
+    def created(self) -> list[FakeContainer]:
+        return self.docker_client.containers.created
+
+    def acquire(self):
+        return self.pool.acquire("bugfix_v1", self.templates.get("bugfix_v1"), self.image)
+
+    def test_start_warms_every_simulation(self):
+        """Should create paused containers up to the target size per simulation."""
+        self.pool.start()
+
+        assert len(self.created) == 2
+        assert all(c.paused for c in self.created)
+        kwargs = self.docker_client.containers.run_kwargs[0]
+        assert kwargs["volumes"][str(self.templates.get("bugfix_v1"))] == {"bind": "/sim", "mode": "ro"}
+
+    def test_empty_pool_falls_back_and_refills(self):
+        """Should return None when nothing is warm and schedule a replacement."""
+        assert self.acquire() is None
+
+        assert self.pool._get_pool("bugfix_v1").qsize() == 1
+
+    def test_checkout_unpauses_and_replaces(self):
+        """Should hand out a warm container unpaused and create its replacement."""
+        self.pool.start()
+
+        warm = self.acquire()
+
+        assert warm is not None
+        assert not warm.container.paused
+        assert warm.workspace.is_dir()
+        assert self.pool._get_pool("bugfix_v1").qsize() == 2
+        assert len(self.created) == 3
+
+    def test_returned_container_is_destroyed(self):
+        """Should remove a used container and its workspace instead of reusing it."""
+        self.pool.start()
+        warm = self.acquire()
+
+        self.pool.discard(warm)
+
+        assert warm.container.removed
+        assert not warm.workspace.exists()
+        assert self.acquire().container is not warm.container
+
+    def test_evicts_containers_for_an_old_template(self):
+        """Should destroy containers built from an older template version."""
+        self.pool.start()
+        stale = list(self.created)
+        self.templates.version = "v2"
+
+        warm = self.acquire()
+
+        # Both stale containers were evicted; the refill uses the new template
+        assert warm is None
+        assert all(c.removed for c in stale)
+        assert self.acquire().template == self.templates.get("bugfix_v1")
+
+    def test_evicts_containers_for_another_image(self):
+        """Should not hand out a container created from a different image."""
+        self.pool.start()
+        self.image = "proofhire-sim-bugfix_v1:abc"
+
+        assert self.acquire() is None
+        assert sum(c.removed for c in self.created) == 2
+
+    def test_discards_container_that_fails_to_unpause(self):
+        """Should destroy a container that cannot be unpaused and fall back."""
+        self.pool.start()
+        broken = self.pool._get_pool("bugfix_v1").queue[0].container
+        broken.fail_unpause = True
+
+        assert self.acquire() is None
+        assert broken.removed
+
+    def test_shutdown_destroys_idle_containers(self):
+        """Should destroy idle containers and stop handing out new ones."""
+        self.pool.start()
+
+        self.pool.shutdown()
+
+        assert all(c.removed for c in self.created)
+        assert self.acquire() is None
@@ -0,0 +1,240 @@
+"""Tests for simulation job handling, artifact uploads and metric parsing."""
+
+import hashlib
+import io
+import json
+import os
+from dataclasses import replace
+
+import boto3
+import pytest
+from moto import mock_aws
+
+from runner.job_handlers import (
+    ArtifactUploader,
+    _HashingReader,
+    handle_simulation_job,
+    parse_metrics,
+)
+from runner.sandbox import SandboxResult
+
+BUCKET = "test-artifacts"
+
+
+@pytest.fixture
+def s3_config(config):
+    """Runner config pointing at a mocked S3 bucket."""
+    return replace(
+        config,
+        s3_endpoint="https://s3.us-east-1.amazonaws.com",
+        s3_bucket=BUCKET,
+        s3_access_key="testing",
+        s3_secret_key="testing",
+        upload_concurrency=2,
+        multipart_threshold_mb=5,
+    )
+
+
+@pytest.fixture
+def uploader(s3_config, monkeypatch):
+    """Uploader backed by moto with an existing bucket."""
+    monkeypatch.setenv("AWS_DEFAULT_REGION", "us-east-1")
+    with mock_aws():
+        boto3.client("s3", region_name="us-east-1").create_bucket(Bucket=BUCKET)
+        uploader = ArtifactUploader(s3_config)
+        yield uploader
+        uploader.shutdown()
+
+
+def _write(tmp_path, name: str, data: bytes) -> str:
+    path = tmp_path / name
+    path.write_bytes(data)
+    return str(path)
+
+
+class TestHashingReader:
+    """Tests for the hashing file wrapper."""
+
+    def test_hashes_and_counts_all_reads(self):
+        """Should hash and count every byte read, across chunked reads."""
+        data = os.urandom(10_000)
+        reader = _HashingReader(io.BytesIO(data))
+
+        chunks = []
+        while chunk := reader.read(4096):
+            chunks.append(chunk)
+
+        assert b"".join(chunks) == data
+        assert reader.size == len(data)
+        assert reader.sha256.hexdigest() == hashlib.sha256(data).hexdigest()
+
+    def test_read_all(self):
+        """Should hash a single unbounded read."""
+        reader = _HashingReader(io.BytesIO(b"hello"))
+
+        assert reader.read() == b"hello"
+        assert reader.read() == b""
+        assert reader.size == 5
+        assert reader.sha256.hexdigest() == hashlib.sha256(b"hello").hexdigest()
+
+    def test_not_seekable(self):
+        """Should report itself as non-seekable."""
+        assert _HashingReader(io.BytesIO(b"")).seekable() is False
+
+
+class TestArtifactUploader:
+    """Tests for ArtifactUploader against a mocked S3."""
+
+    def test_upload_reports_hash_and_size(self, uploader, tmp_path):
+        """Should report the digest and size of the stored object."""
+        data = json.dumps({"tests_passed": 3}).encode()
+        path = _write(tmp_path, "metrics.json", data)
+
+        uploaded = uploader.upload("run_1", {"metrics.json": path})
+
+        artifact = uploaded["metrics.json"]
+        assert artifact.key == "runs/run_1/metrics.json"
+        assert artifact.size_bytes == len(data)
+        assert artifact.sha256 == hashlib.sha256(data).hexdigest()
+        assert artifact.url.startswith("https://")
+
+        stored = uploader.s3_client.get_object(Bucket=BUCKET, Key=artifact.key)
+        assert stored["Body"].read() == data
+        assert stored["ContentType"] == "application/json"
+
+    def test_multipart_upload_hash_and_size(self, uploader, tmp_path):
+        """Should hash multipart uploads in order, matching the stored bytes."""
+        data = os.urandom(12 * 1024 * 1024 + 123)
+        path = _write(tmp_path, "trace.bin", data)
+
+        artifact = uploader.upload("run_1", {"trace.bin": path})["trace.bin"]
+
+        assert artifact.size_bytes == len(data)
+        assert artifact.sha256 == hashlib.sha256(data).hexdigest()
+        stored = uploader.s3_client.get_object(Bucket=BUCKET, Key=artifact.key)
+        assert stored["Body"].read() == data
+
+    def test_empty_file(self, uploader, tmp_path):
+        """Should upload empty artifacts with the empty digest."""
+        path = _write(tmp_path, "stderr.txt", b"")
+
+        artifact = uploader.upload("run_1", {"stderr.txt": path})["stderr.txt"]
+
+        assert artifact.size_bytes == 0
+        assert artifact.sha256 == hashlib.sha256(b"").hexdigest()
+
+    def test_concurrent_uploads_keep_per_artifact_hashes(self, uploader, tmp_path):
+        """Should not mix up digests of artifacts uploaded concurrently."""
+        contents = {f"file_{i}.txt": os.urandom(50_000 + i) for i in range(6)}
+        artifacts = {name: _write(tmp_path, name, data) for name, data in contents.items()}
+
+        uploaded = uploader.upload("run_2", artifacts)
+
+        assert set(uploaded) == set(contents)
+        for name, data in contents.items():
+            assert uploaded[name].size_bytes == len(data)
+            assert uploaded[name].sha256 == hashlib.sha256(data).hexdigest()
+
+    def test_failed_upload_left_out(self, uploader, tmp_path):
+        """Should leave artifacts that fail to upload out of the result."""
+        good = _write(tmp_path, "ok.txt", b"ok")
+
+        uploaded = uploader.upload(
+            "run_3", {"ok.txt": good, "missing.txt": str(tmp_path / "missing.txt")}
+        )
+
+        assert set(uploaded) == {"ok.txt"}
+
+
+class TestParseMetrics:
+    """Tests for parse_metrics."""
+
+    def test_merges_grader_metrics(self, tmp_path):
+        """Should merge grader_output metrics over metrics.json."""
+        artifacts = {
+            "metrics.json": _write(tmp_path, "metrics.json", b'{"a": 1, "b": 1}'),
+            "grader_output.json": _write(
+                tmp_path, "grader_output.json", b'{"metrics": {"b": 2}}'
+            ),
+        }
+
+        assert parse_metrics(artifacts) == {"a": 1, "b": 2}
+
+    def test_invalid_json(self, tmp_path):
+        """Should ignore unparseable metrics files."""
+        artifacts = {"metrics.json": _write(tmp_path, "metrics.json", b"not json")}
+
+        assert parse_metrics(artifacts) == {}
+
+
+class FakeSandboxManager:
+    """Returns a fixed sandbox result."""
+
+    def __init__(self, result: SandboxResult):
+        self.result = result
+
+    def execute(self, simulation_id, candidate_code, candidate_writeup, run_id) -> SandboxResult:
+        self.executed = (simulation_id, candidate_code, candidate_writeup, run_id)
+        return self.result
+
+
+class FakeNotifier:
+    """Records notifications instead of queuing them."""
+
+    def __init__(self):
+        self.notified: list[tuple[str, dict]] = []
+
+    def notify(self, run_id: str, payload: dict) -> None:
+        self.notified.append((run_id, payload))
+
+
+class TestHandleSimulationJob:
+    """Tests for handle_simulation_job."""
+
+    JOB = {"run_id": "run_1", "simulation_id": "bugfix_v1", "candidate_writeup": "## Root cause"}
+
+    def _result(self, tmp_path, success: bool = True) -> SandboxResult:
+        artifacts_dir = tmp_path / "artifacts"
+        artifacts_dir.mkdir()
+        artifacts = {
+            "metrics.json": _write(artifacts_dir, "metrics.json", b'{"tests_passed": true}'),
+            "writeup.md": _write(artifacts_dir, "writeup.md", b"## Root cause"),
+        }
+        return SandboxResult(
+            success=success,
+            exit_code=0 if success else 1,
+            stdout="",
+            stderr="",
+            duration_seconds=1.0,
+            artifacts=artifacts,
+            artifacts_dir=str(artifacts_dir),
+        )
+
+    def test_uploads_writeup_and_notifies(self, uploader, tmp_path):
+        """Should upload every artifact, the writeup included, and report them."""
+        result = self._result(tmp_path)
+        notifier = FakeNotifier()
+
+        outcome = handle_simulation_job(self.JOB, FakeSandboxManager(result), uploader, notifier)
+
+        assert outcome["success"] is True
+        [(run_id, payload)] = notifier.notified
+        assert run_id == "run_1"
+        assert set(payload["artifact_urls"]) == {"metrics.json", "writeup.md"}
+        assert payload["artifact_hashes"]["writeup.md"] == hashlib.sha256(b"## Root cause").hexdigest()
+        assert payload["metrics"] == {"tests_passed": True}
+        stored = uploader.s3_client.get_object(Bucket=BUCKET, Key="runs/run_1/writeup.md")
+        assert stored["ContentType"] == "text/markdown"
+        # Local copies are removed once uploaded
+        assert not os.path.exists(result.artifacts_dir)
+
+    def test_failed_run_cleans_up(self, uploader, tmp_path):
+        """Should remove collected artifacts of a failed run without uploading them."""
+        result = self._result(tmp_path, success=False)
+        notifier = FakeNotifier()
+
+        outcome = handle_simulation_job(self.JOB, FakeSandboxManager(result), uploader, notifier)
+
+        assert outcome["success"] is False
+        assert notifier.notified == []
+        assert not os.path.exists(result.artifacts_dir)
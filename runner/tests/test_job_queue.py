@@ -0,0 +1,142 @@
+"""Tests for the runner's job queues."""
+
+import json
+
+import pytest
+
+from runner.job_queue import JobQueue, ReliableJobQueue, create_job_queue
+
+
+def make_job(run_id: str, org_id: str | None = None) -> str:
+    job = {"run_id": run_id, "type": "simulation"}
+    if org_id:
+        job.update(org_id=org_id, lane="grade")
+    return json.dumps(job)
+
+
+class TestCreateJobQueue:
+    """Tests for create_job_queue."""
+
+    def test_selects_delivery_mode(self, redis_client, config):
+        """Should use the reliable queue only when configured."""
+        assert type(create_job_queue(redis_client, config)) is JobQueue
+        config.reliable_queue = True
+        assert type(create_job_queue(redis_client, config)) is ReliableJobQueue
+
+
+class TestReliableJobQueue:
+    """Tests for ReliableJobQueue."""
+
+    @pytest.fixture(autouse=True)
+    def setup(self, redis_client, config):
+        config.max_deliveries = 2
+        self.redis = redis_client
+        self.config = config
+        self.dead_letters: list[str] = []
+        self.queue = ReliableJobQueue(redis_client, config, on_dead_letter=self.dead_letters.append)
+        self.queue.start()
+        yield
+        self.queue.stop()
+
+    def other_worker(self, worker_id: str) -> ReliableJobQueue:
+        self.config.worker_id = worker_id
+        return ReliableJobQueue(self.redis, self.config, on_dead_letter=self.dead_letters.append)
+
+    def test_pop_moves_job_into_processing_list(self):
+        """Should keep a popped job in the worker's processing list until acked."""
+        job = make_job("run_1")
+        self.redis.lpush(self.config.job_queue, job)
+
+        assert self.queue.pop() == job
+        assert self.redis.lrange(self.queue.processing_key, 0, -1) == [job]
+        assert self.redis.llen(self.config.job_queue) == 0
+
+        self.queue.ack(job)
+
+        assert self.redis.llen(self.queue.processing_key) == 0
+
+    def test_start_registers_and_heartbeats(self):
+        """Should register the worker and set a heartbeat with the visibility timeout."""
+        assert self.redis.sismember(self.queue.workers_key, "worker-1")
+        assert 0 < self.redis.ttl(self.queue.heartbeat_key) <= self.config.visibility_timeout
+
+    def test_redelivers_jobs_of_a_dead_worker_first(self):
+        """Should move a dead worker's unacked jobs back to the front of their queue."""
+        dead = self.other_worker("worker-2")
+        dead.start()
+        stuck, waiting = make_job("run_1", "org_a"), make_job("run_2", "org_a")
+        org_key = dead.scheduler.queue_key_for(stuck)
+        self.redis.lpush(org_key, stuck)
+        self.redis.sadd(f"{self.config.job_queue}:lane:grade:orgs", "org_a")
+        assert dead.pop() == stuck
+        dead._stop.set()
+        self.redis.lpush(org_key, waiting)
+
+        # The heartbeat expires without the worker acking its job
+        self.redis.delete(dead.heartbeat_key)
+        self.queue._reap_dead_workers()
+
+        assert self.redis.llen(dead.processing_key) == 0
+        assert not self.redis.sismember(self.queue.workers_key, "worker-2")
+        assert self.queue.pop() == stuck
+        assert self.queue.pop() == waiting
+
+    def test_only_one_worker_reaps(self):
+        """Should leave a dead worker to whichever live worker takes the reaping lock."""
+        dead = self.other_worker("worker-2")
+        dead.start()
+        dead._stop.set()
+        self.redis.lpush(dead.processing_key, make_job("run_1"))
+        self.redis.delete(dead.heartbeat_key)
+        self.redis.set(f"{self.config.job_queue}:reaping:worker-2", "worker-3")
+
+        self.queue._reap_dead_workers()
+
+        assert self.redis.llen(dead.processing_key) == 1
+
+    def test_live_workers_are_not_reaped(self):
+        """Should leave jobs of workers whose heartbeat is current alone."""
+        live = self.other_worker("worker-2")
+        live.start()
+        live._stop.set()
+        self.redis.lpush(live.processing_key, make_job("run_1"))
+
+        self.queue._reap_dead_workers()
+
+        assert self.redis.llen(live.processing_key) == 1
+
+    def test_dead_letters_after_max_deliveries(self):
+        """Should dead-letter a job delivered max_deliveries times and report it."""
+        job = make_job("run_1")
+        self.redis.lpush(self.config.job_queue, job)
+
+        for _ in range(self.config.max_deliveries):
+            assert self.queue.pop() == job
+            # As on a restart with the same worker id: the unacked job is recovered
+            self.queue._requeue(self.config.worker_id)
+
+        assert self.redis.llen(self.config.job_queue) == 0
+        assert self.redis.lrange(self.queue.dead_letter_key, 0, -1) == [job]
+        assert self.dead_letters == [job]
+        assert not self.redis.hexists(self.queue.deliveries_key, json.dumps(job))
+
+    def test_ack_clears_delivery_count(self):
+        """Should forget a job's deliveries once it is acked."""
+        job = make_job("run_1")
+        self.redis.lpush(self.config.job_queue, job)
+        self.queue.pop()
+        self.queue._requeue(self.config.worker_id)
+        assert self.redis.hlen(self.queue.deliveries_key) == 1
+
+        self.queue.ack(self.queue.pop())
+
+        assert self.redis.hlen(self.queue.deliveries_key) == 0
+
+    def test_stop_keeps_registration_while_jobs_are_unacked(self):
+        """Should stay registered on stop if jobs are still unacked, so they get redelivered."""
+        self.redis.lpush(self.config.job_queue, make_job("run_1"))
+        self.queue.pop()
+
+        self.queue.stop()
+
+        assert self.redis.sismember(self.queue.workers_key, "worker-1")
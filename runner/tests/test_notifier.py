@@ -0,0 +1,268 @@
+"""Tests for the backend notifier outbox."""
+
+import json
+import time
+
+import httpx
+import pytest
+
+from runner.notifier import BackendNotifier
+
+
+class FakeBackend:
+    """Records requests and answers them with a replaceable responder."""
+
+    def __init__(self):
+        self.requests: list[httpx.Request] = []
+        self.responder = lambda _: httpx.Response(200, json={})
+
+    def __call__(self, request: httpx.Request) -> httpx.Response:
+        self.requests.append(request)
+        return self.responder(request)
+
+    @property
+    def paths(self) -> list[str]:
+        return [r.url.path for r in self.requests]
+
+
+@pytest.fixture
+def backend():
+    return FakeBackend()
+
+
+@pytest.fixture
+def notifier(redis_client, config, backend):
+    notifier = BackendNotifier(redis_client, config)
+    notifier.http.close()
+    notifier.http = httpx.Client(
+        base_url=config.backend_url,
+        transport=httpx.MockTransport(backend),
+    )
+    yield notifier
+    notifier.http.close()
+
+
+def _entries(redis_client, key: str) -> list[dict]:
+    return [json.loads(m) for m in redis_client.zrange(key, 0, -1)]
+
+
+class TestOutbox:
+    """Tests for queuing, claiming and acking notifications."""
+
+    def test_notify_adds_due_entry(self, notifier, redis_client):
+        """Should add the entry to the outbox, due now."""
+        notifier.notify("run_1", {"success": True})
+
+        [(member, score)] = redis_client.zrange(notifier.outbox_key, 0, -1, withscores=True)
+        assert json.loads(member) == {"run_id": "run_1", "payload": {"success": True}, "attempts": 0}
+        assert score <= time.time()
+
+    def test_claim_moves_due_entries_in_flight(self, notifier, redis_client, config):
+        """Should move due entries to the in-flight set with a deadline."""
+        notifier.notify("run_1", {})
+        redis_client.zadd(notifier.outbox_key, {json.dumps({"run_id": "later"}): time.time() + 60})
+
+        claimed = notifier._claim_due()
+
+        assert [entry["run_id"] for _, entry in claimed] == ["run_1"]
+        assert [e["run_id"] for e in _entries(redis_client, notifier.outbox_key)] == ["later"]
+        [(_, deadline)] = redis_client.zrange(notifier.inflight_key, 0, -1, withscores=True)
+        assert deadline > time.time() + config.notify_claim_timeout - 5
+
+    def test_claim_respects_batch_size(self, notifier, redis_client, config):
+        """Should claim at most notify_batch_size entries at once."""
+        for i in range(config.notify_batch_size + 3):
+            notifier.notify(f"run_{i}", {})
+
+        assert len(notifier._claim_due()) == config.notify_batch_size
+        assert redis_client.zcard(notifier.outbox_key) == 3
+
+    def test_second_claim_gets_nothing(self, notifier):
+        """Should not hand the same entry out twice."""
+        notifier.notify("run_1", {})
+
+        assert len(notifier._claim_due()) == 1
+        assert notifier._claim_due() == []
+
+    def test_flush_single_entry(self, notifier, redis_client, backend):
+        """Should post a single entry to the per-run endpoint and ack it."""
+        notifier.notify("run_1", {"success": True})
+
+        notifier.flush()
+
+        assert backend.paths == ["/api/internal/runs/run_1/complete"]
+        assert json.loads(backend.requests[0].content) == {"success": True}
+        assert redis_client.zcard(notifier.outbox_key) == 0
+        assert redis_client.zcard(notifier.inflight_key) == 0
+
+    def test_flush_batches_due_entries(self, notifier, redis_client, backend):
+        """Should send several due entries in one batch request."""
+        notifier.notify("run_1", {"success": True})
+        notifier.notify("run_2", {"success": False})
+
+        notifier.flush()
+
+        assert backend.paths == ["/api/internal/runs/complete"]
+        body = json.loads(backend.requests[0].content)
+        assert sorted(r["run_id"] for r in body["runs"]) == ["run_1", "run_2"]
+        assert redis_client.zcard(notifier.inflight_key) == 0
+
+    def test_recover_expired_claims(self, notifier, redis_client):
+        """Should return entries whose claim deadline passed to the outbox."""
+        member = json.dumps({"run_id": "run_1", "payload": {}, "attempts": 0})
+        redis_client.zadd(notifier.inflight_key, {member: time.time() - 1})
+
+        notifier._recover_expired()
+
+        assert redis_client.zcard(notifier.inflight_key) == 0
+        assert [e["run_id"] for e in _entries(redis_client, notifier.outbox_key)] == ["run_1"]
+
+    def test_live_claims_not_recovered(self, notifier, redis_client):
+        """Should leave entries whose claim has not expired in flight."""
+        notifier.notify("run_1", {})
+        notifier._claim_due()
+
+        notifier._recover_expired()
+
+        assert redis_client.zcard(notifier.inflight_key) == 1
+        assert redis_client.zcard(notifier.outbox_key) == 0
+
+
+class TestRetry:
+    """Tests for failure handling and retries."""
+
+    def test_server_error_reschedules_with_backoff(self, notifier, redis_client, backend):
+        """Should move the entry back to the outbox with a later due time."""
+        backend.responder = lambda _: httpx.Response(503)
+        notifier.notify("run_1", {})
+
+        notifier.flush()
+
+        [(member, score)] = redis_client.zrange(notifier.outbox_key, 0, -1, withscores=True)
+        assert json.loads(member)["attempts"] == 1
+        assert score > time.time()
+        assert redis_client.zcard(notifier.inflight_key) == 0
+
+    def test_connection_error_reschedules(self, notifier, redis_client, backend):
+        """Should retry entries that could not be sent at all."""
+        def fail(request):
+            raise httpx.ConnectError("refused", request=request)
+
+        backend.responder = fail
+        notifier.notify("run_1", {})
+
+        notifier.flush()
+
+        assert [e["attempts"] for e in _entries(redis_client, notifier.outbox_key)] == [1]
+
+    def test_auth_error_retried(self, notifier, redis_client, backend):
+        """Should keep entries the backend refused for a bad API key."""
+        backend.responder = lambda _: httpx.Response(401)
+        notifier.notify("run_1", {})
+
+        notifier.flush()
+
+        assert redis_client.zcard(notifier.outbox_key) == 1
+
+    def test_permanent_error_dropped(self, notifier, redis_client, backend):
+        """Should drop an entry the backend permanently rejects."""
+        backend.responder = lambda _: httpx.Response(404)
+        notifier.notify("run_1", {})
+
+        notifier.flush()
+
+        assert redis_client.zcard(notifier.outbox_key) == 0
+        assert redis_client.zcard(notifier.inflight_key) == 0
+
+    def test_backoff_capped(self, notifier, redis_client, backend, config):
+        """Should not back off longer than notify_max_backoff."""
+        backend.responder = lambda _: httpx.Response(503)
+        entry = {"run_id": "run_1", "payload": {}, "attempts": 20}
+        redis_client.zadd(notifier.outbox_key, {json.dumps(entry): time.time()})
+
+        notifier.flush()
+
+        [(_, score)] = redis_client.zrange(notifier.outbox_key, 0, -1, withscores=True)
+        assert score <= time.time() + config.notify_max_backoff
+
+    def test_rejected_batch_sent_singly(self, notifier, redis_client, backend):
+        """Should resend a rejected batch entry by entry, dropping only the bad one."""
+        def respond(request):
+            if request.url.path == "/api/internal/runs/complete":
+                return httpx.Response(422)
+            if request.url.path == "/api/internal/runs/bad/complete":
+                return httpx.Response(422)
+            return httpx.Response(200, json={})
+
+        backend.responder = respond
+        notifier.notify("good", {})
+        notifier.notify("bad", {})
+
+        notifier.flush()
+
+        assert sorted(backend.paths[1:]) == [
+            "/api/internal/runs/bad/complete",
+            "/api/internal/runs/good/complete",
+        ]
+        assert redis_client.zcard(notifier.outbox_key) == 0
+        assert redis_client.zcard(notifier.inflight_key) == 0
+
+    def test_fallback_renews_claims(self, notifier, redis_client, backend):
+        """Should renew each entry's claim right before sending it singly."""
+        deadlines = {}
+
+        def respond(request):
+            if request.url.path == "/api/internal/runs/complete":
+                # Simulate a slow batch attempt that used up the claim
+                expired = time.time() - 1
+                redis_client.zadd(
+                    notifier.inflight_key,
+                    dict.fromkeys(redis_client.zrange(notifier.inflight_key, 0, -1), expired),
+                )
+                return httpx.Response(422)
+            run_id = request.url.path.split("/")[-2]
+            for member, score in redis_client.zrange(notifier.inflight_key, 0, -1, withscores=True):
+                if json.loads(member)["run_id"] == run_id:
+                    deadlines[run_id] = score
+            return httpx.Response(200, json={})
+
+        backend.responder = respond
+        notifier.notify("run_1", {})
+        notifier.notify("run_2", {})
+
+        notifier.flush()
+
+        assert set(deadlines) == {"run_1", "run_2"}
+        assert min(deadlines.values()) > time.time()
+        assert redis_client.zcard(notifier.inflight_key) == 0
+
+    def test_fallback_skips_recovered_entries(self, notifier, redis_client, backend):
+        """Should not send an entry singly once its expired claim was recovered."""
+        def respond(request):
+            if request.url.path == "/api/internal/runs/complete":
+                # Another runner recovered run_2 while the batch was in flight
+                for member in redis_client.zrange(notifier.inflight_key, 0, -1):
+                    if json.loads(member)["run_id"] == "run_2":
+                        redis_client.zrem(notifier.inflight_key, member)
+                        redis_client.zadd(notifier.outbox_key, {member: time.time() + 60})
+                return httpx.Response(422)
+            return httpx.Response(200, json={})
+
+        backend.responder = respond
+        notifier.notify("run_1", {})
+        notifier.notify("run_2", {})
+
+        notifier.flush()
+
+        assert backend.paths == [
+            "/api/internal/runs/complete",
+            "/api/internal/runs/run_1/complete",
+        ]
+        assert [e["run_id"] for e in _entries(redis_client, notifier.outbox_key)] == ["run_2"]
+
+    def test_seconds_until_next_due(self, notifier, redis_client, config):
+        """Should wait until the earliest outbox or in-flight entry is due."""
+        assert notifier._seconds_until_next_due() == config.poll_timeout
+
+        redis_client.zadd(notifier.outbox_key, {"x": time.time() - 5})
+        assert notifier._seconds_until_next_due() == 0.0
@@ -0,0 +1,41 @@
+"""Tests for sandbox artifact collection."""
+
+import shutil
+from pathlib import Path
+
+from runner.sandbox import SandboxManager
+
+
+def _manager() -> SandboxManager:
+    # _collect_artifacts needs no Docker client
+    return SandboxManager.__new__(SandboxManager)
+
+
+class TestCollectArtifacts:
+    """Tests for SandboxManager._collect_artifacts."""
+
+    def test_moves_outputs_and_writeup_out_of_workspace(self, tmp_path):
+        """Should collect grader outputs and the writeup into their own directory."""
+        workspace = tmp_path / "workspace"
+        (workspace / "output").mkdir(parents=True)
+        (workspace / "submission").mkdir()
+        (workspace / "output" / "metrics.json").write_text('{"tests_passed": true}')
+        (workspace / "output" / "scratch.txt").write_text("not an artifact")
+        (workspace / "submission" / "writeup.md").write_text("## Root cause\nOff by one.")
+
+        artifacts, artifacts_dir = _manager()._collect_artifacts(workspace, "run_1")
+
+        try:
+            assert set(artifacts) == {"metrics.json", "writeup.md"}
+            assert Path(artifacts["writeup.md"]).read_text() == "## Root cause\nOff by one."
+            assert all(Path(path).parent == artifacts_dir for path in artifacts.values())
+
+            # Artifacts survive removal of the workspace
+            shutil.rmtree(workspace)
+            assert Path(artifacts["metrics.json"]).read_text() == '{"tests_passed": true}'
+        finally:
+            shutil.rmtree(artifacts_dir)
+
+    def test_no_artifacts(self, tmp_path):
+        """Should not create a directory when there is nothing to collect."""
+        assert _manager()._collect_artifacts(tmp_path, "run_1") == ({}, None)
@@ -0,0 +1,135 @@
+"""Tests for priority lanes and fair-share scheduling."""
+
+import json
+import time
+
+import pytest
+
+from runner.scheduler import FairShareScheduler
+
+
+class TestFairShareScheduler:
+    """Tests for FairShareScheduler."""
+
+    @pytest.fixture(autouse=True)
+    def setup(self, redis_client, config):
+        self.redis = redis_client
+        self.queue = config.job_queue
+        self.scheduler = FairShareScheduler(redis_client, config)
+
+    def enqueue(self, org_id: str, run_id: str, lane: str = "grade", **extra) -> None:
+        """Enqueue the way app/services/job_queue.py does."""
+        payload = {"run_id": run_id, "org_id": org_id, "lane": lane, **extra}
+        self.redis.lpush(f"{self.queue}:lane:{lane}:org:{org_id}", json.dumps(payload))
+        self.redis.sadd(f"{self.queue}:lane:{lane}:orgs", org_id)
+
+    def pop(self) -> str | None:
+        job_data = self.scheduler._pop_once(self.redis.rpop)
+        return json.loads(job_data)["run_id"] if job_data else None
+
+    def drain(self) -> list[str]:
+        order = []
+        while (run_id := self.pop()) is not None:
+            order.append(run_id)
+        return order
+
+    def test_grade_lane_before_bootstrap(self):
+        """Should serve every grading job before any bootstrap job."""
+        self.enqueue("org_a", "boot_1", lane="bootstrap")
+        self.enqueue("org_b", "grade_1")
+        self.enqueue("org_b", "grade_2")
+
+        assert self.drain() == ["grade_1", "grade_2", "boot_1"]
+
+    def test_equal_weights_alternate_between_orgs(self):
+        """Should not let an org with a large backlog starve another."""
+        for i in range(4):
+            self.enqueue("org_big", f"big_{i}")
+        self.enqueue("org_small", "small_0")
+        self.enqueue("org_small", "small_1")
+
+        order = self.drain()
+
+        assert order.index("small_0") <= 1
+        assert order.index("small_1") <= 3
+        # Each org's own jobs stay FIFO
+        assert [r for r in order if r.startswith("big")] == ["big_0", "big_1", "big_2", "big_3"]
+
+    def test_weights_scale_share(self):
+        """Should give an org with weight 2 twice the turns of an org with weight 1."""
+        self.redis.hset(f"{self.queue}:weights", "org_heavy", 2)
+        for i in range(6):
+            self.enqueue("org_heavy", f"heavy_{i}")
+            self.enqueue("org_light", f"light_{i}")
+
+        first_six = [self.pop() for _ in range(6)]
+
+        assert sum(r.startswith("heavy") for r in first_six) == 4
+
+    def test_new_org_joins_at_current_pass(self):
+        """Should start a newly active org at the lowest pass, not at zero."""
+        for i in range(5):
+            self.enqueue("org_a", f"a_{i}")
+        for _ in range(3):
+            self.pop()
+
+        self.enqueue("org_b", "b_0")
+        self.enqueue("org_b", "b_1")
+        self.enqueue("org_b", "b_2")
+
+        # org_b gets its fair share going forward, not three turns in a row
+        next_four = [self.pop() for _ in range(4)]
+        assert sorted(next_four) == ["a_3", "a_4", "b_0", "b_1"]
+
+    def test_empty_orgs_are_deactivated(self):
+        """Should drop an org from the lane once its queue is empty."""
+        self.enqueue("org_a", "a_0")
+
+        self.drain()
+
+        assert self.redis.smembers(f"{self.queue}:lane:grade:orgs") == set()
+
+    def test_legacy_queue_drained_last(self):
+        """Should take jobs from the pre-lane single list after all lanes."""
+        self.redis.lpush(self.queue, json.dumps({"run_id": "legacy_0"}))
+        self.enqueue("org_a", "boot_0", lane="bootstrap")
+
+        assert self.drain() == ["boot_0", "legacy_0"]
+
+    def test_records_dequeue_stats(self):
+        """Should count dequeues and wait time per org."""
+        self.enqueue("org_a", "a_0", enqueued_at=time.time() - 30)
+
+        self.pop()
+
+        stats = self.redis.hgetall(f"{self.queue}:stats:org_a")
+        assert stats["dequeued"] == "1"
+        assert 29 <= float(stats["wait_seconds_total"]) < 60
+
+    def test_pop_blocks_on_signal_when_empty(self):
+        """Should wait for an enqueue signal and then take the new job."""
+        self.enqueue("org_a", "a_0")
+        self.redis.lpush(f"{self.queue}:signal", 1)
+        self.scheduler._pop_once(self.redis.rpop)
+
+        self.enqueue("org_a", "a_1")
+        job_data = self.scheduler.pop(self.redis.rpop)
+
+        assert json.loads(job_data)["run_id"] == "a_1"
+
+    def test_push_front_requeues_to_the_consuming_end(self):
+        """Should make a redelivered job the next one taken for its org."""
+        self.enqueue("org_a", "a_0")
+        redelivered = json.dumps({"run_id": "a_redelivered", "org_id": "org_a", "lane": "grade"})
+
+        pipe = self.redis.pipeline()
+        self.scheduler.push_front(pipe, redelivered)
+        pipe.execute()
+
+        assert self.drain() == ["a_redelivered", "a_0"]
+
+    def test_queue_key_for_unknown_jobs(self):
+        """Should route jobs without a known lane or org to the legacy list."""
+        assert self.scheduler.queue_key_for("not json") == self.queue
+        assert self.scheduler.queue_key_for(json.dumps({"lane": "grade"})) == self.queue
+        assert self.scheduler.queue_key_for(json.dumps({"org_id": "o", "lane": "other"})) == self.queue
@@ -0,0 +1,65 @@
+"""Tests for the simulation template cache."""
+
+import os
+from pathlib import Path
+
+import pytest
+
+from runner.template_cache import DIGEST_FILE, TemplateCache
+
+
+class TestTemplateCache:
+    """Tests for TemplateCache."""
+
+    @pytest.fixture(autouse=True)
+    def setup(self, config):
+        self.sim = Path(config.sims_path) / "bugfix_v1"
+        (self.sim / "app").mkdir(parents=True)
+        (self.sim / "app" / "limiter.py").write_text("LIMIT = 10\n")
+        (self.sim / "requirements.txt").write_text("pytest\n")
+        self.cache = TemplateCache(config)
+
+    def test_snapshot_is_content_addressed(self):
+        """Should reuse a snapshot until the simulation's content changes."""
+        first = self.cache.get("bugfix_v1")
+        assert self.cache.get("bugfix_v1") == first
+
+        (self.sim / "app" / "limiter.py").write_text("LIMIT = 20\n")
+
+        assert self.cache.get("bugfix_v1") != first
+
+    def test_workspace_write_does_not_reach_template(self, tmp_path):
+        """Should give each run its own files, so overwriting one in place leaves the template intact."""
+        template = self.cache.get("bugfix_v1")
+        work = tmp_path / "workspace" / "work"
+        self.cache.materialize(template, work)
+
+        # What candidate code can do to a read-only file it owns
+        target = work / "app" / "limiter.py"
+        os.chmod(target, 0o644)
+        with open(target, "w") as f:
+            f.write("LIMIT = 0  # tampered\n")
+
+        assert (template / "app" / "limiter.py").read_text() == "LIMIT = 10\n"
+        assert not os.path.samefile(target, template / "app" / "limiter.py")
+        assert self.cache.verify(template)
+
+        other = tmp_path / "other" / "work"
+        self.cache.materialize(template, other)
+        assert (other / "app" / "limiter.py").read_text() == "LIMIT = 10\n"
+        assert not (other / DIGEST_FILE).exists()
+
+    def test_modified_snapshot_is_rebuilt(self):
+        """Should remove a snapshot whose files changed and rebuild it on the next run."""
+        template = self.cache.get("bugfix_v1")
+        snapshot_file = template / "app" / "limiter.py"
+        os.chmod(template / "app", 0o755)
+        os.chmod(snapshot_file, 0o644)
+        snapshot_file.write_text("LIMIT = 0  # tampered\n")
+
+        assert not self.cache.verify(template)
+        assert not template.exists()
+
+        assert self.cache.get("bugfix_v1") == template
+        assert snapshot_file.read_text() == "LIMIT = 10\n"
+        assert self.cache.verify(template)